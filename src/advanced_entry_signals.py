@@ -6,16 +6,33 @@ David Ryan과 Mark Minervini의 정교한 전략 구현
 import pandas as pd
 import numpy as np
 from entry_signals import EntrySignalAnalyzer
+from indicators import indicator_row, build_indicator_frame
 
 
 class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
-    def __init__(self):
-        """고급 진입 분석기 초기화"""
+    # Minervini 신호 판정 임계값 (param_sweep에서 조합별로 바꿔 평가)
+    DEFAULT_PARAMS = {
+        'stage2_checks': 7,     # 트렌드 템플릿 8개 중 최소 통과 수
+        'rs_min': 80,           # RS 필수 하한
+        'vcp_tightness': 8,     # VCP 마지막 수축폭(%) 상한
+        'pivot_near': 0.99,     # 피봇 근접: 종가 >= 피봇 x pivot_near
+        'entry_score': 90,      # 진입 신호 최소 점수
+        'stop_ratio': 0.92,     # 손절가 = max(50일선, 피봇 x stop_ratio)
+    }
+
+    def __init__(self, params=None):
+        """
+        고급 진입 분석기 초기화
+
+        Args:
+            params (dict): DEFAULT_PARAMS 중 바꿀 임계값 (없으면 기본값)
+        """
         super().__init__()
+        self.params = {**self.DEFAULT_PARAMS, **(params or {})}
 
     # ========== David Ryan 진입 전략 ==========
 
-    def check_high_tight_flag(self, price_data):
+    def check_high_tight_flag(self, price_data, indicators=None):
         """
         High Tight Flag 패턴 확인 (David Ryan 선호 패턴)
 
@@ -27,15 +44,17 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
         if len(price_data) < 60:
             return {'pattern': False, 'strength': 0}
 
+        ind = indicator_row(price_data, indicators)
+
         # 최근 40일 수익률
-        price_40d_ago = price_data['Close'].iloc[-40]
-        current_price = price_data['Close'].iloc[-1]
+        price_40d_ago = ind['close_40']
+        current_price = ind['close']
         gain_40d = ((current_price - price_40d_ago) / price_40d_ago) * 100
 
         if gain_40d >= 100:  # 100% 이상 상승
             # 최근 15-25일 조정 확인
-            recent_high = price_data['High'].iloc[-25:].max()
-            recent_low = price_data['Low'].iloc[-15:].min()
+            recent_high = ind['high_25']
+            recent_low = ind['low_15']
             correction = ((recent_high - recent_low) / recent_high) * 100
 
             if 10 <= correction <= 25:
@@ -51,7 +70,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
 
         return {'pattern': False, 'strength': 0}
 
-    def check_base_quality(self, price_data, min_weeks=5):
+    def check_base_quality(self, price_data, min_weeks=5, indicators=None):
         """
         베이스 품질 평가 (David Ryan)
 
@@ -66,9 +85,14 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             return {'quality': 'Poor', 'score': 0, 'depth': 0}
 
         base_data = price_data.iloc[-min_days:]
+        ind = indicator_row(price_data, indicators)
 
-        high = base_data['High'].max()
-        low = base_data['Low'].min()
+        if min_days == 25:
+            high = ind['high_25']
+            low = ind['low_25']
+        else:
+            high = base_data['High'].max()
+            low = base_data['Low'].min()
         depth = ((high - low) / high) * 100
 
         # 베이스 깊이 평가
@@ -86,9 +110,12 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             score = 20
 
         # 타이트니스 평가 (최근 10일 변동폭)
-        recent_range = ((base_data['High'].iloc[-10:].max() -
-                        base_data['Low'].iloc[-10:].min()) /
-                       base_data['Low'].iloc[-10:].min() * 100)
+        if min_days >= 10:
+            recent_range = ((ind['high_10'] - ind['low_10']) / ind['low_10'] * 100)
+        else:
+            recent_range = ((base_data['High'].iloc[-10:].max() -
+                            base_data['Low'].iloc[-10:].min()) /
+                           base_data['Low'].iloc[-10:].min() * 100)
 
         if recent_range < 5:
             score += 10  # 보너스 점수
@@ -101,7 +128,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             'weeks': len(base_data) / 5
         }
 
-    def check_volume_dryup(self, price_data, lookback=10):
+    def check_volume_dryup(self, price_data, lookback=10, indicators=None):
         """
         거래량 건조 확인 (David Ryan - 돌파 직전 신호)
 
@@ -110,8 +137,13 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
         if len(price_data) < lookback * 2:
             return {'dryup': False, 'ratio': 0}
 
-        recent_volume = price_data['Volume'].iloc[-lookback:].mean()
-        previous_volume = price_data['Volume'].iloc[-lookback*2:-lookback].mean()
+        if lookback == 10:
+            ind = indicator_row(price_data, indicators)
+            recent_volume = ind['volume_avg_10']
+            previous_volume = ind['volume_avg_10_prev']
+        else:
+            recent_volume = price_data['Volume'].iloc[-lookback:].mean()
+            previous_volume = price_data['Volume'].iloc[-lookback*2:-lookback].mean()
 
         if previous_volume == 0:
             return {'dryup': False, 'ratio': 0}
@@ -128,7 +160,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
 
         return {'dryup': False, 'ratio': ratio}
 
-    def david_ryan_entry_signal(self, price_data, rs_rating):
+    def david_ryan_entry_signal(self, price_data, rs_rating, indicators=None):
         """
         David Ryan 종합 진입 신호
 
@@ -151,7 +183,8 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
         if len(price_data) < 60:
             return signal
 
-        current_price = price_data['Close'].iloc[-1]
+        ind = indicator_row(price_data, indicators)
+        current_price = ind['close']
 
         # 1. RS Rating (David Ryan은 90+ 선호)
         if rs_rating < 90:
@@ -166,7 +199,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             signal['signal_strength'] += 20
 
         # 2. High Tight Flag 확인 (최우선)
-        htf = self.check_high_tight_flag(price_data)
+        htf = self.check_high_tight_flag(price_data, indicators=ind)
         if htf['pattern']:
             signal['reasons'].append(f"High Tight Flag ({htf['gain']:.0f}% 상승 후 {htf['correction']:.1f}% 조정)")
             signal['signal_strength'] += 50
@@ -175,19 +208,19 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             signal['stop_loss'] = htf['pivot'] * 0.93
 
         # 3. 베이스 품질 평가
-        base = self.check_base_quality(price_data)
+        base = self.check_base_quality(price_data, indicators=ind)
         if base['score'] >= 70:
             signal['reasons'].append(f"베이스 품질 {base['quality']} (깊이 {base['depth']:.1f}%, 타이트니스 {base['tightness']:.1f}%)")
             signal['signal_strength'] += 25
 
         # 4. 거래량 건조 확인
-        dryup = self.check_volume_dryup(price_data)
+        dryup = self.check_volume_dryup(price_data, indicators=ind)
         if dryup['dryup']:
             signal['reasons'].append(f"거래량 건조 (기준 대비 {dryup['ratio']:.0f}%)")
             signal['signal_strength'] += 15
 
         # 5. 피봇 포인트 근접
-        pivot = price_data['High'].iloc[-10:].max()
+        pivot = ind['high_10']
         distance_from_pivot = ((pivot - current_price) / pivot) * 100
 
         if distance_from_pivot <= 1:  # 1% 이내
@@ -198,7 +231,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
                 signal['stop_loss'] = pivot * 0.925  # 7.5% 손절
 
         # 6. 거래량 돌파 확인
-        volume_bo = self.check_volume_breakout(price_data, threshold=1.4)
+        volume_bo = self.check_volume_breakout(price_data, threshold=1.4, indicators=ind)
         if volume_bo['breakout']:
             # 과도한 거래량은 경고
             if volume_bo['volume_ratio'] > 2.0:
@@ -220,7 +253,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
 
     # ========== Mark Minervini 개선된 VCP 패턴 ==========
 
-    def check_vcp_detailed(self, price_data, lookback=120):
+    def check_vcp_detailed(self, price_data, lookback=120, indicators=None):
         """
         VCP (Volatility Contraction Pattern) 정교한 분석
 
@@ -233,13 +266,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
         if len(price_data) < lookback:
             return {'vcp': False, 'contractions': [], 'quality': 'None'}
 
-        # 고점 찾기 (피크)
-        highs = price_data['High'].rolling(window=5, center=True).max()
-        is_peak = (price_data['High'] == highs)
-
-        # 저점 찾기 (밸리)
-        lows = price_data['Low'].rolling(window=5, center=True).min()
-        is_valley = (price_data['Low'] == lows)
+        ind = indicator_row(price_data, indicators)
 
         # 최근 조정 구간 분석
         contractions = []
@@ -249,9 +276,8 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
 
         for period in periods:
             if len(price_data) >= period:
-                segment = price_data.iloc[-period:]
-                high = segment['High'].max()
-                low = segment['Low'].min()
+                high = ind[f'high_{period}']
+                low = ind[f'low_{period}']
                 contraction = ((high - low) / high) * 100
                 contractions.append(contraction)
 
@@ -263,7 +289,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
 
             last_contraction = contractions[-1]
 
-            if is_contracting and last_contraction < 8:
+            if is_contracting and last_contraction < self.params['vcp_tightness']:
                 # 품질 평가
                 if last_contraction < 4:
                     quality = 'Excellent'
@@ -286,27 +312,28 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
 
         return {'vcp': False, 'contractions': contractions, 'quality': 'None'}
 
-    def check_trend_template_detailed(self, price_data):
+    def check_trend_template_detailed(self, price_data, indicators=None):
         """
         Mark Minervini 트렌드 템플릿 8가지 조건 상세 체크
         """
         if len(price_data) < 200:
             return {'stage_2': False, 'score': 0, 'details': []}
 
-        current_price = price_data['Close'].iloc[-1]
+        ind = indicator_row(price_data, indicators)
+        current_price = ind['close']
 
         # 이동평균선 계산
-        ma_50 = price_data['Close'].iloc[-50:].mean()
-        ma_150 = price_data['Close'].iloc[-150:].mean()
-        ma_200 = price_data['Close'].iloc[-200:].mean()
+        ma_50 = ind['ma_50']
+        ma_150 = ind['ma_150']
+        ma_200 = ind['ma_200']
 
         # 200일 이평선 기울기 (1개월 전과 비교)
-        ma_200_past = price_data['Close'].iloc[-220:-200].mean() if len(price_data) >= 220 else ma_200
+        ma_200_past = ind['ma_200_past']
         ma_200_slope = ((ma_200 - ma_200_past) / ma_200_past) * 100
 
         # 52주 최고/최저
-        high_52w = price_data['High'].iloc[-252:].max() if len(price_data) >= 252 else price_data['High'].max()
-        low_52w = price_data['Low'].iloc[-252:].min() if len(price_data) >= 252 else price_data['Low'].min()
+        high_52w = ind['high_52w']
+        low_52w = ind['low_52w']
 
         score = 0
         details = []
@@ -331,7 +358,7 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
                 details.append(f'{desc} X')
 
         return {
-            'stage_2': score >= 87.5,  # 7개 이상 통과
+            'stage_2': sum(checks.values()) >= self.params['stage2_checks'],  # 7개 이상 통과
             'score': score,
             'details': details,
             'checks_passed': sum(checks.values()),
@@ -340,9 +367,11 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             'ma_200': ma_200
         }
 
-    def mark_minervini_advanced_signal(self, price_data, rs_rating):
+    def mark_minervini_advanced_signal(self, price_data, rs_rating, indicators=None):
         """
         Mark Minervini 고급 진입 신호 (VCP + 트렌드 템플릿)
+
+        indicators: build_indicator_frame 결과 (없으면 마지막 봉 지표를 한 번만 계산해 공유)
         """
         signal = {
             'entry_signal': False,
@@ -375,10 +404,11 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
         if len(price_data) < 200:
             return signal
 
-        current_price = price_data['Close'].iloc[-1]
+        ind = indicator_row(price_data, indicators)
+        current_price = ind['close']
 
         # 1. 트렌드 템플릿 (필수!)
-        template = self.check_trend_template_detailed(price_data)
+        template = self.check_trend_template_detailed(price_data, indicators=ind)
 
         # 개별 체크 플래그 설정
         ma_50 = template['ma_50']
@@ -386,12 +416,12 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
         ma_200 = template['ma_200']
 
         # 200일 이평선 기울기 계산
-        ma_200_past = price_data['Close'].iloc[-220:-200].mean() if len(price_data) >= 220 else ma_200
+        ma_200_past = ind['ma_200_past']
         ma_200_slope = ((ma_200 - ma_200_past) / ma_200_past) * 100
 
         # 52주 최고/최저
-        high_52w = price_data['High'].iloc[-252:].max() if len(price_data) >= 252 else price_data['High'].max()
-        low_52w = price_data['Low'].iloc[-252:].min() if len(price_data) >= 252 else price_data['Low'].min()
+        high_52w = ind['high_52w']
+        low_52w = ind['low_52w']
 
         signal['trend_template']['above_150_200'] = bool((current_price > ma_150) and (current_price > ma_200))
         signal['trend_template']['ma150_above_200'] = bool(ma_150 > ma_200)
@@ -412,21 +442,21 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
         signal['signal_strength'] += 40
 
         # 2. RS Rating
-        signal['minervini_checks']['rs_ok'] = bool(rs_rating >= 80)
+        signal['minervini_checks']['rs_ok'] = bool(rs_rating >= self.params['rs_min'])
+        if rs_rating < self.params['rs_min']:
+            return signal
         if rs_rating >= 95:
             signal['reasons'].append(f'RS {rs_rating} (최상위)')
             signal['signal_strength'] += 30
         elif rs_rating >= 90:
             signal['reasons'].append(f'RS {rs_rating} (우수)')
             signal['signal_strength'] += 25
-        elif rs_rating >= 80:
+        else:
             signal['reasons'].append(f'RS {rs_rating} (양호)')
             signal['signal_strength'] += 15
-        else:
-            return signal
 
         # 3. VCP 패턴
-        vcp = self.check_vcp_detailed(price_data)
+        vcp = self.check_vcp_detailed(price_data, indicators=ind)
         signal['minervini_checks']['vcp_detected'] = bool(vcp['vcp'])
         if vcp['vcp']:
             signal['reasons'].append(f"VCP {vcp['quality']} ({vcp['stages']}단계, 타이트 {vcp['tightness']:.1f}%)")
@@ -434,9 +464,9 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             signal['pattern_type'] = f"VCP-{vcp['stages']}"
 
         # 4. 피봇 포인트
-        pivot = price_data['High'].iloc[-15:].max()
+        pivot = ind['high_15']
 
-        if current_price >= pivot * 0.99:
+        if current_price >= pivot * self.params['pivot_near']:
             signal['reasons'].append('피봇 근접/돌파')
             signal['signal_strength'] += 20
             signal['entry_price'] = pivot * 1.001
@@ -445,16 +475,121 @@ class AdvancedEntryAnalyzer(EntrySignalAnalyzer):
             signal['entry_price'] = pivot * 1.001
 
         # 5. 손절가 (50일 이평 또는 피봇 기준)
-        stop_candidate = max(template['ma_50'], pivot * 0.92)
+        stop_candidate = max(template['ma_50'], pivot * self.params['stop_ratio'])
         signal['stop_loss'] = stop_candidate
 
         # 진입 신호 판정
-        if signal['signal_strength'] >= 90:
+        if signal['signal_strength'] >= self.params['entry_score']:
             signal['entry_signal'] = True
             signal['minervini_checks']['strength_ok'] = True
 
         return signal
 
+    # ========== 전체 날짜 (시계열) 모드 ==========
+
+    def minervini_signal_arrays(self, ind, rs_rating):
+        """
+        mark_minervini_advanced_signal의 점수/플래그를 배열 단위로 계산
+
+        Args:
+            ind (dict): 지표 이름 -> 배열 (build_indicator_frame 컬럼, 1차원/2차원 모두 가능)
+            rs_rating: RS Rating (스칼라 또는 지표와 같은 모양의 배열, NaN은 부적격)
+
+        Returns:
+            dict: 컬럼 이름 -> 배열 (같은 날짜의 스칼라 함수 결과와 동일,
+                  trend_template/minervini_checks 항목은 같은 이름의 컬럼)
+        """
+        close = np.asarray(ind['close'], dtype=float)
+        bars = np.asarray(ind['bars'])
+        rs = np.broadcast_to(np.asarray(rs_rating, dtype=float), close.shape)
+        ma_50 = np.asarray(ind['ma_50'], dtype=float)
+        ma_150 = np.asarray(ind['ma_150'], dtype=float)
+        ma_200 = np.asarray(ind['ma_200'], dtype=float)
+        ma_200_past = np.asarray(ind['ma_200_past'], dtype=float)
+        low_52w = np.asarray(ind['low_52w'], dtype=float)
+        high_52w = np.asarray(ind['high_52w'], dtype=float)
+        pivot = np.asarray(ind['high_15'], dtype=float)
+        enough = bars >= 200
+        p = self.params
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 1. 트렌드 템플릿 (8개 중 7개 이상이면 Stage 2)
+            ma_200_slope = ((ma_200 - ma_200_past) / ma_200_past) * 100
+            above_52w_low = (low_52w > 0) & (((close - low_52w) / low_52w * 100) >= 30)
+            near_52w_high = ((high_52w - close) / high_52w * 100) <= 25
+            checks = [close > ma_150, close > ma_200, ma_150 > ma_200, ma_200_slope > 0,
+                      ma_50 > ma_150, close > ma_50, above_52w_low, near_52w_high]
+            checks_passed = np.sum(checks, axis=0)
+            stage_2 = enough & (checks_passed >= p['stage2_checks'])
+
+            # 2. RS Rating (rs_min 미만이면 40점에서 중단)
+            rs_points = np.where(rs >= 95, 30, np.where(rs >= 90, 25, np.where(rs >= p['rs_min'], 15, 0)))
+            rs_ok = rs >= p['rs_min']
+            passed = stage_2 & rs_ok
+
+            # 3. VCP (60/40/25/15일 변동폭이 계속 줄고 마지막이 8% 미만)
+            contractions = [((np.asarray(ind[f'high_{n}'], dtype=float) - np.asarray(ind[f'low_{n}'], dtype=float))
+                             / np.asarray(ind[f'high_{n}'], dtype=float)) * 100
+                            for n in (60, 40, 25, 15)]
+            tightness = contractions[-1]
+            vcp = tightness < p['vcp_tightness']
+            for prev, nxt in zip(contractions, contractions[1:]):
+                vcp = vcp & (prev > nxt)
+            vcp_points = np.where(tightness < 4, 95, np.where(tightness < 6, 80, 65)) // 3
+
+            # 4. 피봇 포인트
+            pivot_near = close >= pivot * p['pivot_near']
+
+        total = (40 + rs_points + np.where(vcp, vcp_points, 0) + np.where(pivot_near, 20, 0))
+        signal_strength = np.where(passed, total, np.where(stage_2, 40, 0))
+        strength_ok = passed & (total >= p['entry_score'])
+        return {
+            'entry_signal': strength_ok,
+            'signal_strength': signal_strength,
+            'entry_price': np.where(passed, pivot * 1.001, 0.0),
+            'stop_loss': np.where(passed, np.maximum(ma_50, pivot * p['stop_ratio']), 0.0),
+            'checks_passed': np.where(enough, checks_passed, 0),
+            'above_150_200': enough & (close > ma_150) & (close > ma_200),
+            'ma150_above_200': enough & (ma_150 > ma_200),
+            'ma200_rising': enough & (ma_200_slope > 0),
+            'ma50_above_150_200': enough & (ma_50 > ma_150) & (ma_50 > ma_200),
+            'above_50': enough & (close > ma_50),
+            'above_52w_low': enough & above_52w_low,
+            'near_52w_high': enough & near_52w_high,
+            'rs_strong': enough & (rs >= 70),
+            'stage_2': stage_2,
+            'rs_ok': stage_2 & rs_ok,
+            'vcp_detected': passed & vcp,
+            'pivot_near': passed & pivot_near,
+            'strength_ok': strength_ok,
+            'tightness': tightness,
+        }
+
+    def minervini_signal_series(self, price_data, rs_rating, indicators=None):
+        """
+        종목 전체 기간의 Minervini 신호를 한 번에 계산
+
+        각 행은 그 날짜까지 잘라낸 데이터로 mark_minervini_advanced_signal(df, rs, indicators=같은 프레임)을
+        호출한 결과와 같음 (근거 문구 대신 플래그/수치 컬럼 제공)
+
+        Args:
+            price_data (DataFrame): 가격 데이터 (전체 기간)
+            rs_rating: RS Rating (스칼라, 날짜 인덱스 Series, 또는 같은 길이 배열)
+            indicators (DataFrame): build_indicator_frame 결과 (없으면 계산)
+
+        Returns:
+            DataFrame: price_data와 같은 인덱스의 날짜별 점수/플래그 (pattern_type 포함)
+        """
+        if indicators is None:
+            indicators = build_indicator_frame(price_data)
+        if isinstance(rs_rating, pd.Series):
+            rs_rating = rs_rating.reindex(price_data.index).to_numpy(dtype=float)
+        ind = {col: indicators[col].to_numpy() for col in indicators.columns}
+        result = pd.DataFrame(self.minervini_signal_arrays(ind, rs_rating), index=price_data.index)
+        result['pattern_type'] = pd.Series(np.where(result['vcp_detected'], 'VCP-4', None),
+                                           index=price_data.index, dtype=object)
+        return result
+
 
 if __name__ == "__main__":
     print("고급 진입 신호 분석 모듈...")
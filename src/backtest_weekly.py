@@ -1,17 +1,21 @@
 """
-2025년 매주 금요일 백테스팅
-각 금요일마다 David Ryan + Minervini 점수 추적
+2025년 백테스팅 (매주 금요일, --daily면 모든 거래일)
+분석 날짜마다 전 종목 David Ryan + Minervini 점수를 유니버스 패널 지표에서 한 번에 판정하고
+진입신호는 거래 시뮬레이터로 체결/청산까지 추적
+(RS Rating은 유니버스 전체 종목 백분위, 날짜별 RS 행렬을 한 번 계산해 조회)
 """
 
+import argparse
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import os
 import webbrowser
 from data_collector import StockDataCollector
-from rs_calculator import RSCalculator
-from david_ryan_complete import DavidRyanComplete
-from advanced_entry_signals import AdvancedEntryAnalyzer
 from generate_backtest_dashboard import generate_backtest_dashboard
+from rs_history import RSHistory
+from signal_scanner import BatchSignalScanner, MIN_HISTORY
+from trade_simulator import BarSeries, simulate_trades, trade_metrics
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
@@ -31,142 +35,225 @@ def get_fridays_2025():
     return fridays
 
 
-def backtest_stock_on_date(ticker, price_data, target_date, collector):
-    """특정 날짜에 종목 분석"""
-    try:
-        # 해당 날짜까지의 데이터만 사용
-        df = price_data[price_data.index <= target_date]
+def get_trading_days_2025(calendar):
+    """
+    2025년 모든 거래일 (가격 데이터 달력 기준, 오늘까지)
 
-        if len(df) < 200:  # 최소 200일 데이터 필요
-            return None
+    Args:
+        calendar (DatetimeIndex): 거래일 달력 (RSHistory/PricePanel dates)
 
-        # RS Rating 계산
-        calculator = RSCalculator()
+    Returns:
+        list: datetime 리스트
+    """
+    calendar = pd.DatetimeIndex(calendar)
+    days = calendar[(calendar >= datetime(2025, 1, 1)) & (calendar <= datetime.now())]
+    return [day.to_pydatetime() for day in days]
 
-        # 단일 종목용 RS 계산 (간이 버전)
-        recent_data = df.tail(252)
-        if len(recent_data) < 60:
-            return None
 
-        # 가중치 RS 계산
-        perf_3m = (recent_data['Close'].iloc[-1] / recent_data['Close'].iloc[-60] - 1) * 100 if len(recent_data) >= 60 else 0
-        perf_6m = (recent_data['Close'].iloc[-1] / recent_data['Close'].iloc[-120] - 1) * 100 if len(recent_data) >= 120 else 0
-        perf_9m = (recent_data['Close'].iloc[-1] / recent_data['Close'].iloc[-180] - 1) * 100 if len(recent_data) >= 180 else 0
-        perf_12m = (recent_data['Close'].iloc[-1] / recent_data['Close'].iloc[-240] - 1) * 100 if len(recent_data) >= 240 else 0
+def backtest_universe(scanner, target_dates, tickers=None):
+    """
+    여러 날짜에 여러 종목 분석 (패널 지표 배열에서 날짜 행만 골라 한 번에 판정, 날짜별 재슬라이싱 없음)
 
-        rs_score = (perf_3m * 0.4) + (perf_6m * 0.2) + (perf_9m * 0.2) + (perf_12m * 0.2)
-
-        # 백분위 변환 (간이: 절대값 기준)
-        if rs_score > 50:
-            rs_rating = 90
-        elif rs_score > 30:
-            rs_rating = 80
-        elif rs_score > 15:
-            rs_rating = 70
-        else:
-            rs_rating = int(max(50, min(99, 50 + rs_score)))
-
-        # David Ryan 분석
-        ryan_analyzer = DavidRyanComplete()
-        ryan_signal = ryan_analyzer.david_ryan_complete_signal(df, rs_rating)
-
-        # Minervini 분석
-        minervini_analyzer = AdvancedEntryAnalyzer()
-        minervini_signal = minervini_analyzer.mark_minervini_advanced_signal(df, rs_rating)
-
-        # 현재가
-        current_price = df['Close'].iloc[-1]
-
-        return {
-            'date': target_date,
-            'price': current_price,
-            'rs_rating': rs_rating,
-            'ryan_score': ryan_signal['signal_strength'],
-            'ryan_signal': ryan_signal['entry_signal'],
-            'ryan_entry': ryan_signal['entry_price'],
-            'ryan_stop': ryan_signal['stop_loss'],
-            'minervini_score': minervini_signal['signal_strength'],
-            'minervini_signal': minervini_signal['entry_signal'],
-            'minervini_entry': minervini_signal['entry_price']
-        }
-
-    except Exception as e:
-        print(f"[에러] {ticker} {target_date.strftime('%Y-%m-%d')} 분석 실패: {e}")
-        return None
+    Args:
+        scanner (BatchSignalScanner): 유니버스 일괄 스캐너 (rs_history 포함)
+        target_dates (list): 분석 날짜 리스트
+        tickers (list): 분석 종목 (없으면 패널 전체, 패널에 없는 종목은 제외)
 
+    Returns:
+        DataFrame: 날짜/가격/RS/전략별 점수·신호·진입가·손절가 + ticker (종목 -> 날짜 순, 데이터 부족 날짜 제외)
+    """
+    panel = scanner.panel
+    rows, rs, ryan, minervini = scanner.evaluate(target_dates)
+    safe_rows = np.maximum(rows, 0)
+    bars = np.where((rows >= 0)[:, None], scanner.indicators['bars'][safe_rows], 0)
+    close = scanner.indicators['close'][safe_rows]
 
-def run_backtest(tickers, output_file='backtest_results.xlsx'):
-    """백테스팅 실행"""
+    if tickers is None:
+        cols = np.arange(len(panel.tickers))
+    else:
+        cols = np.array([panel.column[ticker] for ticker in tickers if ticker in panel.column], dtype=int)
+    # 최소 200일 데이터 필요 (종목 -> 날짜 순으로 펼침)
+    ticker_idx, date_idx = np.nonzero((bars[:, cols] >= MIN_HISTORY).T)
+    cols = cols[ticker_idx]
+    cell = (date_idx, cols)
+
+    return pd.DataFrame({
+        'date': pd.DatetimeIndex(target_dates)[date_idx],
+        'price': close[cell],
+        'rs_rating': rs[cell],
+        'ryan_score': ryan['signal_strength'][cell].astype(int),
+        'ryan_signal': ryan['entry_signal'][cell].astype(bool),
+        'ryan_entry': ryan['entry_price'][cell].astype(float),
+        'ryan_stop': ryan['stop_loss'][cell].astype(float),
+        'ryan_add_on_1': ryan['add_on_1'][cell].astype(float),
+        'ryan_add_on_2': ryan['add_on_2'][cell].astype(float),
+        'minervini_score': minervini['signal_strength'][cell].astype(int),
+        'minervini_signal': minervini['entry_signal'][cell].astype(bool),
+        'minervini_entry': minervini['entry_price'][cell].astype(float),
+        'minervini_stop': minervini['stop_loss'][cell].astype(float),
+        'ticker': np.asarray(panel.tickers, dtype=object)[cols],
+    })
+
+
+def signals_from_results(df, onset_only=False):
+    """
+    백테스트 결과에서 진입신호가 난 행만 거래 시뮬레이터 입력으로 변환
+
+    Args:
+        df (DataFrame): backtest_universe 결과 (종목 -> 날짜 순)
+        onset_only (bool): 같은 종목 직전 행에 신호가 없던 날만 사용
+                           (연속된 신호가 같은 종목에 겹치는 거래로 중복되지 않게)
+
+    Returns:
+        DataFrame: ticker, date, strategy, entry, stop, add_on_1, add_on_2
+    """
+    def signal_rows(column):
+        mask = df[column]
+        if onset_only:
+            mask = mask & ~df.groupby('ticker')[column].shift(fill_value=False).astype(bool)
+        return df[mask]
+
+    frames = []
+    ryan = signal_rows('ryan_signal')
+    frames.append(pd.DataFrame({
+        'ticker': ryan['ticker'], 'date': ryan['date'], 'strategy': 'ryan',
+        'entry': ryan['ryan_entry'], 'stop': ryan['ryan_stop'],
+        'add_on_1': ryan['ryan_add_on_1'], 'add_on_2': ryan['ryan_add_on_2'],
+    }))
+    minervini = signal_rows('minervini_signal')
+    frames.append(pd.DataFrame({
+        'ticker': minervini['ticker'], 'date': minervini['date'], 'strategy': 'minervini',
+        'entry': minervini['minervini_entry'], 'stop': minervini['minervini_stop'],
+        'add_on_1': 0.0, 'add_on_2': 0.0,
+    }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_universe_prices(collector, universe_size, start_date, extra_tickers=(), workers=8, rate_limit=10.0):
+    """
+    RS 백분위 계산용 유니버스 가격 데이터 (generate_weekly_data와 같은 시총 상위 종목)
+
+    Args:
+        collector (StockDataCollector): 수집기
+        universe_size (int): 시총 상위 종목 수
+        start_date (str): 시작 날짜 (YYYY-MM-DD)
+        extra_tickers (list): 유니버스 밖이어도 함께 받을 종목 (백테스트 대상)
+        workers (int): 동시 수집 스레드 수
+        rate_limit (float): 초당 최대 원격 요청 수
+
+    Returns:
+        tuple: (유니버스 {종목코드: DataFrame}, 유니버스 밖 extra_tickers {종목코드: DataFrame}) (200봉 이상만)
+    """
+    stock_list = collector.get_stock_list('ALL')
+    tradable = collector.filter_tradable_stocks(stock_list)
+    tradable = tradable.sort_values('Marcap', ascending=False).head(universe_size)
+    codes = tradable['Code'].astype(str).str.zfill(6).tolist()
+    name_map = dict(zip(codes, tradable.get('Name', tradable['Code'])))
+    tickers = codes + [ticker for ticker in extra_tickers if ticker not in name_map]
+
+    fetched = collector.fetch_price_data(tickers, start_date, workers=workers,
+                                         rate_limit=rate_limit, names=name_map)
+    universe, extras = {}, {}
+    for ticker, df in fetched.items():
+        if df is not None and len(df) >= 200:
+            df.attrs['name'] = name_map.get(ticker, ticker)
+            (universe if ticker in name_map else extras)[ticker] = df
+    return universe, extras
+
+
+def run_backtest(tickers=None, output_file='backtest_results.xlsx', universe_size=600,
+                 workers=8, rate_limit=10.0, daily=False):
+    """
+    백테스팅 실행
+
+    Args:
+        tickers (list): 분석 종목 (없으면 유니버스 전체)
+        output_file (str): results/ 아래 엑셀 파일 이름
+        universe_size (int): RS 백분위를 계산할 시총 상위 종목 수
+        workers (int): 가격 데이터 동시 수집 스레드 수
+        rate_limit (float): 초당 최대 원격 요청 수
+        daily (bool): 금요일 대신 모든 거래일 분석
+    """
     print("="*100)
-    print("          2025년 매주 금요일 백테스팅")
+    print("          2025년 모든 거래일 백테스팅" if daily else "          2025년 매주 금요일 백테스팅")
     print("="*100)
 
-    fridays = get_fridays_2025()
-    print(f"\n백테스팅 기간: {fridays[0].strftime('%Y-%m-%d')} ~ {fridays[-1].strftime('%Y-%m-%d')}")
-    print(f"총 {len(fridays)}주 분석\n")
-
     collector = StockDataCollector()
-    all_results = []
-
-    for ticker in tickers:
-        print(f"\n[분석 시작] {ticker}")
-
-        # 전체 가격 데이터 수집 (2024년부터)
-        try:
-            start_date = (datetime.now() - timedelta(days=500)).strftime('%Y-%m-%d')
-            price_data = collector.get_stock_price_data(ticker, start_date)
-
-            if price_data is None or len(price_data) < 200:
-                print(f"[스킵] {ticker} - 데이터 부족")
-                continue
-
-            # 각 금요일마다 분석
-            for friday in fridays:
-                result = backtest_stock_on_date(ticker, price_data, friday, collector)
-
-                if result:
-                    result['ticker'] = ticker
-                    all_results.append(result)
 
-                    status = "✓ 진입신호" if result['ryan_signal'] or result['minervini_signal'] else "대기"
-                    print(f"  {friday.strftime('%Y-%m-%d')}: RS {result['rs_rating']} | Ryan {result['ryan_score']}점 | Minervini {result['minervini_score']}점 - {status}")
-
-        except Exception as e:
-            print(f"[에러] {ticker} 데이터 수집 실패: {e}")
+    # 유니버스 전체 가격 1회 수집 후 모든 날짜 RS 행렬 1회 계산 (2024년부터)
+    start_date = (datetime.now() - timedelta(days=500)).strftime('%Y-%m-%d')
+    print(f"[유니버스 수집] 시총 상위 {universe_size}개")
+    universe, extras = load_universe_prices(collector, universe_size, start_date, tickers or (),
+                                            workers=workers, rate_limit=rate_limit)
+    # RS 순위는 유니버스 종목만으로 계산 (실시간 파이프라인과 같은 백분위),
+    # 유니버스 밖 분석 종목은 그날 유니버스 성과 분포 안의 위치로 따로 조회
+    rs_history = RSHistory.from_price_data(universe).with_outside(extras)
+    print(f"[RS 계산 완료] {len(universe)}개 종목 × {len(rs_history.dates)}일"
+          + (f" (유니버스 밖 {len(extras)}개 별도)" if extras else ""))
+    price_data = {**universe, **extras}
+    # 패널 지표 1회 계산 후 모든 날짜/종목을 배열로 판정
+    scanner = BatchSignalScanner(price_data, rs_history=rs_history)
+
+    target_dates = get_trading_days_2025(rs_history.dates) if daily else get_fridays_2025()
+    print(f"\n백테스팅 기간: {target_dates[0].strftime('%Y-%m-%d')} ~ {target_dates[-1].strftime('%Y-%m-%d')}")
+    print(f"총 {len(target_dates)}{'거래일' if daily else '주'} 분석\n")
+
+    for ticker in tickers or ():
+        if ticker not in price_data:
+            print(f"[스킵] {ticker} - 데이터 부족")
+
+    df = backtest_universe(scanner, target_dates, tickers)
+    # 종목 -> 날짜순 정렬
+    df = df.sort_values(['ticker', 'date'], kind='stable').reset_index(drop=True)
+
+    for ticker, ticker_df in df.groupby('ticker', sort=False):
+        signal = ticker_df['ryan_signal'] | ticker_df['minervini_signal']
+        if daily:
+            # 거래일마다 출력하면 너무 길어 종목별 요약만
+            print(f"[분석] {ticker}: {len(ticker_df)}일 | 평균 RS {ticker_df['rs_rating'].mean():.0f} | "
+                  f"Ryan 신호 {int(ticker_df['ryan_signal'].sum())}일 | "
+                  f"Minervini 신호 {int(ticker_df['minervini_signal'].sum())}일")
             continue
+        print(f"\n[분석 시작] {ticker}")
+        for result, has_signal in zip(ticker_df.itertuples(index=False), signal):
+            status = "✓ 진입신호" if has_signal else "대기"
+            print(f"  {result.date.strftime('%Y-%m-%d')}: RS {result.rs_rating} | Ryan {result.ryan_score}점 | Minervini {result.minervini_score}점 - {status}")
 
     # 결과 저장
-    if all_results:
-        df = pd.DataFrame(all_results)
-
-        # 날짜순 정렬
-        df = df.sort_values(['ticker', 'date']).reset_index(drop=True)
-
+    if len(df) > 0:
         # 현재가 대비 수익률 계산
-        current_prices = {}
-        for ticker in df['ticker'].unique():
-            ticker_data = df[df['ticker'] == ticker]
-            if len(ticker_data) > 0:
-                current_prices[ticker] = ticker_data['price'].iloc[-1]
-
-        df['current_price'] = df['ticker'].map(current_prices)
+        df['current_price'] = df.groupby('ticker')['price'].transform('last')
         df['return_pct'] = ((df['current_price'] - df['price']) / df['price'] * 100).round(2)
 
+        # 신호별 실제 거래 시뮬레이션 (진입가 돌파 체결, 손절/추가매수/목표가/보유기간 청산)
+        # 신호가 새로 켜진 날만 거래로 봄 (금요일마다 이어진 신호가 겹치는 거래를 여러 번 열지 않게)
+        ledger = simulate_trades(BarSeries(scanner.panel), signals_from_results(df, onset_only=True))
+
         # 엑셀 저장
         output_path = os.path.join('results', output_file)
         os.makedirs('results', exist_ok=True)
 
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # 전체 데이터
-            df.to_excel(writer, sheet_name='전체백테스팅', index=False)
+        if daily:
+            # 종목 × 거래일 전체는 CSV로, 엑셀에는 신호가 난 행과 거래 내역만
+            csv_path = os.path.splitext(output_path)[0] + '.csv'
+            df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+            print(f"\n[저장 완료] {csv_path}")
+            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                df[df['ryan_signal'] | df['minervini_signal']].to_excel(writer, sheet_name='진입신호', index=False)
+                ledger.to_excel(writer, sheet_name='거래내역', index=False)
+        else:
+            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                # 전체 데이터
+                df.to_excel(writer, sheet_name='전체백테스팅', index=False)
+                ledger.to_excel(writer, sheet_name='거래내역', index=False)
 
-            # 종목별 시트
-            for ticker in df['ticker'].unique():
-                ticker_df = df[df['ticker'] == ticker].copy()
-                ticker_df.to_excel(writer, sheet_name=ticker[:31], index=False)
+                # 종목별 시트 (종목을 지정했을 때만, --all이면 시트가 수백 개라 생략)
+                if tickers is not None:
+                    for ticker, ticker_df in df.groupby('ticker', sort=False):
+                        ticker_df.to_excel(writer, sheet_name=ticker[:31], index=False)
 
         print(f"\n[저장 완료] {output_path}")
-        print(f"총 {len(all_results)}개 데이터 포인트 생성")
+        print(f"총 {len(df)}개 데이터 포인트 생성")
 
         # 요약 통계
         print("\n[요약 통계]")
@@ -176,6 +263,13 @@ def run_backtest(tickers, output_file='backtest_results.xlsx'):
         print(f"  Minervini 진입신호: {df['minervini_signal'].sum()}회")
         print(f"  평균 수익률: {df['return_pct'].mean():.2f}%")
 
+        print("\n[거래 시뮬레이션]")
+        for strategy in ('ryan', 'minervini'):
+            metrics = trade_metrics(ledger[ledger['strategy'] == strategy])
+            print(f"  {strategy}: 거래 {metrics['trades']}회 | 체결률 {metrics['fill_rate']:.0%} | "
+                  f"승률 {metrics['win_rate']:.0%} | 평균 {metrics['avg_return']:.2f}% | "
+                  f"손익비(PF) {metrics['profit_factor']:.2f} | 기대값 {metrics['expectancy_r']:.2f}R")
+
         # 웹 대시보드 생성
         print("\n[웹 대시보드 생성]")
         os.makedirs(WEB_DIR, exist_ok=True)
@@ -195,8 +289,25 @@ def run_backtest(tickers, output_file='backtest_results.xlsx'):
         return None
 
 
-if __name__ == "__main__":
-    # 테스트용 종목 리스트
-    test_tickers = ['005930', '000660', '035720', '005380', '051910']  # 삼성전자, SK하이닉스, 카카오, 현대차, LG화학
+def parse_args():
+    parser = argparse.ArgumentParser(description="금요일/일별 백테스팅 (유니버스 RS + 거래 시뮬레이션)")
+    parser.add_argument("--tickers", type=str, default="005930,000660,035720,005380,051910",
+                        help="분석 종목 (쉼표 구분, 기본: 삼성전자, SK하이닉스, 카카오, 현대차, LG화학)")
+    parser.add_argument("--all", action="store_true",
+                        help="유니버스 전체 종목 분석")
+    parser.add_argument("--universe", type=int, default=600,
+                        help="RS 백분위 계산용 시총 상위 종목 수")
+    parser.add_argument("--daily", action="store_true",
+                        help="금요일 대신 2025년 모든 거래일 분석")
+    parser.add_argument("--fetch-workers", type=int, default=8,
+                        help="가격 데이터 동시 수집 스레드 수")
+    parser.add_argument("--rate-limit", type=float, default=10.0,
+                        help="초당 최대 원격 요청 수")
+    return parser.parse_args()
 
-    run_backtest(test_tickers)
+
+if __name__ == "__main__":
+    args = parse_args()
+    tickers = None if args.all else [t.strip().zfill(6) for t in args.tickers.split(",") if t.strip()]
+    run_backtest(tickers, universe_size=args.universe, workers=args.fetch_workers, rate_limit=args.rate_limit,
+                 daily=args.daily)
@@ -0,0 +1,232 @@
+"""
+차트 데이터 저장소
+종목별 OHLCV 차트를 data/weekly_data/charts/{종목코드}.json 한 곳에 두고
+날짜별 signals 파일은 종목 코드만 참조 (대시보드가 종목을 열 때 개별로 로드)
+"""
+
+import os
+import json
+import gzip
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+CHART_DIR = os.path.join(PROJECT_ROOT, "data", "weekly_data", "charts")
+
+CHART_FIELDS = (('open', 'Open'), ('high', 'High'), ('low', 'Low'), ('close', 'Close'), ('volume', 'Volume'))
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+# 압축 포맷 버전 (정수 양자화 + 델타 인코딩)
+CHART_FORMAT_VERSION = 2
+# 원 단위 정수가 아닌 가격은 소수 둘째 자리까지 보존
+FRACTIONAL_SCALE = 100
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _price_scale(prices):
+    """가격 양자화 배수 (모두 정수 가격이면 1)"""
+    finite = prices[np.isfinite(prices)]
+    if np.allclose(finite, np.round(finite), rtol=0, atol=1e-4):
+        return 1
+    return FRACTIONAL_SCALE
+
+
+def chart_payload(price_data):
+    """
+    가격 데이터 -> 차트 데이터 (가격은 scale배 정수, 거래량은 정수)
+    OHLC 중 값이 없는 봉은 차트에 그릴 수 없으므로 제외
+
+    Args:
+        price_data (DataFrame): 가격 데이터
+
+    Returns:
+        dict: {'scale', 'dates', 'open', 'high', 'low', 'close', 'volume'}
+    """
+    prices = price_data[['Open', 'High', 'Low', 'Close']].to_numpy(dtype=np.float64)
+    valid = np.isfinite(prices).all(axis=1)
+    prices = prices[valid]
+    scale = _price_scale(prices)
+    quantized = np.round(prices * scale).astype(np.int64)
+    volume = np.nan_to_num(price_data['Volume'].to_numpy(dtype=np.float64)[valid])
+
+    payload = {'scale': scale, 'dates': price_data.index[valid].strftime('%Y-%m-%d').tolist()}
+    for i, key in enumerate(PRICE_FIELDS):
+        payload[key] = quantized[:, i].tolist()
+    payload['volume'] = np.round(volume).astype(np.int64).tolist()
+    return payload
+
+
+def encode_chart(payload):
+    """
+    차트 데이터 -> 저장 포맷
+    날짜는 직전 봉과의 일수 차, 종가/거래량은 직전 봉 대비 차이,
+    시가/고가/저가는 같은 봉 종가 대비 차이로 저장 (모두 작은 정수 배열)
+
+    Args:
+        payload (dict): chart_payload 결과
+
+    Returns:
+        dict: 저장 포맷
+    """
+    days = pd.to_datetime(pd.Series(payload['dates'])).to_numpy(dtype='datetime64[D]').astype(np.int64)
+    close = np.asarray(payload['close'], dtype=np.int64)
+    encoded = {
+        'v': CHART_FORMAT_VERSION,
+        'scale': payload['scale'],
+        'start': payload['dates'][0] if payload['dates'] else None,
+        'days': np.diff(days, prepend=days[:1]).tolist(),
+        'close': np.diff(close, prepend=0).tolist(),
+    }
+    for key in ('open', 'high', 'low'):
+        encoded[key] = (np.asarray(payload[key], dtype=np.int64) - close).tolist()
+    encoded['volume'] = np.diff(np.asarray(payload['volume'], dtype=np.int64), prepend=0).tolist()
+    return encoded
+
+
+def decode_chart(encoded):
+    """
+    저장 포맷 -> 차트 데이터 (encode_chart의 역변환)
+
+    Args:
+        encoded (dict): 저장 포맷
+
+    Returns:
+        dict: chart_payload와 같은 구조, 포맷 버전이 다르면 None
+    """
+    if not isinstance(encoded, dict) or encoded.get('v') != CHART_FORMAT_VERSION:
+        return None
+    if not encoded['days']:
+        return {'scale': encoded['scale'], 'dates': [], **{key: [] for key, _ in CHART_FIELDS}}
+
+    start = np.datetime64(encoded['start'], 'D')
+    days = start + np.cumsum(np.asarray(encoded['days'], dtype=np.int64))
+    close = np.cumsum(np.asarray(encoded['close'], dtype=np.int64))
+    payload = {'scale': encoded['scale'], 'dates': np.datetime_as_string(days, unit='D').tolist()}
+    for key in ('open', 'high', 'low'):
+        payload[key] = (close + np.asarray(encoded[key], dtype=np.int64)).tolist()
+    payload['close'] = close.tolist()
+    payload['volume'] = np.cumsum(np.asarray(encoded['volume'], dtype=np.int64)).tolist()
+    return payload
+
+
+def _write_atomic(path, data):
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ChartStore:
+    def __init__(self, base_dir=None):
+        """
+        차트 저장소 초기화
+
+        Args:
+            base_dir (str): 저장 폴더 (없으면 data/weekly_data/charts)
+        """
+        self.base_dir = base_dir or CHART_DIR
+
+    def path(self, ticker):
+        """종목 차트 파일 경로"""
+        return os.path.join(self.base_dir, f'{ticker}.json')
+
+    def load(self, ticker):
+        """
+        저장된 차트 읽기
+
+        Returns:
+            dict: 차트 데이터 (chart_payload 구조), 없거나 예전 포맷이면 None
+        """
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return decode_chart(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def merge(stored, fetched):
+        """
+        저장된 차트와 새 차트 병합
+
+        겹치는 날짜의 종가가 같으면 새 차트 앞에 저장된 과거 구간을 이어붙이고,
+        다르면(액면분할 등 수정주가 변경) 또는 가격 배수가 다르면 새 차트로 교체
+
+        Args:
+            stored (dict): 저장된 차트 (없으면 None)
+            fetched (dict): 새 차트
+
+        Returns:
+            dict: 병합된 차트
+        """
+        if not stored or not stored['dates'] or not fetched['dates'] or stored['scale'] != fetched['scale']:
+            return fetched
+
+        stored_close = dict(zip(stored['dates'], stored['close']))
+        for date, close in zip(fetched['dates'], fetched['close']):
+            if stored_close.get(date, close) != close:
+                return fetched
+
+        first = fetched['dates'][0]
+        head = sum(1 for date in stored['dates'] if date < first)
+        merged = {'scale': fetched['scale'], 'dates': stored['dates'][:head] + fetched['dates']}
+        for key, _ in CHART_FIELDS:
+            merged[key] = stored[key][:head] + fetched[key]
+        return merged
+
+    def update(self, ticker, price_data):
+        """
+        종목 차트 갱신 (내용이 바뀐 경우에만 파일 기록)
+
+        Args:
+            ticker (str): 종목 코드
+            price_data (DataFrame): 최신 가격 데이터
+
+        Returns:
+            bool: 파일을 새로 썼으면 True
+        """
+        stored = self.load(ticker)
+        merged = self.merge(stored, chart_payload(price_data))
+        if merged == stored:
+            return False
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        path = self.path(ticker)
+        data = json.dumps(encode_chart(merged), separators=(',', ':')).encode('utf-8')
+        _write_atomic(path, data)
+        # 서버가 그대로 내려줄 수 있도록 압축본도 함께 저장 (mtime=0: 내용이 같으면 같은 바이트)
+        # 원본보다 먼저 수정된 압축본은 서버가 쓰지 않으므로 원본을 먼저 기록
+        _write_atomic(f'{path}.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write_atomic(f'{path}.br', brotli.compress(data, quality=11))
+        return True
+
+    def update_many(self, price_data_dict, tickers):
+        """
+        여러 종목 차트 갱신
+
+        Args:
+            price_data_dict (dict): {종목코드: DataFrame}
+            tickers (iterable): 갱신할 종목 코드
+
+        Returns:
+            int: 새로 기록한 파일 수
+        """
+        written = 0
+        for ticker in tickers:
+            df = price_data_dict.get(ticker)
+            if df is None:
+                continue
+            if self.update(ticker, df):
+                written += 1
+        return written
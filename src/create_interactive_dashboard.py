@@ -225,6 +225,18 @@ def generate_interactive_dashboard():
             80%, 100% {{ content: '...'; }}
         }}
 
+        .load-more {{
+            display: block;
+            width: calc(100% - 20px);
+            margin: 10px;
+            padding: 10px;
+            background: transparent;
+            color: #848e9c;
+            border: 1px solid #2a2e39;
+            border-radius: 6px;
+            cursor: pointer;
+        }}
+
         /* 종목 리스트 */
         .stock-list {{
             flex: 1;
@@ -660,6 +672,15 @@ def generate_interactive_dashboard():
         }})();
         const DATA_WEEKLY_PATH = `${{DATA_ROOT}}/data/weekly_data`;
         const DATA_INTRADAY_PATH = `${{DATA_ROOT}}/data/intraday`;
+        const DATA_CHART_PATH = `${{DATA_WEEKLY_PATH}}/charts`;
+        const chartCache = new Map();
+        // dashboard_server.py로 열었을 때만 쓰는 신호 목록 API (필터/정렬/페이지를 서버에서 처리)
+        const API_PATH = `${{DATA_ROOT}}/api`;
+        const LIST_PAGE_SIZE = 100;
+        let apiAvailable = null;
+        let listRequestId = 0;
+        let listPage = 0;
+        let showRequestId = 0;
 
         // 페이지 로드 시 날짜 목록 및 첫 데이터 로드
         window.addEventListener('DOMContentLoaded', () => {{
@@ -802,11 +823,27 @@ def generate_interactive_dashboard():
             controls.forEach(id => {{
                 const el = document.getElementById(id);
                 if (!el) return;
-                el.addEventListener('change', renderStockList);
-                el.addEventListener('input', renderStockList);
+                el.addEventListener('change', refreshStockList);
+                el.addEventListener('input', refreshStockList);
             }});
         }}
 
+        function refreshStockList() {{
+            renderStockList().catch(error => console.error('목록 로드 오류:', error));
+        }}
+
+        // 신호 DB가 있는 서버인지 확인 (정적 호스팅이면 파일 전체를 받아 브라우저에서 필터)
+        async function detectApi() {{
+            if (apiAvailable !== null) return apiAvailable;
+            try {{
+                const response = await fetch(`${{API_PATH}}/signal-list?pageSize=1`);
+                apiAvailable = response.ok;
+            }} catch (error) {{
+                apiAvailable = false;
+            }}
+            return apiAvailable;
+        }}
+
         function getLocalDateString() {{
             return new Date().toLocaleDateString('sv-SE');
         }}
@@ -923,6 +960,11 @@ def generate_interactive_dashboard():
             try {{
                 await loadLatestPrices();
                 const isIntraday = date === 'intraday';
+                if (!isIntraday && await detectApi()) {{
+                    currentData = {{ date, signals: [], serverList: true }};
+                    await renderStockList();
+                    return;
+                }}
                 const dataPath = isIntraday
                     ? `${{DATA_INTRADAY_PATH}}/latest.json`
                     : `${{DATA_WEEKLY_PATH}}/signals_${{date}}.json`;
@@ -960,7 +1002,11 @@ def generate_interactive_dashboard():
         }}
 
         // 종목 리스트 렌더링
-        function renderStockList() {{
+        async function renderStockList() {{
+            if (currentData?.serverList) {{
+                await renderServerStockList(false);
+                return;
+            }}
             const stockList = document.getElementById('stockList');
 
             if (!currentData || !currentData.signals || currentData.signals.length === 0) {{
@@ -1001,34 +1047,94 @@ def generate_interactive_dashboard():
 
             let html = `<div class="loading">총 ${{filtered.length}}개 종목</div>`;
             filtered.forEach(stock => {{
-                const displayName = stock.종목명 && stock.종목명 !== stock.종목코드 ? stock.종목명 : stock.종목코드;
-                const signals = [];
-                if (stock.Ryan_진입신호) signals.push('<span class="signal-badge ryan">Ryan</span>');
-                if (stock.미너비니_진입신호) signals.push('<span class="signal-badge minervini">Minervini</span>');
+                html += stockItemHtml(stock);
+            }});
 
-                html += `
-                    <div class="stock-item" onclick="showStock('${{stock.종목코드}}')" data-ticker="${{stock.종목코드}}">
-                        <div class="stock-item-header">
-                            <div>
-                                <div class="stock-name">${{displayName}}</div>
-                                <div class="stock-code">${{stock.종목코드}}</div>
-                            </div>
-                            <div class="rs-badge">RS ${{stock.RS등급}}</div>
+            stockList.innerHTML = html;
+            updateFilteredTickers();
+            setupStockListScrollbar();
+        }}
+
+        function stockItemHtml(stock) {{
+            const displayName = stock.종목명 && stock.종목명 !== stock.종목코드 ? stock.종목명 : stock.종목코드;
+            const signals = [];
+            if (stock.Ryan_진입신호) signals.push('<span class="signal-badge ryan">Ryan</span>');
+            if (stock.미너비니_진입신호) signals.push('<span class="signal-badge minervini">Minervini</span>');
+
+            return `
+                <div class="stock-item" onclick="showStock('${{stock.종목코드}}')" data-ticker="${{stock.종목코드}}">
+                    <div class="stock-item-header">
+                        <div>
+                            <div class="stock-name">${{displayName}}</div>
+                            <div class="stock-code">${{stock.종목코드}}</div>
                         </div>
-                        <div class="stock-signals">${{signals.join('')}}</div>
+                        <div class="rs-badge">RS ${{stock.RS등급}}</div>
                     </div>
-                `;
+                    <div class="stock-signals">${{signals.join('')}}</div>
+                </div>
+            `;
+        }}
+
+        // 서버 목록 API로 한 페이지씩 렌더링 (append: 다음 페이지를 이어붙임)
+        async function renderServerStockList(append) {{
+            const stockList = document.getElementById('stockList');
+            const requestId = ++listRequestId;
+            const page = append ? listPage + 1 : 1;
+            const params = new URLSearchParams({{
+                date: currentData.date,
+                signalFilter: document.getElementById('signalFilter')?.value || 'any',
+                sortBy: document.getElementById('sortBy')?.value || 'rs-desc',
+                page: String(page),
+                pageSize: String(LIST_PAGE_SIZE)
             }});
+            for (const id of ['rsMin', 'rsMax']) {{
+                const value = document.getElementById(id)?.value;
+                if (value !== undefined && value !== '' && !Number.isNaN(parseFloat(value))) params.set(id, value);
+            }}
 
-            stockList.innerHTML = html;
+            const response = await fetch(`${{API_PATH}}/signal-list?${{params}}`);
+            if (!response.ok) throw new Error('목록 로드 실패');
+            const data = await response.json();
+            if (requestId !== listRequestId) return;
+            listPage = page;
+
+            const rowsHtml = data.rows.map(stockItemHtml).join('');
+            const moreHtml = page * data.pageSize < data.total
+                ? '<button class="load-more" onclick="loadMoreStocks()">더 보기</button>'
+                : '';
+            if (append) {{
+                stockList.querySelector('.load-more')?.remove();
+                stockList.insertAdjacentHTML('beforeend', rowsHtml + moreHtml);
+            }} else if (data.total === 0) {{
+                stockList.innerHTML = '<div class="loading">진입신호가 없습니다 (다른 날짜를 선택하세요)</div>';
+            }} else {{
+                stockList.innerHTML = `<div class="loading">총 ${{data.total}}개 종목</div>` + rowsHtml + moreHtml;
+            }}
             updateFilteredTickers();
             setupStockListScrollbar();
         }}
 
+        function loadMoreStocks() {{
+            renderServerStockList(true).catch(error => console.error('목록 로드 오류:', error));
+        }}
+
+        // 종목 전체 레코드 (서버 목록이면 상세 API로 받아 currentData.signals에 보관)
+        async function getStockRecord(ticker) {{
+            let stock = currentData.signals.find(s => s.종목코드 === ticker);
+            if (stock || !currentData.serverList) return stock;
+            const params = new URLSearchParams({{ date: currentData.date, ticker }});
+            const response = await fetch(`${{API_PATH}}/signal?${{params}}`);
+            if (!response.ok) return null;
+            stock = await response.json();
+            currentData.signals.push(stock);
+            return stock;
+        }}
+
         // 종목 상세 표시
-        function showStock(ticker) {{
-            const stock = currentData.signals.find(s => s.종목코드 === ticker);
-            if (!stock) return;
+        async function showStock(ticker) {{
+            const requestId = ++showRequestId;
+            const stock = await getStockRecord(ticker);
+            if (!stock || requestId !== showRequestId) return;
 
             // 활성화 표시
             document.querySelectorAll('.stock-item').forEach(item => {{
@@ -1061,20 +1167,12 @@ def generate_interactive_dashboard():
             `;
 
             // 차트
-            if (currentData.chart_data && currentData.chart_data[ticker]) {{
-                html += `
-                    <div class="chart-container">
-                        <div id="chartMessage" class="chart-empty">차트 데이터를 표시할 수 없습니다.</div>
-                        <canvas id="priceChart" width="800" height="400"></canvas>
-                    </div>
-                `;
-            }} else {{
-                html += `
-                    <div class="chart-container">
-                        <div id="chartMessage" class="chart-empty" style="display:flex;">차트 데이터가 없습니다.</div>
-                    </div>
-                `;
-            }}
+            html += `
+                <div class="chart-container">
+                    <div id="chartMessage" class="chart-empty" style="display:flex;">차트 로딩 중...</div>
+                    <canvas id="priceChart" data-ticker="${{ticker}}" width="800" height="400"></canvas>
+                </div>
+            `;
 
             html += `
                 <div class="price-grid">
@@ -1218,9 +1316,16 @@ def generate_interactive_dashboard():
             detail.innerHTML = html;
 
             // 차트 생성
-            if (currentData.chart_data && currentData.chart_data[ticker]) {{
-                setTimeout(() => drawChart(ticker), 100);
-            }}
+            loadChart(ticker).then(chartData => {{
+                const canvas = document.getElementById('priceChart');
+                if (!canvas || canvas.dataset.ticker !== ticker) return;
+                if (chartData) {{
+                    drawChart(ticker, chartData);
+                }} else {{
+                    canvas.style.display = 'none';
+                    document.getElementById('chartMessage').textContent = '차트 데이터가 없습니다.';
+                }}
+            }});
         }}
 
         function updateFilteredTickers() {{
@@ -1294,9 +1399,57 @@ def generate_interactive_dashboard():
             }});
         }}
 
+        // 종목 차트 로드 (예전 signals 파일은 chart_data 내장, 이후는 종목별 차트 파일)
+        async function loadChart(ticker) {{
+            const embedded = currentData?.chart_data?.[ticker];
+            if (embedded) return embedded;
+            if (!chartCache.has(ticker)) {{
+                const request = fetch(`${{DATA_CHART_PATH}}/${{ticker}}.json`)
+                    .then(response => response.ok ? response.json() : null)
+                    .then(data => data ? decodeChart(data) : null)
+                    .catch(error => {{
+                        console.error('차트 로드 오류:', error);
+                        return null;
+                    }});
+                chartCache.set(ticker, request);
+            }}
+            const chartData = await chartCache.get(ticker);
+            if (!chartData) chartCache.delete(ticker);
+            return chartData;
+        }}
+
+        // 차트 파일 디코딩 (날짜/종가/거래량은 직전 봉 대비 차이, 시고저는 종가 대비 차이, 가격은 scale배 정수)
+        function decodeChart(data) {{
+            if (data.v !== 2) return null;
+            const n = data.days.length;
+            const dayMs = 24 * 60 * 60 * 1000;
+            const chart = {{
+                dates: new Array(n),
+                open: new Array(n),
+                high: new Array(n),
+                low: new Array(n),
+                close: new Array(n),
+                volume: new Array(n)
+            }};
+            let time = Date.parse(`${{data.start}}T00:00:00Z`);
+            let close = 0;
+            let volume = 0;
+            for (let i = 0; i < n; i += 1) {{
+                time += data.days[i] * dayMs;
+                close += data.close[i];
+                volume += data.volume[i];
+                chart.dates[i] = new Date(time).toISOString().slice(0, 10);
+                chart.open[i] = (close + data.open[i]) / data.scale;
+                chart.high[i] = (close + data.high[i]) / data.scale;
+                chart.low[i] = (close + data.low[i]) / data.scale;
+                chart.close[i] = close / data.scale;
+                chart.volume[i] = volume;
+            }}
+            return chart;
+        }}
+
         // 차트 그리기
-        function drawChart(ticker) {{
-            const chartData = currentData.chart_data[ticker];
+        function drawChart(ticker, chartData) {{
             if (!chartData) return;
 
             const ctx = document.getElementById('priceChart');
@@ -0,0 +1,362 @@
+"""
+대시보드 로컬 서버 (표준 라이브러리)
+web/, data/ 정적 파일을 압축(gzip, 미리 만든 .gz/.br 우선)과 ETag/Last-Modified 재검증으로 제공하고
+날짜별 신호, 종목 차트, 조건 조회용 JSON API 제공
+
+  python src/dashboard_server.py --port 8001
+  http://127.0.0.1:8001/web/dashboard_interactive.html
+
+API
+  /api/dates                         날짜 목록 [{'date', 'signals'}]
+  /api/signals?date=YYYY-MM-DD       날짜별 signals 파일 (date 생략 시 최근, intraday 가능)
+  /api/chart?ticker=000660           종목 차트 파일
+  /api/signal-list?date=&signalFilter=&rsMin=&rsMax=&sortBy=&page=&pageSize=
+                                     신호 DB 목록 한 페이지 (요약 필드만, 대시보드 필터와 같은 값)
+  /api/signal?date=&ticker=          한 종목의 전체 신호 레코드
+"""
+
+import os
+import re
+import json
+import gzip
+import hashlib
+import argparse
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from chart_store import CHART_DIR
+from signal_db import SignalDB, SIGNAL_DB_PATH
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+WEEKLY_DIR = os.path.join(PROJECT_ROOT, "data", "weekly_data")
+INTRADAY_DIR = os.path.join(PROJECT_ROOT, "data", "intraday")
+
+DEFAULT_PAGE = '/web/dashboard_interactive.html'
+STATIC_PREFIXES = ('/web/', '/data/')
+
+# 벤더 스크립트만 재검증 없이 장기 캐시 (signals 파일은 지난 날짜도 다시 만들어질 수 있어 매번 재검증)
+VENDOR_MAX_AGE = 30 * 24 * 3600
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript')
+MIN_COMPRESS_SIZE = 1024
+GZIP_CACHE_SIZE = 256
+
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+TICKER_RE = re.compile(r'^[0-9A-Z]{6}$')
+
+# 신호 목록 API 페이지 크기와 요약 필드
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+SIGNAL_LIST_FIELDS = ('date', '종목코드', '종목명', 'RS등급', '현재가',
+                      'Ryan_진입신호', 'Ryan_신호강도', '미너비니_진입신호', '미너비니_신호강도', '양쪽_모두_신호')
+
+
+def cache_control(file_path):
+    """
+    파일별 Cache-Control
+
+    Args:
+        file_path (str): 파일 경로
+
+    Returns:
+        str: 벤더 스크립트는 장기 캐시, 나머지는 매번 재검증(no-cache, 바뀌지 않았으면 304)
+    """
+    if f'{os.sep}vendor{os.sep}' in file_path:
+        return f'public, max-age={VENDOR_MAX_AGE}'
+    return 'no-cache'
+
+
+def _number(value, default):
+    """쿼리 문자열 숫자 (비어 있으면 default)"""
+    return float(value) if value else default
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class DashboardRequestHandler(SimpleHTTPRequestHandler):
+    server_version = 'StockDashboard/1.0'
+
+    # 응답 압축 캐시 {(경로, ETag): gzip 바이트} (서버 전체 공유)
+    _gzip_cache = {}
+    _gzip_lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=PROJECT_ROOT, **kwargs)
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        path = urlsplit(self.path).path
+        if path in ('', '/'):
+            self.send_response(HTTPStatus.FOUND)
+            self.send_header('Location', DEFAULT_PAGE)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        try:
+            if path.startswith('/api/'):
+                self._handle_api(path, parse_qs(urlsplit(self.path).query), send_body)
+            elif path.startswith(STATIC_PREFIXES):
+                self._send_file(self.translate_path(path), send_body)
+            else:
+                raise RequestError(HTTPStatus.NOT_FOUND, '경로를 찾을 수 없습니다.')
+        except RequestError as e:
+            body = json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+            self.send_response(e.status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+    # ---------- API ----------
+
+    def _handle_api(self, path, query, send_body):
+        def param(name, default=''):
+            return query.get(name, [default])[0].strip()
+
+        if path == '/api/dates':
+            self._send_json(self._dates(), send_body)
+        elif path == '/api/signals':
+            date = param('date') or self._latest_date()
+            if date == 'intraday':
+                self._send_file(os.path.join(INTRADAY_DIR, 'latest.json'), send_body)
+            elif date and DATE_RE.match(date):
+                self._send_file(os.path.join(WEEKLY_DIR, f'signals_{date}.json'), send_body)
+            else:
+                raise RequestError(HTTPStatus.BAD_REQUEST, 'date는 YYYY-MM-DD 또는 intraday여야 합니다.')
+        elif path == '/api/chart':
+            ticker = param('ticker').upper()
+            if not TICKER_RE.match(ticker):
+                raise RequestError(HTTPStatus.BAD_REQUEST, 'ticker는 6자리 종목 코드여야 합니다.')
+            self._send_file(os.path.join(CHART_DIR, f'{ticker}.json'), send_body)
+        elif path == '/api/signal-list':
+            self._send_json(self._signal_list(param), send_body)
+        elif path == '/api/signal':
+            self._send_json(self._signal_record(param), send_body)
+        else:
+            raise RequestError(HTTPStatus.NOT_FOUND, '알 수 없는 API입니다.')
+
+    def _dates(self):
+        db = self.server.signal_db()
+        dates = db.dates() if db is not None else []
+        if dates:
+            return dates
+        try:
+            with open(os.path.join(WEEKLY_DIR, 'index.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _latest_date(self):
+        dates = self._dates()
+        return max((item['date'] if isinstance(item, dict) else item) for item in dates) if dates else ''
+
+    def _open_db(self):
+        db = self.server.signal_db()
+        if db is None:
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE, '신호 DB가 없습니다. generate_weekly_data.py를 먼저 실행하세요.')
+        return db
+
+    def _signal_list(self, param):
+        """대시보드 목록 필터(signalFilter/rsMin/rsMax/sortBy)를 적용한 한 페이지"""
+        db = self._open_db()
+        date = param('date') or db.latest_date()
+        if not db.has_date(date):
+            raise RequestError(HTTPStatus.NOT_FOUND, f'{date} 신호 데이터가 없습니다.')
+        signal_filter = param('signalFilter', 'any') or 'any'
+        try:
+            conditions = {
+                'date': date,
+                'ticker': param('ticker') or None,
+                'analyzer': None if signal_filter == 'any' else signal_filter,
+                'min_rs': _number(param('rsMin'), 0),
+                'max_rs': _number(param('rsMax'), None),
+            }
+            page = max(int(param('page', '1') or 1), 1)
+            page_size = min(max(int(param('pageSize', str(DEFAULT_PAGE_SIZE)) or DEFAULT_PAGE_SIZE), 1),
+                            MAX_PAGE_SIZE)
+            records = db.query(sort=param('sortBy', 'rs-desc') or 'rs-desc', limit=page_size,
+                               offset=(page - 1) * page_size, **conditions)
+            total = db.count(**conditions)
+        except ValueError as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+        rows = [{key: record[key] for key in SIGNAL_LIST_FIELDS} for record in records]
+        return {'date': date, 'total': total, 'page': page, 'pageSize': page_size, 'rows': rows}
+
+    def _signal_record(self, param):
+        """한 종목의 전체 신호 레코드 (상세 화면용)"""
+        db = self._open_db()
+        date = param('date') or db.latest_date()
+        ticker = param('ticker').upper()
+        if not TICKER_RE.match(ticker):
+            raise RequestError(HTTPStatus.BAD_REQUEST, 'ticker는 6자리 종목 코드여야 합니다.')
+        records = db.query(date=date, ticker=ticker, with_checks=True)
+        if not records:
+            raise RequestError(HTTPStatus.NOT_FOUND, f'{date} {ticker} 신호가 없습니다.')
+        return records[0]
+
+    # ---------- 응답 ----------
+
+    def _send_json(self, payload, send_body):
+        """API JSON 응답 (본문 해시 ETag, 매번 재검증)"""
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        if self._not_modified(etag, None):
+            self._send_not_modified(etag, 'no-cache')
+            return
+        encoding, body = self._compress(('api', etag), body, 'application/json')
+        self._send_body(body, 'application/json; charset=utf-8', etag, encoding, 'no-cache', None, send_body)
+
+    def _send_file(self, file_path, send_body):
+        """정적 파일 응답 (크기+수정시각 ETag, 미리 압축한 파일 우선)"""
+        if not os.path.isfile(file_path):
+            raise RequestError(HTTPStatus.NOT_FOUND, '파일을 찾을 수 없습니다.')
+        stat = os.stat(file_path)
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        cache = cache_control(file_path)
+        if self._not_modified(etag, stat.st_mtime):
+            self._send_not_modified(etag, cache)
+            return
+
+        content_type = self.guess_type(file_path)
+        encoding, body = self._precompressed(file_path, stat.st_mtime_ns)
+        if body is None:
+            with open(file_path, 'rb') as f:
+                body = f.read()
+            encoding, body = self._compress((file_path, etag), body, content_type)
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            content_type = f'{content_type}; charset=utf-8'
+        self._send_body(body, content_type, etag, encoding, cache, stat.st_mtime, send_body)
+
+    def _accepts(self, encoding):
+        accept = self.headers.get('Accept-Encoding', '')
+        return any(part.split(';')[0].strip() == encoding for part in accept.split(','))
+
+    def _precompressed(self, file_path, mtime_ns):
+        """원본 이후에 만들어진 .br/.gz 파일이 있으면 (인코딩, 바이트)"""
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            candidate = file_path + suffix
+            if not self._accepts(encoding) or not os.path.isfile(candidate):
+                continue
+            if os.stat(candidate).st_mtime_ns < mtime_ns:
+                continue
+            with open(candidate, 'rb') as f:
+                return encoding, f.read()
+        return None, None
+
+    def _compress(self, key, body, content_type):
+        if (len(body) < MIN_COMPRESS_SIZE or not self._accepts('gzip')
+                or not content_type.startswith(COMPRESSIBLE_TYPES)):
+            return None, body
+        with self._gzip_lock:
+            compressed = self._gzip_cache.get(key)
+        if compressed is None:
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            with self._gzip_lock:
+                if len(self._gzip_cache) >= GZIP_CACHE_SIZE:
+                    self._gzip_cache.clear()
+                self._gzip_cache[key] = compressed
+        return 'gzip', compressed
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since and mtime is not None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_not_modified(self, etag, cache):
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+
+    def _send_body(self, body, content_type, etag, encoding, cache, mtime, send_body):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        # 압축본은 바이트가 다르므로 약한 ETag (재검증 시 같은 값으로 비교)
+        self.send_header('ETag', f'W/{etag}' if encoding else etag)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Cache-Control', cache)
+        if mtime is not None:
+            self.send_header('Last-Modified', formatdate(mtime, usegmt=True))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+class DashboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler=DashboardRequestHandler):
+        """
+        대시보드 서버 초기화
+
+        Args:
+            address (tuple): (호스트, 포트)
+        """
+        super().__init__(address, handler)
+        self._signal_db = None
+        self._db_lock = threading.Lock()
+
+    def signal_db(self):
+        """신호 DB (파일이 생긴 뒤 처음 요청할 때 연결, 없으면 None)"""
+        with self._db_lock:
+            if self._signal_db is None and os.path.exists(SIGNAL_DB_PATH):
+                self._signal_db = SignalDB()
+            return self._signal_db
+
+    def server_close(self):
+        super().server_close()
+        if self._signal_db is not None:
+            self._signal_db.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="대시보드 로컬 서버")
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8001,
+                        help="포트")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    server = DashboardServer((args.host, args.port))
+    print(f"대시보드 서버 실행: http://{args.host}:{args.port}{DEFAULT_PAGE}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버 종료")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,17 +7,44 @@ import FinanceDataReader as fdr
 import pandas as pd
 from datetime import datetime, timedelta
 import time
+import random
 import requests
 import json
 from bs4 import BeautifulSoup
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from price_store import PriceStore, last_settled_session, session_in_progress
+from rate_limiter import TokenBucket
+
+KRX_HEADERS = {
+    'User-Agent': 'Mozilla/5.0',
+    'Referer': 'https://data.krx.co.kr/'
+}
+KRX_META_URL = 'https://data.krx.co.kr/comm/bldAttendant/executeForResourceBundle.cmd?baseName=krx.mdc.i18n.component&key=B128.bld'
+KRX_JSON_URL = 'https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
+KRX_MARKET_IDS = {'ALL': 'ALL', 'KOSPI': 'STK', 'KOSDAQ': 'KSQ', 'KONEX': 'KNX'}
+KRX_NUMERIC_COLUMNS = ['TDD_CLSPRC', 'CMPPREVDD_PRC', 'FLUC_RT', 'TDD_OPNPRC', 'TDD_HGPRC', 'TDD_LWPRC',
+                       'ACC_TRDVOL', 'ACC_TRDVAL', 'MKTCAP', 'LIST_SHRS']
+KRX_COLUMN_MAP = {'ISU_SRT_CD': 'Code', 'ISU_ABBRV': 'Name',
+                  'TDD_CLSPRC': 'Close', 'SECT_TP_NM': 'Dept', 'FLUC_TP_CD': 'ChangeCode',
+                  'CMPPREVDD_PRC': 'Changes', 'FLUC_RT': 'ChagesRatio', 'ACC_TRDVOL': 'Volume',
+                  'ACC_TRDVAL': 'Amount', 'TDD_OPNPRC': 'Open', 'TDD_HGPRC': 'High', 'TDD_LWPRC': 'Low',
+                  'MKTCAP': 'Marcap', 'LIST_SHRS': 'Stocks', 'MKT_NM': 'Market', 'MKT_ID': 'MarketId'}
 
 
 class StockDataCollector:
-    def __init__(self):
-        """주식 데이터 수집기 초기화"""
+    def __init__(self, use_store=True, store_dir=None):
+        """
+        주식 데이터 수집기 초기화
+
+        Args:
+            use_store (bool): 로컬 가격 저장소 사용 여부 (False면 매번 전체 다운로드)
+            store_dir (str): 가격 저장소 폴더 (없으면 data/price_store)
+        """
         self.kospi_list = None
         self.kosdaq_list = None
+        self.store = PriceStore(store_dir) if use_store else None
 
     def get_stock_list(self, market='ALL'):
         """
@@ -41,41 +68,12 @@ class StockDataCollector:
                     time.sleep(2)
 
         def fetch_krx_marcap(kind):
-            mkt_map = {'KRX-MARCAP':'ALL', 'KRX':'ALL', 'KOSPI':'STK', 'KOSDAQ':'KSQ', 'KONEX':'KNX'}
-            if kind not in mkt_map:
+            mkt = 'ALL' if kind in ('KRX-MARCAP', 'KRX') else kind
+            if mkt not in KRX_MARKET_IDS:
                 raise ValueError("market은 'KOSPI', 'KOSDAQ', 또는 'ALL'이어야 합니다.")
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0',
-                'Referer': 'https://data.krx.co.kr/'
-            }
-            url = 'https://data.krx.co.kr/comm/bldAttendant/executeForResourceBundle.cmd?baseName=krx.mdc.i18n.component&key=B128.bld'
-            meta = requests.get(url, headers=headers, timeout=10).json()
-            date_str = meta['result']['output'][0]['max_work_dt']
-
-            data = {
-                'bld': 'dbms/MDC/STAT/standard/MDCSTAT01501',
-                'mktId': mkt_map[kind],
-                'trdDd': date_str,
-                'share': '1',
-                'money': '1',
-                'csvxls_isNo': 'false',
-            }
-            url = 'https://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
-            resp = requests.post(url, headers=headers, data=data, timeout=20)
-            payload = resp.json()
-            df = pd.DataFrame(payload['OutBlock_1'])
-            df = df.replace(r',', '', regex=True)
-            numeric_cols = ['CMPPREVDD_PRC', 'FLUC_RT', 'TDD_OPNPRC', 'TDD_HGPRC', 'TDD_LWPRC',
-                            'ACC_TRDVOL', 'ACC_TRDVAL', 'MKTCAP', 'LIST_SHRS']
-            df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
-            df = df.sort_values('MKTCAP', ascending=False)
-            cols_map = {'ISU_SRT_CD':'Code', 'ISU_ABBRV':'Name',
-                        'TDD_CLSPRC':'Close', 'SECT_TP_NM': 'Dept', 'FLUC_TP_CD':'ChangeCode',
-                        'CMPPREVDD_PRC':'Changes', 'FLUC_RT':'ChagesRatio', 'ACC_TRDVOL':'Volume',
-                        'ACC_TRDVAL':'Amount', 'TDD_OPNPRC':'Open', 'TDD_HGPRC':'High', 'TDD_LWPRC':'Low',
-                        'MKTCAP':'Marcap', 'LIST_SHRS':'Stocks', 'MKT_NM':'Market', 'MKT_ID': 'MarketId' }
-            df = df.rename(columns=cols_map).reset_index(drop=True)
+            df = self.get_market_snapshot(self.get_latest_trading_date(), mkt)
+            df = df.sort_values('Marcap', ascending=False).reset_index(drop=True)
             return df
 
         def fetch_naver_market_sum(sosok, pages=25):
@@ -160,11 +158,130 @@ class StockDataCollector:
         print(f"[데이터 수집] 총 {len(stock_list)}개 종목 발견")
         return stock_list
 
+    def get_latest_trading_date(self):
+        """
+        KRX 기준 최근 거래일
+
+        Returns:
+            str: YYYYMMDD
+        """
+        meta = requests.get(KRX_META_URL, headers=KRX_HEADERS, timeout=10).json()
+        return meta['result']['output'][0]['max_work_dt']
+
+    def get_market_snapshot(self, date_str, market='ALL'):
+        """
+        KRX 전 종목 일별 시세 (MDCSTAT01501) - 하루치 OHLCV/거래대금/시가총액
+
+        Args:
+            date_str (str): 거래일 (YYYYMMDD)
+            market (str): 'KOSPI', 'KOSDAQ', 'KONEX', 또는 'ALL'
+
+        Returns:
+            DataFrame: 종목별 시세 (휴장일이면 빈 DataFrame)
+        """
+        if market not in KRX_MARKET_IDS:
+            raise ValueError("market은 'KOSPI', 'KOSDAQ', 또는 'ALL'이어야 합니다.")
+
+        data = {
+            'bld': 'dbms/MDC/STAT/standard/MDCSTAT01501',
+            'mktId': KRX_MARKET_IDS[market],
+            'trdDd': date_str,
+            'share': '1',
+            'money': '1',
+            'csvxls_isNo': 'false',
+        }
+        resp = requests.post(KRX_JSON_URL, headers=KRX_HEADERS, data=data, timeout=20)
+        payload = resp.json()
+        df = pd.DataFrame(payload.get('OutBlock_1', []))
+        if len(df) == 0:
+            return pd.DataFrame(columns=list(KRX_COLUMN_MAP.values()))
+        df = df.replace(r',', '', regex=True)
+        numeric_cols = [col for col in KRX_NUMERIC_COLUMNS if col in df.columns]
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
+        df = df.rename(columns=KRX_COLUMN_MAP).reset_index(drop=True)
+        return df
+
+    def ingest_market_history(self, start_date, end_date=None, market='ALL',
+                              rate_limit=1.0, max_retries=3):
+        """
+        날짜 단위 가격 이력 수집 (거래일마다 전 종목 1회 요청) → 로컬 저장소 반영
+        - 종목 수와 무관하게 거래일 수만큼만 요청
+        - 이미 확인한 날짜(거래일/휴장일)는 다시 요청하지 않음
+
+        Args:
+            start_date (str): 시작 날짜 (YYYY-MM-DD)
+            end_date (str): 종료 날짜 (YYYY-MM-DD), 없으면 최근 거래일
+            market (str): 'KOSPI', 'KOSDAQ', 또는 'ALL'
+            rate_limit (float): 초당 최대 KRX 요청 수
+            max_retries (int): 날짜별 재시도 횟수
+
+        Returns:
+            int: 새로 반영한 거래일 수
+        """
+        if self.store is None:
+            raise ValueError("저장소를 사용하지 않는 수집기(use_store=False)입니다.")
+
+        latest = pd.Timestamp(self.get_latest_trading_date())
+        end = min(pd.Timestamp(end_date), latest) if end_date else latest
+        end = min(end, last_settled_session(end))
+        start = pd.Timestamp(start_date)
+
+        checked = self.store.checked_market_days(market)
+        days = [day for day in pd.bdate_range(start, end) if day not in checked]
+        print(f"\n[KRX 수집] {start.strftime('%Y-%m-%d')} ~ {end.strftime('%Y-%m-%d')} "
+              f"({len(days)}일 요청, 확인 완료 {len(pd.bdate_range(start, end)) - len(days)}일 생략)")
+
+        limiter = TokenBucket(rate_limit) if rate_limit else None
+        frames = []
+        checked_days = []
+        for idx, day in enumerate(days, 1):
+            date_str = day.strftime('%Y%m%d')
+            for attempt in range(max_retries + 1):
+                try:
+                    if limiter is not None:
+                        limiter.acquire()
+                    snapshot = self.get_market_snapshot(date_str, market)
+                    break
+                except Exception as e:
+                    if attempt == max_retries:
+                        raise
+                    print(f"[재시도] {date_str} {attempt + 1}/{max_retries} ({e})")
+                    time.sleep(2 ** attempt)
+
+            checked_days.append(day)
+            snapshot = snapshot[snapshot['Close'] > 0] if len(snapshot) > 0 else snapshot
+            if len(snapshot) > 0:
+                snapshot = snapshot.assign(Date=day)
+                frames.append(snapshot)
+
+            if idx % 20 == 0 or idx == len(days):
+                print(f"[KRX 수집] {idx}/{len(days)}일 ({day.strftime('%Y-%m-%d')}, {len(snapshot)}종목)")
+
+        if not checked_days:
+            return 0
+
+        trading_days = len(frames)
+        if frames:
+            panel = pd.concat(frames, ignore_index=True)
+            panel['Change'] = panel['ChagesRatio'] / 100
+            # 하락(2)/하한(5) 종목은 전일 대비 금액을 음수로 통일
+            falling = panel['ChangeCode'].astype(str).isin(['2', '5']) & (panel['Changes'] > 0)
+            panel.loc[falling, 'Changes'] = -panel.loc[falling, 'Changes']
+            updated = self.store.ingest_snapshots(
+                panel[['Date', 'Code', 'Open', 'High', 'Low', 'Close', 'Volume', 'Change', 'Changes']],
+                # 이번에 실제로 받은 날짜만 (건너뛴 이전 확인 날짜는 이번 시세에 없음)
+                min(checked_days),
+                max(checked_days),
+            )
+            print(f"[KRX 수집 완료] 거래일 {trading_days}일, {updated}개 종목 저장")
+        self.store.mark_market_days(checked_days, market)
+        return trading_days
+
     def get_intraday_price_snapshot(self, market='ALL', pages=25):
         """
         장중 가격 스냅샷(무료/비공식) 수집
         - Naver 시장 요약 페이지 기반 (지연/누락 가능)
-        - 반환 컬럼: Code, Name, Market, Close
+        - 반환 컬럼: Code, Name, Market, Close, Volume (장중 누적 거래량)
         """
         def fetch_naver_market_sum(sosok, pages=25):
             rows = []
@@ -200,14 +317,18 @@ class StockDataCollector:
                 if len(codes) < len(df):
                     codes = codes + [None] * (len(df) - len(codes))
 
-                df = df.rename(columns={'종목명': 'Name', '현재가': 'Close'})
+                df = df.rename(columns={'종목명': 'Name', '현재가': 'Close', '거래량': 'Volume'})
                 df['Code'] = codes[:len(df)]
                 df['Market'] = 'KOSPI' if sosok == 0 else 'KOSDAQ'
                 df['Close'] = pd.to_numeric(df['Close'].astype(str).str.replace(',', ''), errors='coerce')
-                rows.append(df[['Code', 'Name', 'Market', 'Close']])
+                if 'Volume' in df.columns:
+                    df['Volume'] = pd.to_numeric(df['Volume'].astype(str).str.replace(',', ''), errors='coerce')
+                else:
+                    df['Volume'] = float('nan')
+                rows.append(df[['Code', 'Name', 'Market', 'Close', 'Volume']])
 
             if not rows:
-                return pd.DataFrame(columns=['Code', 'Name', 'Market', 'Close'])
+                return pd.DataFrame(columns=['Code', 'Name', 'Market', 'Close', 'Volume'])
             combined = pd.concat(rows, ignore_index=True)
             combined = combined.dropna(subset=['Code'])
             combined = combined.drop_duplicates(subset=['Code']).reset_index(drop=True)
@@ -229,6 +350,7 @@ class StockDataCollector:
     def get_stock_price_data(self, ticker, start_date, end_date=None):
         """
         특정 종목의 가격 데이터 가져오기
+        - 로컬 저장소를 먼저 읽고, 부족한 앞/뒤 구간만 FinanceDataReader로 수집
 
         Args:
             ticker (str): 종목 코드
@@ -238,24 +360,110 @@ class StockDataCollector:
         Returns:
             DataFrame: 가격 데이터
         """
-        if end_date is None:
-            end_date = datetime.now().strftime('%Y-%m-%d')
-
         try:
-            df = fdr.DataReader(ticker, start_date, end_date)
+            df, _ = self._load_price_data(ticker, start_date, end_date)
             return df
         except Exception as e:
             print(f"[오류] {ticker} 데이터 수집 실패: {e}")
             return None
 
-    def get_bulk_price_data(self, stock_list, period_days=252, delay=0.1):
+    def _fetch_remote(self, ticker, start_date, end_date, limiter=None):
+        """FinanceDataReader 원격 요청 (레이트 리미터가 있으면 토큰 대기)"""
+        if limiter is not None:
+            limiter.acquire()
+        return fdr.DataReader(ticker, start_date, end_date)
+
+    def _load_price_data(self, ticker, start_date, end_date=None, limiter=None):
+        """
+        가격 데이터 조회 (저장소 우선, 실패 시 예외 발생)
+
+        Returns:
+            tuple: (DataFrame 또는 None, 원격 요청 발생 여부)
+        """
+        if end_date is None:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+
+        if self.store is None:
+            return self._fetch_remote(ticker, start_date, end_date, limiter), True
+        return self._load_with_store(ticker, start_date, end_date, limiter)
+
+    def _load_with_store(self, ticker, start_date, end_date, limiter=None):
+        """저장소 + 증분 수집"""
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date)
+        settled = last_settled_session(end)
+
+        coverage = self.store.coverage(ticker)
+        stored = self.store.load(ticker) if coverage else None
+        if stored is None or len(stored) == 0:
+            coverage = None
+
+        if coverage is None:
+            fetched = self._fetch_remote(ticker, start_date, end_date, limiter)
+            if fetched is None or len(fetched) == 0:
+                return fetched, True
+            self.store.save(ticker, fetched[fetched.index <= settled], start, settled)
+            return fetched, True
+
+        covered_start, covered_end = coverage
+        combined = stored
+        fetched_any = False
+
+        # 앞쪽 구간 부족
+        if start < covered_start:
+            head_end = (covered_start - timedelta(days=1)).strftime('%Y-%m-%d')
+            head = self._fetch_remote(ticker, start_date, head_end, limiter)
+            combined = PriceStore.merge(combined, head)
+            covered_start = start
+            fetched_any = True
+
+        # 뒤쪽 구간 부족 (마지막 저장 봉부터 다시 받아 수정주가 여부 확인)
+        partial = None
+        if covered_end < settled or session_in_progress(end):
+            tail_start = stored.index[-1].strftime('%Y-%m-%d')
+            tail = self._fetch_remote(ticker, tail_start, end_date, limiter)
+            fetched_any = True
+            if tail is not None and len(tail) > 0:
+                overlap = stored.index[-1]
+                if overlap in tail.index and not self._same_close(stored.loc[overlap], tail.loc[overlap]):
+                    # 액면분할/권리락 등으로 과거 가격이 수정됨 → 전체 재수집
+                    full_start = covered_start.strftime('%Y-%m-%d')
+                    tail = self._fetch_remote(ticker, full_start, end_date, limiter)
+                    combined = tail
+                else:
+                    combined = PriceStore.merge(combined, tail)
+                partial = tail[tail.index > settled]
+            covered_end = max(covered_end, settled)
+
+        if fetched_any:
+            self.store.save(ticker, combined[combined.index <= settled], covered_start, covered_end)
+            if partial is not None and len(partial) > 0:
+                combined = PriceStore.merge(combined, partial)
+
+        result = combined[(combined.index >= start) & (combined.index <= end)]
+        return result, fetched_any
+
+    @staticmethod
+    def _same_close(stored_row, fetched_row, tolerance=1e-6):
+        """겹치는 봉의 종가가 같은지 (수정주가 반영 여부 판별)"""
+        a = float(stored_row['Close'])
+        b = float(fetched_row['Close'])
+        if pd.isna(a) or pd.isna(b):
+            return pd.isna(a) and pd.isna(b)
+        return abs(a - b) <= tolerance * max(abs(a), abs(b), 1.0)
+
+    def get_bulk_price_data(self, stock_list, period_days=252, delay=0.1,
+                            workers=8, rate_limit=None, max_retries=3):
         """
         여러 종목의 가격 데이터 일괄 수집
 
         Args:
             stock_list (DataFrame): 종목 리스트
             period_days (int): 수집할 기간 (영업일 기준, 252일 = 약 1년)
-            delay (float): 각 요청 사이의 지연 시간 (초)
+            delay (float): 원격 요청 간격 (초), rate_limit이 없으면 초당 1/delay 요청으로 제한
+            workers (int): 동시 수집 스레드 수
+            rate_limit (float): 초당 최대 원격 요청 수 (모든 스레드 공유)
+            max_retries (int): 종목별 재시도 횟수
 
         Returns:
             dict: {종목코드: DataFrame} 형태의 딕셔너리
@@ -266,28 +474,87 @@ class StockDataCollector:
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
 
-        price_data = {}
-        total = len(stock_list)
-
-        print(f"\n[데이터 수집] {total}개 종목 가격 데이터 수집 시작...")
-        print(f"[데이터 수집] 기간: {start_str} ~ {end_str}")
-
-        for idx, row in stock_list.iterrows():
-            ticker = row['Code']
-            name = row['Name']
+        names = dict(zip(stock_list['Code'], stock_list['Name']))
+        if rate_limit is None and delay and delay > 0:
+            rate_limit = 1.0 / delay
+
+        return self.fetch_price_data(
+            list(stock_list['Code']),
+            start_str,
+            end_str,
+            workers=workers,
+            rate_limit=rate_limit,
+            max_retries=max_retries,
+            names=names,
+        )
+
+    def fetch_price_data(self, tickers, start_date, end_date=None, workers=8,
+                         rate_limit=10.0, max_retries=3, backoff=1.0,
+                         names=None, progress_every=50):
+        """
+        여러 종목 가격 데이터 동시 수집 (공유 토큰 버킷으로 요청 속도 제한)
 
-            if (idx + 1) % 50 == 0:
-                print(f"[진행상황] {idx + 1}/{total} 종목 처리 중... ({name})")
+        Args:
+            tickers (list): 종목 코드 리스트
+            start_date (str): 시작 날짜 (YYYY-MM-DD)
+            end_date (str): 종료 날짜 (YYYY-MM-DD), 없으면 오늘
+            workers (int): 동시 수집 스레드 수
+            rate_limit (float): 초당 최대 원격 요청 수 (None이면 제한 없음)
+            max_retries (int): 종목별 재시도 횟수
+            backoff (float): 재시도 기본 대기 시간 (초, 지수 증가)
+            names (dict): {종목코드: 종목명} 진행 표시용
+            progress_every (int): 진행 상황 출력 간격 (종목 수)
 
-            df = self.get_stock_price_data(ticker, start_str, end_str)
+        Returns:
+            dict: {종목코드: DataFrame} 형태의 딕셔너리 (입력 순서 유지)
+        """
+        if end_date is None:
+            end_date = datetime.now().strftime('%Y-%m-%d')
 
-            if df is not None and len(df) > 0:
-                price_data[ticker] = df
+        limiter = TokenBucket(rate_limit) if rate_limit else None
+        names = names or {}
+        total = len(tickers)
+        results = {}
+        failed = []
+        started = time.monotonic()
 
-            time.sleep(delay)  # API 호출 제한 방지
+        print(f"\n[데이터 수집] {total}개 종목 가격 데이터 수집 시작...")
+        print(f"[데이터 수집] 기간: {start_date} ~ {end_date} "
+              f"(스레드 {workers}개, 초당 {rate_limit or '무제한'} 요청)")
 
-        print(f"\n[데이터 수집 완료] 총 {len(price_data)}개 종목 데이터 수집 성공")
-        return price_data
+        def fetch_one(ticker):
+            for attempt in range(max_retries + 1):
+                try:
+                    df, _ = self._load_price_data(ticker, start_date, end_date, limiter)
+                    return df
+                except Exception as e:
+                    if attempt == max_retries:
+                        raise
+                    wait = backoff * (2 ** attempt) + random.uniform(0, backoff)
+                    print(f"[재시도] {ticker} {attempt + 1}/{max_retries} ({e}) - {wait:.1f}초 후")
+                    time.sleep(wait)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(fetch_one, ticker): ticker for ticker in tickers}
+            for count, future in enumerate(as_completed(futures), 1):
+                ticker = futures[future]
+                try:
+                    df = future.result()
+                    if df is not None and len(df) > 0:
+                        results[ticker] = df
+                except Exception as e:
+                    print(f"[오류] {ticker} 데이터 수집 실패: {e}")
+                    failed.append(ticker)
+
+                if progress_every and (count % progress_every == 0 or count == total):
+                    elapsed = time.monotonic() - started
+                    print(f"[진행상황] {count}/{total} 종목 처리 ({count / total * 100:.1f}%, "
+                          f"{elapsed:.1f}초) - {names.get(ticker, ticker)}")
+
+        ordered = {ticker: results[ticker] for ticker in tickers if ticker in results}
+        print(f"\n[데이터 수집 완료] 총 {len(ordered)}개 종목 데이터 수집 성공"
+              + (f" (실패 {len(failed)}개)" if failed else ""))
+        return ordered
 
     def filter_tradable_stocks(self, stock_list, min_price=1000, min_market_cap=100):
         """
@@ -6,12 +6,30 @@ David Ryan 완전 구현 전략
 import pandas as pd
 import numpy as np
 from entry_signals import EntrySignalAnalyzer
+from indicators import indicator_row, build_indicator_frame
 
 
 class DavidRyanComplete(EntrySignalAnalyzer):
-    def __init__(self):
-        """David Ryan 완전 전략 분석기"""
+    # 신호 판정 임계값 (param_sweep에서 조합별로 바꿔 평가)
+    DEFAULT_PARAMS = {
+        'rs_min': 90,           # RS 필수 하한
+        'rs_top': 95,           # RS 최상위 (25점)
+        'vcp_tightness': 8,     # VCP 마지막 수축폭(%) 상한
+        'vdu_ratio': 50,        # VDU: 10일/50일 평균 거래량(%) 상한
+        'volume_surge': 1.5,    # 피벗 돌파 거래량 배수 하한
+        'entry_score': 100,     # 진입 신호 최소 점수
+        'stop_ratio': 0.93,     # 손절가 = 진입가 x stop_ratio
+    }
+
+    def __init__(self, params=None):
+        """
+        David Ryan 완전 전략 분석기
+
+        Args:
+            params (dict): DEFAULT_PARAMS 중 바꿀 임계값 (없으면 기본값)
+        """
         super().__init__()
+        self.params = {**self.DEFAULT_PARAMS, **(params or {})}
 
     # ========== 1. 산업군 및 시장 필터 ==========
 
@@ -131,7 +149,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
 
     # ========== 3. 기술적 필터 (강화) ==========
 
-    def check_moving_average_alignment(self, price_data):
+    def check_moving_average_alignment(self, price_data, indicators=None):
         """
         이동평균선 정배열 확인
         현재가 > MA(50) > MA(150) > MA(200)
@@ -140,16 +158,17 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         if len(price_data) < 200:
             return {'aligned': False, 'score': 0}
 
-        current = price_data['Close'].iloc[-1]
-        ma_50 = price_data['Close'].iloc[-50:].mean()
-        ma_150 = price_data['Close'].iloc[-150:].mean()
-        ma_200 = price_data['Close'].iloc[-200:].mean()
+        ind = indicator_row(price_data, indicators)
+        current = ind['close']
+        ma_50 = ind['ma_50']
+        ma_150 = ind['ma_150']
+        ma_200 = ind['ma_200']
 
         # 정배열 확인
         aligned = (current > ma_50 > ma_150 > ma_200)
 
         # MA(200) 기울기 (1개월 전과 비교)
-        ma_200_past = price_data['Close'].iloc[-220:-200].mean() if len(price_data) >= 220 else ma_200
+        ma_200_past = ind['ma_200_past']
         ma_200_rising = ma_200 > ma_200_past
 
         score = 0
@@ -172,19 +191,15 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             'ma_200_rising': ma_200_rising
         }
 
-    def check_52week_position(self, price_data):
+    def check_52week_position(self, price_data, indicators=None):
         """
         52주 최저가 대비 위치
         - 최저가 대비 25~30% 이상 상승
         """
-        if len(price_data) < 252:
-            lookback = len(price_data)
-        else:
-            lookback = 252
-
-        current = price_data['Close'].iloc[-1]
-        low_52w = price_data['Low'].iloc[-lookback:].min()
-        high_52w = price_data['High'].iloc[-lookback:].max()
+        ind = indicator_row(price_data, indicators)
+        current = ind['close']
+        low_52w = ind['low_52w']
+        high_52w = ind['high_52w']
 
         gain_from_low = ((current - low_52w) / low_52w) * 100 if low_52w > 0 else 0
         distance_from_high = ((high_52w - current) / high_52w) * 100
@@ -200,7 +215,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             'high_52w': high_52w
         }
 
-    def check_vcp_detailed_ryan(self, price_data):
+    def check_vcp_detailed_ryan(self, price_data, indicators=None):
         """
         VCP (Volatility Contraction Pattern) - David Ryan 버전
         - 베이스 내 고점 대비 저점 하락폭이 점진적 축소
@@ -209,15 +224,16 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         if len(price_data) < 120:
             return {'vcp': False, 'contractions': []}
 
+        ind = indicator_row(price_data, indicators)
+
         # 최근 4개 구간으로 나누기
         periods = [60, 40, 25, 15]
         contractions = []
 
         for period in periods:
             if len(price_data) >= period:
-                segment = price_data.iloc[-period:]
-                high = segment['High'].max()
-                low = segment['Low'].min()
+                high = ind[f'high_{period}']
+                low = ind[f'low_{period}']
                 contraction_pct = ((high - low) / high) * 100
                 contractions.append(contraction_pct)
 
@@ -226,7 +242,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             is_contracting = all(contractions[i] > contractions[i+1]
                                 for i in range(len(contractions)-1))
 
-            if is_contracting and contractions[-1] < 8:
+            if is_contracting and contractions[-1] < self.params['vcp_tightness']:
                 return {
                     'vcp': True,
                     'contractions': contractions,
@@ -238,7 +254,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
 
     # ========== 4. 거래량 분석 (강화) ==========
 
-    def check_volume_dry_up_complete(self, price_data, lookback=10):
+    def check_volume_dry_up_complete(self, price_data, lookback=10, indicators=None):
         """
         VDU (Volume Dry-Up) 완전 구현
         - 돌파 직전 며칠간 거래량이 50일 평균 대비 50% 미만
@@ -246,8 +262,12 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         if len(price_data) < 60:
             return {'vdu': False, 'ratio': 100}
 
-        recent_volume = price_data['Volume'].iloc[-lookback:].mean()
-        avg_volume_50d = price_data['Volume'].iloc[-50:].mean()
+        ind = indicator_row(price_data, indicators)
+        if lookback == 10:
+            recent_volume = ind['volume_avg_10']
+        else:
+            recent_volume = price_data['Volume'].iloc[-lookback:].mean()
+        avg_volume_50d = ind['volume_avg_50']
 
         if avg_volume_50d == 0:
             return {'vdu': False, 'ratio': 100}
@@ -255,7 +275,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         ratio = (recent_volume / avg_volume_50d) * 100
 
         # 50% 미만이면 VDU 신호
-        vdu = ratio < 50
+        vdu = ratio < self.params['vdu_ratio']
 
         return {
             'vdu': vdu,
@@ -265,7 +285,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             'signal': 'Strong VDU' if vdu else 'Normal'
         }
 
-    def check_pivot_breakout_volume(self, price_data, pivot_price):
+    def check_pivot_breakout_volume(self, price_data, pivot_price, indicators=None):
         """
         피벗 돌파 거래량 확인
         - 돌파 시점 거래량이 평균 대비 +50~100% 이상
@@ -273,9 +293,10 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         if len(price_data) < 50:
             return {'volume_surge': False, 'ratio': 0}
 
-        current_price = price_data['Close'].iloc[-1]
-        current_volume = price_data['Volume'].iloc[-1]
-        avg_volume = price_data['Volume'].iloc[-50:].mean()
+        ind = indicator_row(price_data, indicators)
+        current_price = ind['close']
+        current_volume = ind['volume']
+        avg_volume = ind['volume_avg_50']
 
         # 피벗 근처 (1% 이내)
         near_pivot = abs((current_price - pivot_price) / pivot_price) <= 0.01
@@ -286,7 +307,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         volume_ratio = (current_volume / avg_volume)
 
         # 1.5배 이상 (50% 증가)
-        volume_surge = near_pivot and volume_ratio >= 1.5
+        volume_surge = near_pivot and volume_ratio >= self.params['volume_surge']
 
         return {
             'volume_surge': volume_surge,
@@ -298,19 +319,22 @@ class DavidRyanComplete(EntrySignalAnalyzer):
 
     # ========== 5. 리스크 관리 ==========
 
-    def calculate_entry_and_stops(self, price_data, pivot_price):
+    def calculate_entry_and_stops(self, price_data, pivot_price, current_price=None):
         """
         진입가 및 손절가 계산
         - 진입: 피벗 돌파 (pivot + 0.1%)
         - 손절: 진입가 -7%
         - 추가매수: 진입가 +2~3%
+
+        current_price: 현재가 (없으면 price_data 마지막 종가)
         """
         entry_price = pivot_price * 1.001  # 피벗 + 0.1%
-        stop_loss = entry_price * 0.93     # -7%
+        stop_loss = entry_price * self.params['stop_ratio']     # -7%
         add_on_price_1 = entry_price * 1.02  # +2%
         add_on_price_2 = entry_price * 1.03  # +3%
 
-        current_price = price_data['Close'].iloc[-1]
+        if current_price is None:
+            current_price = price_data['Close'].iloc[-1]
         risk_pct = ((entry_price - stop_loss) / entry_price) * 100
         potential_reward = ((pivot_price * 1.20 - entry_price) / entry_price) * 100  # 20% 목표
 
@@ -327,7 +351,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
 
     # ========== 종합 진입 신호 ==========
 
-    def david_ryan_complete_signal(self, price_data, rs_rating, fundamental_data=None):
+    def david_ryan_complete_signal(self, price_data, rs_rating, fundamental_data=None, indicators=None):
         """
         David Ryan 완전 진입 신호
 
@@ -337,6 +361,8 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         3. 52주 포지션 양호
         4. VCP 또는 VDU
         5. 피벗 돌파 + 거래량 증가
+
+        indicators: build_indicator_frame 결과 (없으면 마지막 봉 지표를 한 번만 계산해 공유)
         """
         signal = {
             'entry_signal': False,
@@ -363,13 +389,14 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         total_score = 0
 
         # 1. RS Rating (필수 90+)
-        if rs_rating < 90:
-            signal['reasons'].append(f'RS {rs_rating} < 90 (부적격)')
+        if rs_rating < self.params['rs_min']:
+            signal['reasons'].append(f"RS {rs_rating} < {self.params['rs_min']} (부적격)")
             signal['rs_check'] = False
             return signal
 
         signal['rs_check'] = True
-        if rs_rating >= 95:
+        ind = indicator_row(price_data, indicators)
+        if rs_rating >= self.params['rs_top']:
             signal['reasons'].append(f'⭐ RS {rs_rating} (최상위 5%)')
             total_score += 25
         else:
@@ -377,7 +404,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             total_score += 20
 
         # 2. 이동평균선 정배열 (필수)
-        ma_align = self.check_moving_average_alignment(price_data)
+        ma_align = self.check_moving_average_alignment(price_data, indicators=ind)
         signal['ma_alignment'] = ma_align['aligned']
         if not ma_align['aligned']:
             signal['reasons'].append('✗ 이동평균선 정배열 미충족')
@@ -388,7 +415,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         total_score += ma_align['score']
 
         # 3. 52주 포지션
-        pos_52w = self.check_52week_position(price_data)
+        pos_52w = self.check_52week_position(price_data, indicators=ind)
         signal['year_position_check'] = pos_52w['good_position']
         if pos_52w['good_position']:
             signal['reasons'].append(
@@ -401,7 +428,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             )
 
         # 4. VCP 패턴
-        vcp = self.check_vcp_detailed_ryan(price_data)
+        vcp = self.check_vcp_detailed_ryan(price_data, indicators=ind)
         signal['vcp_detected'] = vcp['vcp']
         if vcp['vcp']:
             signal['reasons'].append(
@@ -410,15 +437,15 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             total_score += 20
 
         # 5. Volume Dry-Up
-        vdu = self.check_volume_dry_up_complete(price_data)
+        vdu = self.check_volume_dry_up_complete(price_data, indicators=ind)
         signal['vdu_detected'] = vdu['vdu']
         if vdu['vdu']:
             signal['reasons'].append(f"⭐ VDU 확인 (거래량 {vdu['ratio']:.0f}%)")
             total_score += 15
 
         # 6. 피벗 포인트 및 돌파
-        pivot = price_data['High'].iloc[-30:].max()
-        current_price = price_data['Close'].iloc[-1]
+        pivot = ind['high_30']
+        current_price = ind['close']
         distance_from_pivot = ((pivot - current_price) / pivot) * 100
 
         if distance_from_pivot <= 1:
@@ -427,7 +454,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
             total_score += 20
 
             # 거래량 돌파 확인
-            vol_breakout = self.check_pivot_breakout_volume(price_data, pivot)
+            vol_breakout = self.check_pivot_breakout_volume(price_data, pivot, indicators=ind)
             signal['volume_surge'] = vol_breakout['volume_surge']
             if vol_breakout['volume_surge']:
                 signal['reasons'].append(f"⭐ 거래량 폭증 ({vol_breakout['ratio']:.1f}배)")
@@ -453,7 +480,7 @@ class DavidRyanComplete(EntrySignalAnalyzer):
                 total_score += 10
 
         # 진입가/손절가 계산
-        risk_mgmt = self.calculate_entry_and_stops(price_data, pivot)
+        risk_mgmt = self.calculate_entry_and_stops(price_data, pivot, current_price=current_price)
         signal['entry_price'] = risk_mgmt['entry_price']
         signal['stop_loss'] = risk_mgmt['stop_loss']
         signal['add_on_prices'] = [risk_mgmt['add_on_1'], risk_mgmt['add_on_2']]
@@ -463,10 +490,10 @@ class DavidRyanComplete(EntrySignalAnalyzer):
         signal['signal_strength'] = total_score
 
         # 진입 신호 (120점 이상 = 매우 강력)
-        if total_score >= 120:
+        if total_score >= max(120, self.params['entry_score']):
             signal['entry_signal'] = True
             signal['reasons'].insert(0, f'🎯 강력한 진입 신호 (점수: {total_score})')
-        elif total_score >= 100:
+        elif total_score >= self.params['entry_score']:
             signal['entry_signal'] = True
             signal['reasons'].insert(0, f'✓ 진입 가능 (점수: {total_score})')
         else:
@@ -474,6 +501,124 @@ class DavidRyanComplete(EntrySignalAnalyzer):
 
         return signal
 
+    # ========== 전체 날짜 (시계열) 모드 ==========
+
+    def david_ryan_signal_arrays(self, ind, rs_rating):
+        """
+        david_ryan_complete_signal의 점수/플래그를 배열 단위로 계산 (펀더멘털 보너스 제외)
+
+        Args:
+            ind (dict): 지표 이름 -> 배열 (build_indicator_frame 컬럼, 1차원/2차원 모두 가능)
+            rs_rating: RS Rating (스칼라 또는 지표와 같은 모양의 배열, NaN은 부적격)
+
+        Returns:
+            dict: 컬럼 이름 -> 배열 (같은 날짜의 스칼라 함수 결과와 동일)
+        """
+        close = np.asarray(ind['close'], dtype=float)
+        bars = np.asarray(ind['bars'])
+        rs = np.broadcast_to(np.asarray(rs_rating, dtype=float), close.shape)
+        ma_50 = np.asarray(ind['ma_50'], dtype=float)
+        ma_150 = np.asarray(ind['ma_150'], dtype=float)
+        ma_200 = np.asarray(ind['ma_200'], dtype=float)
+        ma_200_past = np.asarray(ind['ma_200_past'], dtype=float)
+        low_52w = np.asarray(ind['low_52w'], dtype=float)
+        high_52w = np.asarray(ind['high_52w'], dtype=float)
+        volume = np.asarray(ind['volume'], dtype=float)
+        volume_avg_10 = np.asarray(ind['volume_avg_10'], dtype=float)
+        volume_avg_50 = np.asarray(ind['volume_avg_50'], dtype=float)
+        pivot = np.asarray(ind['high_30'], dtype=float)
+        p = self.params
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 1. RS / 2. 정배열 (둘 다 필수, 미충족이면 점수 0)
+            rs_check = (bars >= 200) & (rs >= p['rs_min'])
+            aligned = ((close > ma_50) & (ma_50 > ma_150) & (ma_150 > ma_200)
+                       & (ma_200 > ma_200_past))
+            ma_alignment = rs_check & aligned
+            passed = ma_alignment
+            total = np.where(rs >= p['rs_top'], 25, 20) + 100
+
+            # 3. 52주 포지션
+            gain_from_low = np.where(low_52w > 0, ((close - low_52w) / low_52w) * 100, 0)
+            distance_from_high = ((high_52w - close) / high_52w) * 100
+            year_position = (gain_from_low >= 25) & (distance_from_high <= 25)
+            total = total + np.where(year_position, 15, 0)
+
+            # 4. VCP (60/40/25/15일 변동폭이 계속 줄고 마지막이 8% 미만)
+            contractions = [((np.asarray(ind[f'high_{n}'], dtype=float) - np.asarray(ind[f'low_{n}'], dtype=float))
+                             / np.asarray(ind[f'high_{n}'], dtype=float)) * 100
+                            for n in (60, 40, 25, 15)]
+            vcp = contractions[-1] < p['vcp_tightness']
+            for prev, nxt in zip(contractions, contractions[1:]):
+                vcp = vcp & (prev > nxt)
+            total = total + np.where(vcp, 20, 0)
+
+            # 5. VDU
+            vdu_ratio = (volume_avg_10 / volume_avg_50) * 100
+            vdu = (volume_avg_50 != 0) & (vdu_ratio < p['vdu_ratio'])
+            total = total + np.where(vdu, 15, 0)
+
+            # 6. 피벗 근접 + 거래량
+            distance_from_pivot = ((pivot - close) / pivot) * 100
+            pivot_breakout = distance_from_pivot <= 1
+            near_pivot = np.abs((close - pivot) / pivot) <= 0.01
+            volume_ratio = np.where(volume_avg_50 != 0, volume / volume_avg_50, 0)
+            volume_surge = pivot_breakout & near_pivot & (volume_ratio >= p['volume_surge'])
+            volume_points = np.where(volume_surge, 25, np.where(volume_ratio >= 1.3, 15, 0))
+            total = total + np.where(pivot_breakout, 20 + volume_points, 0)
+
+            # 진입가/손절가
+            entry_price = pivot * 1.001
+            stop_loss = entry_price * p['stop_ratio']
+            risk_pct = ((entry_price - stop_loss) / entry_price) * 100
+            reward = ((pivot * 1.20 - entry_price) / entry_price) * 100
+            risk_reward = np.where(risk_pct > 0, reward / risk_pct, 0)
+
+        signal_strength = np.where(passed, total, 0)
+        return {
+            'entry_signal': passed & (total >= p['entry_score']),
+            'signal_strength': signal_strength,
+            'entry_price': np.where(passed, entry_price, 0.0),
+            'stop_loss': np.where(passed, stop_loss, 0.0),
+            'add_on_1': np.where(passed, entry_price * 1.02, 0.0),
+            'add_on_2': np.where(passed, entry_price * 1.03, 0.0),
+            'risk_reward_ratio': np.where(passed, risk_reward, 0.0),
+            'rs_check': rs_check,
+            'ma_alignment': ma_alignment,
+            'year_position_check': passed & year_position,
+            'vcp_detected': passed & vcp,
+            'vdu_detected': passed & vdu,
+            'pivot_breakout': passed & pivot_breakout,
+            'volume_surge': passed & volume_surge,
+            'gain_from_low': gain_from_low,
+            'distance_from_high': distance_from_high,
+            'final_tightness': contractions[-1],
+            'vdu_ratio': vdu_ratio,
+            'volume_ratio': volume_ratio,
+        }
+
+    def david_ryan_signal_series(self, price_data, rs_rating, indicators=None):
+        """
+        종목 전체 기간의 David Ryan 신호를 한 번에 계산
+
+        각 행은 그 날짜까지 잘라낸 데이터로 david_ryan_complete_signal(df, rs, indicators=같은 프레임)을
+        호출한 결과와 같음 (근거 문구 대신 플래그/수치 컬럼 제공)
+
+        Args:
+            price_data (DataFrame): 가격 데이터 (전체 기간)
+            rs_rating: RS Rating (스칼라, 날짜 인덱스 Series, 또는 같은 길이 배열)
+            indicators (DataFrame): build_indicator_frame 결과 (없으면 계산)
+
+        Returns:
+            DataFrame: price_data와 같은 인덱스의 날짜별 점수/플래그
+        """
+        if indicators is None:
+            indicators = build_indicator_frame(price_data)
+        if isinstance(rs_rating, pd.Series):
+            rs_rating = rs_rating.reindex(price_data.index).to_numpy(dtype=float)
+        ind = {col: indicators[col].to_numpy() for col in indicators.columns}
+        return pd.DataFrame(self.david_ryan_signal_arrays(ind, rs_rating), index=price_data.index)
+
 
 if __name__ == "__main__":
     print("David Ryan 완전 전략 구현...")
@@ -6,15 +6,24 @@
 import pandas as pd
 import numpy as np
 
+from indicators import indicator_row, RANGE_WINDOWS
+
 
 class EntrySignalAnalyzer:
     def __init__(self):
         """진입 시점 분석기 초기화"""
         pass
 
+    def _range_high_low(self, price_data, lookback, ind):
+        """최근 lookback일 최고가/최저가 (공통 지표에 있는 창이면 재사용)"""
+        if lookback in RANGE_WINDOWS:
+            return ind[f'high_{lookback}'], ind[f'low_{lookback}']
+        recent_data = price_data.iloc[-lookback:]
+        return recent_data['High'].max(), recent_data['Low'].min()
+
     # ========== 윌리엄 오닐 진입 전략 ==========
 
-    def check_cup_with_handle(self, price_data, lookback=60):
+    def check_cup_with_handle(self, price_data, lookback=60, indicators=None):
         """
         컵 앤 핸들 패턴 확인 (William O'Neil)
 
@@ -28,12 +37,11 @@ class EntrySignalAnalyzer:
         if len(price_data) < lookback:
             return {'pattern': False, 'type': None, 'depth': 0}
 
-        recent_data = price_data.iloc[-lookback:]
+        ind = indicator_row(price_data, indicators)
 
         # 최고가와 최저가 찾기
-        high_price = recent_data['High'].max()
-        low_price = recent_data['Low'].min()
-        current_price = price_data['Close'].iloc[-1]
+        high_price, low_price = self._range_high_low(price_data, lookback, ind)
+        current_price = ind['close']
 
         # 조정 깊이 계산
         correction_depth = ((high_price - low_price) / high_price) * 100
@@ -52,7 +60,7 @@ class EntrySignalAnalyzer:
 
         return {'pattern': False, 'type': None, 'depth': correction_depth}
 
-    def check_flat_base(self, price_data, lookback=30):
+    def check_flat_base(self, price_data, lookback=30, indicators=None):
         """
         플랫 베이스 패턴 확인 (William O'Neil)
 
@@ -66,16 +74,15 @@ class EntrySignalAnalyzer:
         if len(price_data) < lookback:
             return {'pattern': False, 'tightness': 0}
 
-        recent_data = price_data.iloc[-lookback:]
+        ind = indicator_row(price_data, indicators)
 
         # 가격 범위 계산
-        high = recent_data['High'].max()
-        low = recent_data['Low'].min()
+        high, low = self._range_high_low(price_data, lookback, ind)
         price_range = ((high - low) / low) * 100
 
         # 플랫 베이스: 10-15% 이내 횡보
         if price_range <= 15:
-            current_price = price_data['Close'].iloc[-1]
+            current_price = ind['close']
             # 베이스 상단 근처 (5% 이내)
             if current_price >= high * 0.95:
                 return {
@@ -87,7 +94,7 @@ class EntrySignalAnalyzer:
 
         return {'pattern': False, 'tightness': price_range}
 
-    def check_volume_breakout(self, price_data, threshold=1.5):
+    def check_volume_breakout(self, price_data, threshold=1.5, indicators=None):
         """
         거래량 돌파 확인 (William O'Neil)
 
@@ -101,14 +108,16 @@ class EntrySignalAnalyzer:
         if len(price_data) < 50:
             return {'breakout': False, 'volume_ratio': 0}
 
+        ind = indicator_row(price_data, indicators)
+
         # 최근 거래량 vs 50일 평균
-        current_volume = price_data['Volume'].iloc[-1]
-        avg_volume_50 = price_data['Volume'].iloc[-50:].mean()
+        current_volume = ind['volume']
+        avg_volume_50 = ind['volume_avg_50']
 
         volume_ratio = current_volume / avg_volume_50
 
         # 가격 상승과 함께 거래량 증가
-        price_up = price_data['Close'].iloc[-1] > price_data['Close'].iloc[-2]
+        price_up = ind['close'] > ind['prev_close']
 
         if volume_ratio >= threshold and price_up:
             return {
@@ -119,7 +128,7 @@ class EntrySignalAnalyzer:
 
         return {'breakout': False, 'volume_ratio': volume_ratio}
 
-    def william_oneil_entry_signal(self, price_data, rs_rating):
+    def william_oneil_entry_signal(self, price_data, rs_rating, indicators=None):
         """
         윌리엄 오닐 종합 진입 신호
 
@@ -148,17 +157,18 @@ class EntrySignalAnalyzer:
         if len(price_data) < 60:
             return signal
 
-        current_price = price_data['Close'].iloc[-1]
-
         # 1. RS Rating 체크
         if rs_rating < 80:
             return signal
 
+        ind = indicator_row(price_data, indicators)
+        current_price = ind['close']
+
         signal['reasons'].append(f'RS Rating {rs_rating} (80+ ✓)')
         signal['signal_strength'] += 20
 
         # 2. 컵 앤 핸들 패턴
-        cup_handle = self.check_cup_with_handle(price_data)
+        cup_handle = self.check_cup_with_handle(price_data, indicators=ind)
         if cup_handle['pattern']:
             signal['reasons'].append(f"컵 앤 핸들 패턴 (조정 {cup_handle['depth']:.1f}%)")
             signal['signal_strength'] += 30
@@ -166,7 +176,7 @@ class EntrySignalAnalyzer:
             signal['stop_loss'] = cup_handle['pivot'] * 0.93  # 7-8% 손절
 
         # 3. 플랫 베이스 패턴
-        flat_base = self.check_flat_base(price_data)
+        flat_base = self.check_flat_base(price_data, indicators=ind)
         if flat_base['pattern']:
             signal['reasons'].append(f"플랫 베이스 ({flat_base['tightness']:.1f}% 타이트)")
             signal['signal_strength'] += 25
@@ -175,13 +185,13 @@ class EntrySignalAnalyzer:
                 signal['stop_loss'] = flat_base['pivot'] * 0.93
 
         # 4. 거래량 돌파
-        volume_bo = self.check_volume_breakout(price_data)
+        volume_bo = self.check_volume_breakout(price_data, indicators=ind)
         if volume_bo['breakout']:
             signal['reasons'].append(f"거래량 돌파 ({volume_bo['volume_ratio']:.1f}배)")
             signal['signal_strength'] += 25
 
         # 5. 52주 최고가 근접
-        high_52w = price_data['High'].iloc[-252:].max() if len(price_data) >= 252 else price_data['High'].max()
+        high_52w = ind['high_52w']
         distance_from_high = ((high_52w - current_price) / high_52w) * 100
 
         if distance_from_high <= 15:
@@ -201,7 +211,7 @@ class EntrySignalAnalyzer:
 
     # ========== 마크 미너비니 진입 전략 (SEPA) ==========
 
-    def check_stage_2_uptrend(self, price_data):
+    def check_stage_2_uptrend(self, price_data, indicators=None):
         """
         스테이지 2 상승 추세 확인 (Mark Minervini)
 
@@ -221,20 +231,24 @@ class EntrySignalAnalyzer:
         if len(price_data) < 200:
             return {'stage_2': False, 'details': []}
 
-        current_price = price_data['Close'].iloc[-1]
+        ind = indicator_row(price_data, indicators)
+        current_price = ind['close']
 
         # 이동평균선 계산
-        ma_50 = price_data['Close'].iloc[-50:].mean()
-        ma_150 = price_data['Close'].iloc[-150:].mean()
-        ma_200 = price_data['Close'].iloc[-200:].mean()
+        ma_50 = ind['ma_50']
+        ma_150 = ind['ma_150']
+        ma_200 = ind['ma_200']
 
-        # 200일 이평선 기울기
-        ma_200_past = price_data['Close'].iloc[-220:-200].mean()
+        # 200일 이평선 기울기 (220일 미만이면 있는 구간만 사용)
+        if len(price_data) >= 220:
+            ma_200_past = ind['ma_200_past']
+        else:
+            ma_200_past = price_data['Close'].iloc[-220:-200].mean()
         ma_200_rising = ma_200 > ma_200_past
 
         # 52주 최고/최저
-        high_52w = price_data['High'].iloc[-252:].max() if len(price_data) >= 252 else price_data['High'].max()
-        low_52w = price_data['Low'].iloc[-252:].min() if len(price_data) >= 252 else price_data['Low'].min()
+        high_52w = ind['high_52w']
+        low_52w = ind['low_52w']
 
         details = []
         checks = 0
@@ -295,7 +309,7 @@ class EntrySignalAnalyzer:
             'ma_200': ma_200
         }
 
-    def check_vcp_pattern(self, price_data, lookback=60):
+    def check_vcp_pattern(self, price_data, lookback=60, indicators=None):
         """
         VCP (Volatility Contraction Pattern) 확인 (Mark Minervini)
 
@@ -313,19 +327,14 @@ class EntrySignalAnalyzer:
         if len(price_data) < lookback:
             return {'vcp': False, 'contractions': []}
 
-        recent_data = price_data.iloc[-lookback:]
-
-        # 최근 3개 조정 구간 찾기
-        highs = recent_data['High'].rolling(window=5).max()
-        lows = recent_data['Low'].rolling(window=5).min()
+        ind = indicator_row(price_data, indicators)
 
-        # 간단 버전: 최근 30일, 20일, 10일의 변동폭 비교
-        vol_30 = ((recent_data['High'].iloc[-30:].max() - recent_data['Low'].iloc[-30:].min()) /
-                  recent_data['Low'].iloc[-30:].min() * 100)
-        vol_20 = ((recent_data['High'].iloc[-20:].max() - recent_data['Low'].iloc[-20:].min()) /
-                  recent_data['Low'].iloc[-20:].min() * 100)
-        vol_10 = ((recent_data['High'].iloc[-10:].max() - recent_data['Low'].iloc[-10:].min()) /
-                  recent_data['Low'].iloc[-10:].min() * 100)
+        # 간단 버전: 최근 30일, 20일, 10일의 변동폭 비교 (lookback 구간 안에서)
+        vol_30, vol_20, vol_10 = [
+            (high - low) / low * 100
+            for high, low in (self._range_high_low(price_data, min(window, lookback), ind)
+                              for window in (30, 20, 10))
+        ]
 
         contractions = [vol_30, vol_20, vol_10]
 
@@ -339,7 +348,7 @@ class EntrySignalAnalyzer:
 
         return {'vcp': False, 'contractions': contractions}
 
-    def mark_minervini_entry_signal(self, price_data, rs_rating):
+    def mark_minervini_entry_signal(self, price_data, rs_rating, indicators=None):
         """
         마크 미너비니 종합 진입 신호 (SEPA - Specific Entry Point Analysis)
 
@@ -368,10 +377,11 @@ class EntrySignalAnalyzer:
         if len(price_data) < 200:
             return signal
 
-        current_price = price_data['Close'].iloc[-1]
+        ind = indicator_row(price_data, indicators)
+        current_price = ind['close']
 
         # 1. 스테이지 2 상승 추세 (가장 중요!)
-        stage_2 = self.check_stage_2_uptrend(price_data)
+        stage_2 = self.check_stage_2_uptrend(price_data, indicators=ind)
         if not stage_2['stage_2']:
             signal['reasons'].append(f"스테이지 2 미충족 ({stage_2['checks_passed']}/7)")
             return signal
@@ -391,13 +401,13 @@ class EntrySignalAnalyzer:
             return signal
 
         # 3. VCP 패턴
-        vcp = self.check_vcp_pattern(price_data)
+        vcp = self.check_vcp_pattern(price_data, indicators=ind)
         if vcp['vcp']:
             signal['reasons'].append(f"VCP 패턴 (타이트니스 {vcp['tightness']:.1f}%) ✓")
             signal['signal_strength'] += 30
 
         # 4. 피봇 포인트 (최근 최고가)
-        pivot = price_data['High'].iloc[-10:].max()
+        pivot = ind['high_10']
 
         # 현재가가 피봇 근처 (1% 이내)
         if current_price >= pivot * 0.99:
@@ -409,7 +419,7 @@ class EntrySignalAnalyzer:
 
         # 5. 손절가 설정 (미너비니: 최대 7-8% 손절)
         # 최근 저점 또는 이동평균선 중 가까운 곳
-        recent_low = price_data['Low'].iloc[-10:].min()
+        recent_low = ind['low_10']
         ma_50 = stage_2['ma_50']
 
         # 손절선은 최근 저점과 50일 이평 중 높은 곳
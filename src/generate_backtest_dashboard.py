@@ -10,14 +10,10 @@ import os
 def generate_backtest_dashboard(backtest_df, output_file='backtest_dashboard.html'):
     """백테스팅 결과를 웹 대시보드로 생성 - 금요일별 타임라인"""
 
-    # 날짜별로 데이터 그룹화
-    dates = sorted(backtest_df['date'].unique())
-
-    # 날짜별 데이터 구조
+    # 날짜별로 데이터 그룹화 (일별 백테스트처럼 행이 많아도 한 번만 훑음)
     timeline_data = {}
-    for date in dates:
+    for date, date_data in backtest_df.groupby('date'):
         date_str = pd.to_datetime(date).strftime('%Y-%m-%d')
-        date_data = backtest_df[backtest_df['date'] == date].copy()
 
         # 진입 신호가 있는 종목만
         signals = date_data[
@@ -32,10 +28,8 @@ def generate_backtest_dashboard(backtest_df, output_file='backtest_dashboard.htm
         }
 
     # 종목별 전체 히스토리 (차트용)
-    tickers = backtest_df['ticker'].unique()
     stock_history = {}
-    for ticker in tickers:
-        ticker_data = backtest_df[backtest_df['ticker'] == ticker].sort_values('date')
+    for ticker, ticker_data in backtest_df.sort_values('date', kind='stable').groupby('ticker', sort=False):
         stock_history[ticker] = {
             'dates': ticker_data['date'].dt.strftime('%Y-%m-%d').tolist(),
             'prices': ticker_data['price'].tolist(),
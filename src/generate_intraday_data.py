@@ -13,7 +13,13 @@ import numpy as np
 import pandas as pd
 
 from data_collector import StockDataCollector
-from generate_weekly_data import analyze_date
+from advanced_entry_signals import AdvancedEntryAnalyzer
+from david_ryan_complete import DavidRyanComplete
+from generate_weekly_data import rs_weighted_return, rank_rs_ratings
+from indicators import RollingIndicatorState
+from signal_scanner import build_signal_record
+from volume_curve import VolumeCurve
+from weekly_manifest import write_json_atomic
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -46,7 +52,17 @@ def parse_args():
     parser.add_argument("--pages", type=int, default=25,
                         help="네이버 시세 페이지 수 (시장당)")
     parser.add_argument("--delay", type=float, default=0.05,
-                        help="종목별 데이터 요청 지연(초)")
+                        help="종목별 데이터 요청 지연(초, 초당 1/delay 요청으로 제한)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="가격 데이터 동시 수집 스레드 수")
+    parser.add_argument("--daemon", action="store_true",
+                        help="이력을 메모리에 둔 채 주기적으로 스냅샷만 받아 갱신")
+    parser.add_argument("--interval", type=float, default=60.0,
+                        help="데몬 모드 갱신 주기(초)")
+    parser.add_argument("--until", type=str, default="15:40",
+                        help="데몬 모드 종료 시각 (HH:MM, 비우면 날짜가 바뀔 때까지)")
+    parser.add_argument("--max-cycles", type=int, default=0,
+                        help="데몬 모드 최대 갱신 횟수 (0이면 제한 없음)")
     return parser.parse_args()
 
 
@@ -57,7 +73,10 @@ def _coerce_price(value):
         return None
 
 
-def _append_intraday_price(df, current_price, target_date):
+def _append_intraday_price(df, current_price, target_date, volume=None):
+    """
+    일봉 이력 끝에 오늘 봉 반영 (volume: 하루 예상 거래량, 없으면 새 봉 거래량 0)
+    """
     if df is None or len(df) == 0 or current_price is None:
         return df
 
@@ -70,7 +89,7 @@ def _append_intraday_price(df, current_price, target_date):
                 "High": current_price,
                 "Low": current_price,
                 "Close": current_price,
-                "Volume": 0,
+                "Volume": volume if volume is not None else 0,
             },
             index=[target_day],
         )
@@ -82,74 +101,155 @@ def _append_intraday_price(df, current_price, target_date):
             df.loc[last_idx, "High"] = max(float(df.loc[last_idx, "High"]), current_price)
         if "Low" in df.columns:
             df.loc[last_idx, "Low"] = min(float(df.loc[last_idx, "Low"]), current_price)
+        if volume is not None:
+            df.loc[last_idx, "Volume"] = volume
     return df
 
 
-def main():
-    args = parse_args()
-    market = args.market.upper()
-    if market not in {"ALL", "KOSPI", "KOSDAQ"}:
-        raise ValueError("market은 ALL/KOSPI/KOSDAQ만 지원합니다.")
+class IntradayScanner:
+    def __init__(self, history, volume_curve=None):
+        """
+        장중 스캐너 초기화 (일봉 이력은 한 번만 받아 메모리에 유지)
+
+        Args:
+            history (dict): {종목코드: 일봉 DataFrame (200봉 이상, attrs['name'] 포함)}
+            volume_curve (VolumeCurve): 장중 누적 거래량 -> 하루 예상 거래량 환산 곡선
+        """
+        self.history = history
+        self.volume_curve = volume_curve
+        self.ryan_analyzer = DavidRyanComplete()
+        self.minervini_analyzer = AdvancedEntryAnalyzer()
+        self.date = None
+        self.prices = {}
+        self.frames = {}
+        self.states = {}
+        self.returns = {}
+        self.rs_ratings = {}
+        self.records = {}
+
+    def refresh(self, price_map, target_date, volume_map=None):
+        """
+        스냅샷 가격 반영 후 가격(또는 예상 거래량)이나 RS가 바뀐 종목만 다시 평가
+
+        Args:
+            price_map (dict): {종목코드: 현재가}
+            target_date (datetime): 스냅샷 시각
+            volume_map (dict): {종목코드: 장중 누적 거래량} (거래량 곡선으로 하루 예상 거래량 환산)
+
+        Returns:
+            tuple: (신호 레코드 리스트 (analyze_date와 같은 순서/내용), 가격 변경 종목 수, 재평가 종목 수)
+        """
+        if self.date != target_date.date():
+            self.date = target_date.date()
+            self.prices, self.frames, self.returns, self.rs_ratings, self.records = {}, {}, {}, {}, {}
+            self.states = {}
+
+        quotes = {}
+        for ticker in self.history:
+            if price_map.get(ticker) is None:
+                continue
+            volume = None
+            if self.volume_curve is not None and volume_map:
+                volume = self.volume_curve.project(volume_map.get(ticker), target_date)
+            quotes[ticker] = (price_map[ticker], volume)
+
+        changed = [ticker for ticker, quote in quotes.items() if quote != self.prices.get(ticker)]
+        for ticker in changed:
+            df = self.history[ticker]
+            price, volume = quotes[ticker]
+            frame = _append_intraday_price(df[df.index <= target_date], price, target_date, volume)
+            self.frames[ticker] = frame
+            self.returns[ticker] = rs_weighted_return(frame)
+            # 지표는 종목별 증분 상태에 오늘 봉만 교체 (이력 전체를 다시 계산하지 않음)
+            if ticker in self.states:
+                last = frame.iloc[-1]
+                self.states[ticker].update(frame.index[-1], last['High'], last['Low'], last['Close'], last['Volume'])
+            else:
+                self.states[ticker] = RollingIndicatorState(frame)
+            self.prices[ticker] = quotes[ticker]
+
+        # RS는 전 종목 순위라 가격이 그대로인 종목도 등급이 바뀔 수 있음
+        active = [ticker for ticker in self.history if ticker in self.frames]
+        rs_ratings = rank_rs_ratings({ticker: self.returns[ticker] for ticker in active
+                                      if self.returns[ticker] is not None})
+        stale = set(changed)
+        stale.update(ticker for ticker in active if rs_ratings.get(ticker, 50) != self.rs_ratings.get(ticker, 50))
+        for ticker in stale:
+            self.records[ticker] = self._evaluate(ticker, self.frames[ticker], rs_ratings.get(ticker, 50))
+        self.rs_ratings = rs_ratings
+
+        signals = [self.records[ticker] for ticker in active if self.records.get(ticker) is not None]
+        return signals, len(changed), len(stale)
+
+    def _evaluate(self, ticker, df, rs):
+        """analyze_date와 같은 종목 평가 (신호가 없으면 None)"""
+        try:
+            indicators = self.states[ticker].row()
+            ryan = self.ryan_analyzer.david_ryan_complete_signal(df, rs, indicators=indicators)
+            minervini = self.minervini_analyzer.mark_minervini_advanced_signal(df, rs, indicators=indicators)
+            if ryan['entry_signal'] or minervini['entry_signal']:
+                return build_signal_record(ticker, df, rs, ryan, minervini)
+        except Exception:
+            pass
+        return None
 
-    collector = StockDataCollector()
+
+def _load_universe(collector, market, limit):
     stock_list = collector.get_stock_list(market)
     tradable = collector.filter_tradable_stocks(stock_list)
     tradable = tradable.sort_values("Marcap", ascending=False)
-    if args.limit > 0:
-        tradable = tradable.head(args.limit)
+    if limit > 0:
+        tradable = tradable.head(limit)
+    return tradable
 
-    print(f"[장중] 대상 종목 수: {len(tradable)}")
 
-    snapshot = collector.get_intraday_price_snapshot(market, pages=args.pages)
-    price_map = {
-        row["Code"]: _coerce_price(row["Close"])
-        for _, row in snapshot.iterrows()
-    }
-
-    target_date = datetime.now()
-    start_date = (target_date - timedelta(days=420)).strftime("%Y-%m-%d")
+def _snapshot_prices(collector, market, pages):
+    """스냅샷 1회 -> ({종목코드: 현재가}, {종목코드: 장중 누적 거래량})"""
+    snapshot = collector.get_intraday_price_snapshot(market, pages=pages)
+    price_map, volume_map = {}, {}
+    for _, row in snapshot.iterrows():
+        price_map[row["Code"]] = _coerce_price(row["Close"])
+        volume_map[row["Code"]] = _coerce_price(row.get("Volume"))
+    return price_map, volume_map
 
-    price_data_dict = {}
-    for idx, row in tradable.iterrows():
-        ticker = row["Code"]
-        name = row["Name"]
-        current_price = price_map.get(ticker)
-        if current_price is None:
-            continue
 
-        df = collector.get_stock_price_data(ticker, start_date)
-        if df is None or len(df) < 200:
+def _load_history(collector, tradable, price_map, target_date, args):
+    """가격이 있는 종목의 일봉 이력 (200봉 이상만)"""
+    start_date = (target_date - timedelta(days=420)).strftime("%Y-%m-%d")
+    name_map = dict(zip(tradable["Code"], tradable["Name"]))
+    tickers = [ticker for ticker in tradable["Code"] if price_map.get(ticker) is not None]
+    fetched = collector.fetch_price_data(
+        tickers,
+        start_date,
+        workers=args.workers,
+        rate_limit=(1.0 / args.delay) if args.delay > 0 else None,
+        names=name_map,
+    )
+
+    history = {}
+    for ticker, df in fetched.items():
+        if len(df) < 200:
             continue
+        df.attrs["name"] = name_map.get(ticker, ticker)
+        history[ticker] = df
+    return history
 
-        df.attrs["name"] = name
-        df = df[df.index <= target_date]
-        df = _append_intraday_price(df, current_price, target_date)
-        price_data_dict[ticker] = df
-
-        if (idx + 1) % 50 == 0:
-            print(f"[장중] 진행 {idx + 1}/{len(tradable)}")
-        if args.delay > 0:
-            time.sleep(args.delay)
-
-    if not price_data_dict:
-        print("[장중] 유효한 데이터가 없습니다.")
-        return
 
-    entry_signals, _ = analyze_date(target_date, price_data_dict)
+def _write_outputs(target_date, signals, volume_fraction=None):
     payload = {
         "date": target_date.strftime("%Y-%m-%d"),
         "time": target_date.strftime("%H:%M"),
         "source": "intraday",
-        "signals": entry_signals,
+        "signals": signals,
         "note": "Intraday snapshot (free sources, delayed/unstable).",
     }
+    if volume_fraction is not None:
+        # 거래량 지표는 누적 거래량 / volume_fraction (하루 예상 거래량) 기준
+        payload["volume_fraction"] = round(volume_fraction, 4)
 
-    os.makedirs(INTRADAY_DIR, exist_ok=True)
     latest_path = os.path.join(INTRADAY_DIR, "latest.json")
     summary_path = os.path.join(INTRADAY_DIR, "summary.json")
-
-    with open(latest_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2, cls=NumpyEncoder)
+    write_json_atomic(latest_path, payload, ensure_ascii=False, indent=2, cls=NumpyEncoder)
 
     summary = {
         "date": payload["date"],
@@ -157,10 +257,83 @@ def main():
         "signals": len(payload.get("signals", [])),
         "source": payload["source"],
     }
-    with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+    write_json_atomic(summary_path, summary, ensure_ascii=False, indent=2)
+    return latest_path
+
+
+def _update_signals(scanner, price_map, volume_map, target_date):
+    """스냅샷 반영 + 거래량 곡선 샘플 기록 + 출력 저장"""
+    curve = scanner.volume_curve
+    signals, changed, evaluated = scanner.refresh(price_map, target_date, volume_map)
+    fraction = None
+    if curve is not None:
+        fraction = curve.fraction(target_date)
+        curve.record_snapshot(target_date, volume_map)
+        curve.save()
+    latest_path = _write_outputs(target_date, signals, fraction)
+    return latest_path, signals, changed, evaluated
+
+
+def run_daemon(collector, market, scanner, args):
+    """
+    장중 반복 실행: 주기마다 스냅샷 1회 + 바뀐 종목만 재평가
+
+    --until 시각이 지나거나 날짜가 바뀌면 종료 (일봉 이력은 하루 단위로 유효)
+    """
+    until = datetime.strptime(args.until, "%H:%M").time() if args.until else None
+    start_day = datetime.now().date()
+    next_run = time.monotonic() + args.interval
+    cycles = 0
+    while args.max_cycles <= 0 or cycles < args.max_cycles:
+        time.sleep(max(0.0, next_run - time.monotonic()))
+        next_run += args.interval
+        now = datetime.now()
+        if now.date() != start_day or (until is not None and now.time() > until):
+            print("[장중] 종료 시각 도달")
+            break
+
+        try:
+            price_map, volume_map = _snapshot_prices(collector, market, args.pages)
+            _, signals, changed, evaluated = _update_signals(scanner, price_map, volume_map, now)
+            print(f"[장중] {now.strftime('%H:%M:%S')} 가격 변경 {changed}개 / 재평가 {evaluated}개 / 신호 {len(signals)}개")
+        except Exception as e:
+            print(f"[장중] 갱신 실패: {e}")
+        cycles += 1
+
+
+def main():
+    args = parse_args()
+    market = args.market.upper()
+    if market not in {"ALL", "KOSPI", "KOSDAQ"}:
+        raise ValueError("market은 ALL/KOSPI/KOSDAQ만 지원합니다.")
+
+    collector = StockDataCollector()
+    tradable = _load_universe(collector, market, args.limit)
+    print(f"[장중] 대상 종목 수: {len(tradable)}")
+
+    target_date = datetime.now()
+    price_map, volume_map = _snapshot_prices(collector, market, args.pages)
+    history = _load_history(collector, tradable, price_map, target_date, args)
+    if not history:
+        print("[장중] 유효한 데이터가 없습니다.")
+        return
 
-    print(f"[장중] 완료: {latest_path}")
+    volume_curve = VolumeCurve()
+    calibrated = volume_curve.calibrate(history, target_date.date())
+    if calibrated:
+        print(f"[장중] 거래량 곡선 보정: {calibrated}일")
+    print(f"[장중] 현재 시각 누적 거래량 비율: {volume_curve.fraction(target_date):.0%}")
+
+    scanner = IntradayScanner(history, volume_curve)
+    latest_path, signals, _, _ = _update_signals(scanner, price_map, volume_map, target_date)
+    print(f"[장중] 완료: {latest_path} (신호 {len(signals)}개)")
+
+    if args.daemon:
+        print(f"[장중] 데몬 모드: {args.interval:g}초마다 갱신")
+        try:
+            run_daemon(collector, market, scanner, args)
+        except KeyboardInterrupt:
+            print("\n[장중] 중단")
 
 
 if __name__ == "__main__":
@@ -6,6 +6,9 @@
 import sys
 import os
 import argparse
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import pandas as pd
@@ -14,6 +17,14 @@ from data_collector import StockDataCollector
 from advanced_entry_signals import AdvancedEntryAnalyzer
 from david_ryan_complete import DavidRyanComplete
 from rs_calculator import RSCalculator
+from rs_history import RSHistory
+from indicators import build_indicator_frame
+from signal_scanner import BatchSignalScanner, build_signal_record
+from signal_cache import (SignalCache, RYAN, MINERVINI, analyzer_version, default_versions,
+                          frame_fingerprint, is_stub)
+from chart_store import ChartStore
+from weekly_manifest import WeeklyManifest, date_fingerprint, write_json_atomic
+from signal_db import SignalDB
 import json
 import numpy as np
 import glob
@@ -26,6 +37,55 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
 DATA_DIR = os.path.join(PROJECT_ROOT, "data", "weekly_data")
 
 
+# 프로세스 풀 워커별 스캐너 (공유 배열을 메모리 매핑으로 열어 재사용)
+_WORKER_SCANNER = None
+
+
+_WORKER_CACHE = None
+
+
+def _init_scan_worker(shared_dir, cache_path=None):
+    global _WORKER_SCANNER, _WORKER_CACHE
+    _WORKER_SCANNER = BatchSignalScanner.load_shared(shared_dir)
+    _WORKER_CACHE = SignalCache(cache_path) if cache_path else None
+
+
+def _scan_dates_worker(dates):
+    return _WORKER_SCANNER.scan_dates(dates, cache=_WORKER_CACHE)
+
+
+def scan_dates_parallel(scanner, dates, workers, cache_path=None):
+    """
+    날짜들을 프로세스 풀로 나눠 일괄 스캔
+    패널/지표/RS 배열은 임시 폴더의 .npy 파일로 한 번 저장하고 워커는 메모리 매핑으로 공유
+
+    Args:
+        scanner (BatchSignalScanner): 메인 프로세스 스캐너
+        dates (list): 분석 날짜
+        workers (int): 프로세스 수
+        cache_path (str): 신호 캐시 경로 (워커마다 열어서 사용, 없으면 캐시 미사용)
+
+    Returns:
+        dict: {날짜: 진입신호 레코드 리스트}
+    """
+    if not dates:
+        return {}
+    workers = max(1, min(workers, len(dates)))
+    # 날짜를 번갈아 배정해 워커별 부하를 고르게
+    chunks = [dates[i::workers] for i in range(workers)]
+    results = {}
+    shared_dir = tempfile.mkdtemp(prefix='weekly_scan_')
+    try:
+        scanner.save_shared(shared_dir)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_scan_worker,
+                                 initargs=(shared_dir, cache_path)) as executor:
+            for chunk_result in executor.map(_scan_dates_worker, chunks):
+                results.update(chunk_result)
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+    return results
+
+
 class NumpyEncoder(json.JSONEncoder):
     """Custom JSON encoder for numpy types"""
     def default(self, obj):
@@ -51,35 +111,94 @@ def get_recent_weekly_fridays(weeks):
     return sorted(fridays)
 
 
-def analyze_date(target_date, price_data_dict, debug=False, debug_sample=10):
-    """특정 날짜 분석 (price_data_dict: {ticker: full_df})"""
+def get_recent_trading_days(calendar, weeks):
+    """
+    최근 N주의 모든 거래일 (가격 데이터 달력 기준, 오늘까지)
+
+    Args:
+        calendar (DatetimeIndex): 거래일 달력 (RSHistory/PricePanel dates)
+        weeks (int): 주 수
+
+    Returns:
+        list: datetime 리스트
+    """
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today - timedelta(days=7 * weeks)
+    calendar = pd.DatetimeIndex(calendar)
+    days = calendar[(calendar > start) & (calendar <= today)]
+    return [day.to_pydatetime() for day in days]
+
+
+def rs_weighted_return(df):
+    """
+    RS 계산용 가중 수익률 (3개월 40%, 6/9/12개월 각 20%)
+
+    Args:
+        df (DataFrame): 분석 날짜까지의 가격 데이터
+
+    Returns:
+        float: 가중 수익률(%), 60봉 미만이거나 계산할 수 없으면 None
+    """
+    try:
+        recent = df.tail(252)
+        if len(recent) < 60:
+            return None
+        p3 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-60] - 1) * 100 if len(recent) >= 60 else 0
+        p6 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-120] - 1) * 100 if len(recent) >= 120 else 0
+        p9 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-180] - 1) * 100 if len(recent) >= 180 else 0
+        p12 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-252] - 1) * 100 if len(recent) >= 252 else 0
+        return (p3 * 0.4) + (p6 * 0.2) + (p9 * 0.2) + (p12 * 0.2)
+    except Exception:
+        return None
+
+
+def rank_rs_ratings(returns):
+    """
+    가중 수익률 순위 -> RS Rating (같은 수익률은 입력 순서대로)
+
+    Args:
+        returns (dict): {종목코드: 가중 수익률}
+
+    Returns:
+        dict: {종목코드: RS Rating}
+    """
+    sorted_returns = sorted(returns.items(), key=lambda x: x[1], reverse=True)
+    return {ticker: int((1 - idx / len(sorted_returns)) * 100) for idx, (ticker, _) in enumerate(sorted_returns)}
+
+
+def analyze_date(target_date, price_data_dict, debug=False, debug_sample=10, rs_history=None,
+                 indicator_frames=None, signal_cache=None):
+    """
+    특정 날짜 분석 (price_data_dict: {ticker: full_df})
+
+    rs_history(RSHistory)를 넘기면 날짜별 수익률 재계산 없이 미리 계산된 RS를 조회
+    indicator_frames({ticker: 지표 프레임})를 넘기면 이동평균/고저/거래량 평균을 다시 계산하지 않음
+    signal_cache(SignalCache)를 넘기면 입력 구간이 같은 종목은 저장된 결과 사용 (디버그 모드 제외)
+    """
+    indicator_frames = indicator_frames or {}
     print(f"\n분석 날짜: {target_date.strftime('%Y-%m-%d')}")
 
     start_date = (target_date - timedelta(days=400)).strftime('%Y-%m-%d')
     end_date = target_date.strftime('%Y-%m-%d')
     print(f"  데이터 범위: {start_date} ~ {end_date}")
 
-    # RS Rating 계산
-    all_returns = {}
     filtered_data = {}
     for ticker, df in price_data_dict.items():
-        try:
-            df_filtered = df[df.index <= target_date]
-            if len(df_filtered) < 200:
-                continue
-            filtered_data[ticker] = df_filtered
-            recent = df_filtered.tail(252)
-            if len(recent) >= 60:
-                p3 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-60] - 1) * 100 if len(recent) >= 60 else 0
-                p6 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-120] - 1) * 100 if len(recent) >= 120 else 0
-                p9 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-180] - 1) * 100 if len(recent) >= 180 else 0
-                p12 = (recent['Close'].iloc[-1] / recent['Close'].iloc[-252] - 1) * 100 if len(recent) >= 252 else 0
-                all_returns[ticker] = (p3 * 0.4) + (p6 * 0.2) + (p9 * 0.2) + (p12 * 0.2)
-        except:
+        df_filtered = df[df.index <= target_date]
+        if len(df_filtered) < 200:
             continue
+        filtered_data[ticker] = df_filtered
 
-    sorted_returns = sorted(all_returns.items(), key=lambda x: x[1], reverse=True)
-    rs_ratings = {ticker: int((1 - idx / len(sorted_returns)) * 100) for idx, (ticker, _) in enumerate(sorted_returns)}
+    # RS Rating 계산
+    if rs_history is not None:
+        rs_ratings = rs_history.ratings_on(target_date)
+    else:
+        all_returns = {}
+        for ticker, df_filtered in filtered_data.items():
+            weighted = rs_weighted_return(df_filtered)
+            if weighted is not None:
+                all_returns[ticker] = weighted
+        rs_ratings = rank_rs_ratings(all_returns)
 
     # 진입신호 분석
     ryan_analyzer = DavidRyanComplete()
@@ -87,11 +206,37 @@ def analyze_date(target_date, price_data_dict, debug=False, debug_sample=10):
     entry_signals = []
     debug_rows = []
 
+    if debug:
+        signal_cache = None
+    fingerprints = {}
+    cached = {RYAN: {}, MINERVINI: {}}
+    new_entries = {RYAN: {}, MINERVINI: {}}
+    if signal_cache is not None:
+        fingerprints = {ticker: frame_fingerprint(df, rs_ratings.get(ticker, 50))
+                        for ticker, df in filtered_data.items()}
+        for analyzer in cached:
+            cached[analyzer] = signal_cache.get_many(analyzer, target_date, fingerprints)
+
     for ticker, df in filtered_data.items():
         try:
             rs = rs_ratings.get(ticker, 50)
-            ryan = ryan_analyzer.david_ryan_complete_signal(df, rs)
-            minervini = minervini_analyzer.mark_minervini_advanced_signal(df, rs)
+            indicators = indicator_frames.get(ticker)
+            ryan = cached[RYAN].get(ticker)
+            minervini = cached[MINERVINI].get(ticker)
+            if ryan is None:
+                ryan = ryan_analyzer.david_ryan_complete_signal(df, rs, indicators=indicators)
+                new_entries[RYAN][ticker] = ryan
+            if minervini is None:
+                minervini = minervini_analyzer.mark_minervini_advanced_signal(df, rs, indicators=indicators)
+                new_entries[MINERVINI][ticker] = minervini
+            # 신호가 난 종목은 근거 문구가 필요하므로 요약만 캐시된 쪽은 다시 계산
+            if ryan['entry_signal'] or minervini['entry_signal']:
+                if is_stub(ryan):
+                    ryan = ryan_analyzer.david_ryan_complete_signal(df, rs, indicators=indicators)
+                    new_entries[RYAN][ticker] = ryan
+                if is_stub(minervini):
+                    minervini = minervini_analyzer.mark_minervini_advanced_signal(df, rs, indicators=indicators)
+                    new_entries[MINERVINI][ticker] = minervini
 
             if debug:
                 debug_rows.append({
@@ -107,42 +252,21 @@ def analyze_date(target_date, price_data_dict, debug=False, debug_sample=10):
                 })
 
             if ryan['entry_signal'] or minervini['entry_signal']:
-                entry_signals.append({
-                    '종목코드': ticker,
-                    '종목명': df.attrs.get('name', ticker),
-                    'RS등급': rs,
-                    '현재가': float(df['Close'].iloc[-1]),
-                    'Ryan_진입신호': ryan['entry_signal'],
-                    'Ryan_신호강도': ryan['signal_strength'],
-                    'Ryan_진입가': float(ryan['entry_price']),
-                    'Ryan_손절가': float(ryan['stop_loss']),
-                    'Ryan_추가매수1': float(ryan['add_on_prices'][0]) if ryan['add_on_prices'] else None,
-                    'Ryan_추가매수2': float(ryan['add_on_prices'][1]) if len(ryan['add_on_prices']) > 1 else None,
-                    'Ryan_손익비': float(ryan.get('risk_reward_ratio', 0)),
-                    'Ryan_근거': ' | '.join(ryan['reasons']),
-                    'Ryan_경고': ' | '.join(ryan['warnings']) if ryan['warnings'] else None,
-                    'ryan_checks': {
-                        'rs_check': bool(ryan.get('rs_check')),
-                        'ma_alignment': bool(ryan.get('ma_alignment')),
-                        'year_position_check': bool(ryan.get('year_position_check')),
-                        'vcp_detected': bool(ryan.get('vcp_detected')),
-                        'vdu_detected': bool(ryan.get('vdu_detected')),
-                        'pivot_breakout': bool(ryan.get('pivot_breakout')),
-                        'volume_surge': bool(ryan.get('volume_surge'))
-                    },
-                    '미너비니_진입신호': minervini['entry_signal'],
-                    '미너비니_신호강도': minervini['signal_strength'],
-                    '미너비니_진입가': float(minervini['entry_price']),
-                    '미너비니_손절가': float(minervini['stop_loss']),
-                    '미너비니_패턴': minervini.get('pattern_type'),
-                    '미너비니_근거': ' | '.join(minervini['reasons']),
-                    'minervini_checks': minervini.get('minervini_checks', {}),
-                    '양쪽_모두_신호': ryan['entry_signal'] and minervini['entry_signal'],
-                    'trend_template': minervini.get('trend_template', {})
-                })
+                entry_signals.append(build_signal_record(ticker, df, rs, ryan, minervini))
         except Exception as e:
             continue
 
+    if signal_cache is not None:
+        # 신호 종목만 상세 결과, 나머지는 요약만 저장
+        signal_tickers = {row['종목코드'] for row in entry_signals}
+        for analyzer, results in new_entries.items():
+            signal_cache.put_many(analyzer, target_date, {
+                ticker: (fingerprints[ticker], result if ticker in signal_tickers else
+                         {'entry_signal': bool(result['entry_signal']),
+                          'signal_strength': int(result['signal_strength'])})
+                for ticker, result in results.items()
+            })
+
     print(f"  진입신호: {len(entry_signals)}개")
     if debug:
         print(f"  [디버그] filtered_data: {len(filtered_data)} / rs_ratings: {len(rs_ratings)}")
@@ -162,8 +286,9 @@ def analyze_date(target_date, price_data_dict, debug=False, debug_sample=10):
             print(f"  [디버그] 강제 샘플 {len(forced)}개 종목")
             for ticker, df in forced:
                 rs = rs_ratings.get(ticker, 50)
-                ryan = ryan_analyzer.david_ryan_complete_signal(df, rs)
-                minervini = minervini_analyzer.mark_minervini_advanced_signal(df, rs)
+                indicators = indicator_frames.get(ticker)
+                ryan = ryan_analyzer.david_ryan_complete_signal(df, rs, indicators=indicators)
+                minervini = minervini_analyzer.mark_minervini_advanced_signal(df, rs, indicators=indicators)
                 ryan_reasons = _safe_reason_list(ryan.get('reasons', [])[:3])
                 min_reasons = _safe_reason_list(minervini.get('reasons', [])[:3])
                 print(f"    - {ticker} {df.attrs.get('name', ticker)} RS {rs}")
@@ -183,14 +308,57 @@ def analyze_date(target_date, price_data_dict, debug=False, debug_sample=10):
     return entry_signals, filtered_data
 
 
+def date_input_fingerprints(date, scanner, price_data_dict, rs_history):
+    """
+    기준일 분석 대상 종목들의 입력 구간 지문 (매니페스트 비교용)
+
+    Returns:
+        dict: {종목코드: 지문}
+    """
+    if scanner is not None:
+        return scanner.input_fingerprints(date)
+    rs_ratings = rs_history.ratings_on(date)
+    fingerprints = {}
+    for ticker, df in price_data_dict.items():
+        df_filtered = df[df.index <= date]
+        if len(df_filtered) >= 200:
+            fingerprints[ticker] = frame_fingerprint(df_filtered, rs_ratings.get(ticker, 50))
+    return fingerprints
+
+
+def load_json(path):
+    """JSON 파일 읽기 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description="주간 진입신호 데이터 생성")
     parser.add_argument("--weeks", type=str, default="12",
                         help="생성할 최근 주 수 (숫자 또는 all)")
+    parser.add_argument("--daily", action="store_true",
+                        help="금요일만이 아니라 기간 내 모든 거래일 생성")
     parser.add_argument("--debug-date", type=str, default="",
                         help="디버그할 날짜 (YYYY-MM-DD)")
     parser.add_argument("--debug-sample", type=int, default=10,
                         help="디버그 출력 샘플 종목 수")
+    parser.add_argument("--fetch-workers", type=int, default=8,
+                        help="가격 데이터 동시 수집 스레드 수")
+    parser.add_argument("--rate-limit", type=float, default=10.0,
+                        help="초당 최대 가격 데이터 요청 수")
+    parser.add_argument("--ingest-market", action="store_true",
+                        help="종목별 수집 전에 KRX 날짜 단위 시세로 가격 저장소 갱신")
+    parser.add_argument("--per-ticker-scan", action="store_true",
+                        help="패널 일괄 스캔 대신 종목별 분석기 호출로 신호 계산 (비교/디버그용)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="날짜 분석 프로세스 수 (2 이상이면 날짜를 프로세스 풀로 분산)")
+    parser.add_argument("--no-signal-cache", action="store_true",
+                        help="신호 캐시를 쓰지 않고 모든 날짜를 다시 계산")
+    parser.add_argument("--full-rebuild", action="store_true",
+                        help="매니페스트와 관계없이 모든 날짜의 signals 파일을 다시 생성")
     return parser.parse_args()
 
 
@@ -312,18 +480,24 @@ def main():
 
     print(f"\n[사전 수집] 전체 종목 가격 데이터")
     print(f"[기간] {start_str} ~ {end_str}")
-    price_data_dict = {}
-    total_tickers = len(tickers)
-    for i, ticker in enumerate(tickers, 1):
+    if args.ingest_market:
         try:
-            pct = (i / total_tickers) * 100
-            print(f"  [{i}/{total_tickers}] {ticker} ({pct:.1f}%)", end='\r')
-            df = collector.get_stock_price_data(ticker, start_str, end_str)
-            if df is not None and len(df) >= 200:
-                df.attrs['name'] = name_map.get(ticker, ticker)
-                price_data_dict[ticker] = df
-        except:
-            continue
+            collector.ingest_market_history(start_str, end_str)
+        except Exception as e:
+            print(f"[KRX 수집 실패] 종목별 수집으로 진행: {e}")
+    fetched = collector.fetch_price_data(
+        tickers,
+        start_str,
+        end_str,
+        workers=args.fetch_workers,
+        rate_limit=args.rate_limit,
+        names=name_map,
+    )
+    price_data_dict = {}
+    for ticker, df in fetched.items():
+        if len(df) >= 200:
+            df.attrs['name'] = name_map.get(ticker, ticker)
+            price_data_dict[ticker] = df
 
     print(f"\n[사전 수집 완료] {len(price_data_dict)}개 종목")
 
@@ -335,10 +509,61 @@ def main():
             continue
 
     latest_path = os.path.join(DATA_DIR, 'latest_prices.json')
-    with open(latest_path, 'w', encoding='utf-8') as f:
-        json.dump(latest_prices, f, ensure_ascii=False, indent=2)
+    if load_json(latest_path) != latest_prices:
+        write_json_atomic(latest_path, latest_prices, ensure_ascii=False, indent=2)
+
+    # 전체 날짜 RS Rating 행렬 (1회 계산 후 날짜별 조회)
+    rs_history = RSHistory.from_price_data(price_data_dict)
+    # 전체 종목 일괄 스캐너 (패널 지표 1회 계산 후 날짜별 조회)
+    scanner = None if args.per_ticker_scan else BatchSignalScanner(price_data_dict, rs_history=rs_history)
+
+    if args.daily:
+        # 금요일 대신 기간 내 모든 거래일 (오늘/디버그 날짜는 유지)
+        fridays = set(get_recent_weekly_fridays(weeks_count))
+        extra = [date for date in target_dates if date not in fridays]
+        target_dates = sorted(set(get_recent_trading_days(rs_history.dates, weeks_count)) | set(extra))
+        print(f"[일별 모드] 거래일 {len(target_dates)}개 날짜")
+    # 종목별 분석 경로(디버그/비교용)에서만 쓰는 지표 프레임
+    indicator_frames = None
+
+    # 입력 구간이 바뀌지 않은 종목/날짜는 저장된 신호 결과 재사용
+    signal_cache = None if args.no_signal_cache else SignalCache()
+
+    # 입력 지문이 매니페스트와 같고 파일이 남아 있는 날짜는 다시 쓰지 않음 (디버그 날짜 제외)
+    manifest = WeeklyManifest()
+    # 날짜/종목/RS 조회용 신호 이력 DB (JSON 파일과 같은 내용)
+    signal_db = SignalDB()
+    versions = signal_cache.versions if signal_cache is not None else default_versions()
+    output_version = '|'.join([versions[RYAN], versions[MINERVINI],
+                               analyzer_version(build_signal_record, BatchSignalScanner)])
+    names = {ticker: df.attrs.get('name', ticker) for ticker, df in price_data_dict.items()}
+    date_fingerprints = {}
+    stale_dates = []
+    for date in target_dates:
+        date_str = date.strftime('%Y-%m-%d')
+        fingerprint = date_fingerprint(
+            date_input_fingerprints(date, scanner, price_data_dict, rs_history), names, output_version)
+        date_fingerprints[date] = fingerprint
+        is_debug = debug_date is not None and date.date() == debug_date.date()
+        filename = os.path.join(DATA_DIR, f'signals_{date_str}.json')
+        if args.full_rebuild or is_debug or not manifest.is_fresh(date_str, fingerprint, filename):
+            stale_dates.append(date)
+    print(f"\n[매니페스트] 변경된 날짜 {len(stale_dates)}개 / 전체 {len(target_dates)}개")
+
+    precomputed = {}
+    batch_dates = [date for date in stale_dates
+                   if debug_date is None or date.date() != debug_date.date()]
+    if scanner is not None and args.workers > 1:
+        print(f"\n[병렬 분석] {len(batch_dates)}개 날짜 / {args.workers}개 프로세스")
+        precomputed = scan_dates_parallel(scanner, batch_dates, args.workers,
+                                          cache_path=signal_cache.path if signal_cache else None)
+    elif scanner is not None and len(batch_dates) > 1:
+        # 날짜가 많을 때(일별 모드)는 지표/RS를 한 번에 모아 전 날짜 배열 계산
+        print(f"\n[일괄 분석] {len(batch_dates)}개 날짜")
+        precomputed = scanner.scan_dates(batch_dates, cache=signal_cache)
 
     generated_dates = []
+    chart_tickers = set()
     generated_index = []
     total_dates = len(target_dates)
     for idx, date in enumerate(target_dates, 1):
@@ -346,43 +571,45 @@ def main():
         date_str = date.strftime('%Y-%m-%d')
         is_debug = debug_date is not None and date.date() == debug_date.date()
         print(f"\n[진행] 날짜 분석 {idx}/{total_dates} ({pct_dates:.1f}%)")
-        signals, price_data = analyze_date(
-            date,
-            price_data_dict,
-            debug=is_debug,
-            debug_sample=args.debug_sample
-        )
+        filename = os.path.join(DATA_DIR, f'signals_{date_str}.json')
+        if date not in stale_dates:
+            entry = manifest.entries[date_str]
+            chart_tickers.update(entry['tickers'])
+            generated_dates.append(date_str)
+            generated_index.append({"date": date_str, "signals": entry['signals']})
+            print(f"  {date_str}: 입력 변경 없음 (기존 파일 유지, 진입신호 {entry['signals']}개)")
+            if not signal_db.has_date(date_str):
+                signal_db.replace_date(date_str, load_json(filename)['signals'])
+            continue
+        if date in precomputed:
+            signals = precomputed[date]
+            print(f"  분석 날짜: {date_str} / 진입신호: {len(signals)}개")
+        elif scanner is not None and not is_debug:
+            signals = scanner.scan(date, cache=signal_cache)
+        else:
+            if indicator_frames is None:
+                indicator_frames = {ticker: build_indicator_frame(df) for ticker, df in price_data_dict.items()}
+            signals, _ = analyze_date(
+                date,
+                price_data_dict,
+                debug=is_debug,
+                debug_sample=args.debug_sample,
+                rs_history=rs_history,
+                indicator_frames=indicator_frames,
+                signal_cache=signal_cache
+            )
 
         # JSON 저장
-        signal_tickers = []
-        for row in signals:
-            code = str(row.get('종목코드', '')).zfill(6)
-            if code and code not in signal_tickers:
-                signal_tickers.append(code)
-
-        chart_payload = {}
-        for ticker in signal_tickers:
-            df = price_data_dict.get(ticker)
-            if df is None:
-                continue
-            chart_payload[ticker] = {
-                'dates': df.index.strftime('%Y-%m-%d').tolist(),
-                'open': df['Open'].tolist(),
-                'high': df['High'].tolist(),
-                'low': df['Low'].tolist(),
-                'close': df['Close'].tolist(),
-                'volume': df['Volume'].tolist()
-            }
+        chart_tickers.update(str(row.get('종목코드', '')).zfill(6) for row in signals)
 
         output = {
             'date': date_str,
-            'signals': signals,
-            'chart_data': chart_payload
+            'signals': signals
         }
 
-        filename = os.path.join(DATA_DIR, f'signals_{date_str}.json')
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, cls=NumpyEncoder, ensure_ascii=False, indent=2)
+        write_json_atomic(filename, output, cls=NumpyEncoder, ensure_ascii=False, indent=2)
+        manifest.record(date_str, date_fingerprints[date], filename, signals)
+        signal_db.replace_date(date_str, signals)
 
         print(f"  저장: {filename}")
         generated_dates.append(date_str)
@@ -391,8 +618,17 @@ def main():
     # 날짜 인덱스 저장
     index_path = os.path.join(DATA_DIR, 'index.json')
     index_payload = sorted(generated_index, key=lambda item: item["date"], reverse=True)
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(index_payload, f, ensure_ascii=False, indent=2)
+    if load_json(index_path) != index_payload:
+        write_json_atomic(index_path, index_payload, ensure_ascii=False, indent=2)
+    manifest.save()
+
+    # 차트 데이터는 종목별 파일로 한 번만 저장 (signals 파일에는 종목 코드만)
+    written = ChartStore().update_many(price_data_dict, sorted(chart_tickers))
+    print(f"\n차트 저장: {len(chart_tickers)}개 종목 중 {written}개 갱신")
+
+    signal_db.close()
+    if signal_cache is not None:
+        signal_cache.close()
 
     print("\n완료!")
 
@@ -0,0 +1,341 @@
+"""
+공통 지표 모듈
+이동평균, 52주 고저, 구간 고저, 거래량 평균을 종목당 한 번만 계산해 모든 분석기가 공유
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+MA_WINDOWS = (50, 150, 200)
+RANGE_WINDOWS = (10, 15, 20, 25, 30, 40, 60)
+VOLUME_WINDOWS = (10, 50)
+YEAR_WINDOW = 252
+
+# 200일 이평 기울기 비교용 과거 구간: iloc[-220:-200]
+MA_200_PAST_OFFSET = 200
+MA_200_PAST_SPAN = 20
+
+
+def _indicator_columns(close, high, low, volume, bars):
+    """
+    지표 컬럼 계산 (Series면 종목 하나, DataFrame이면 날짜 × 종목 전체를 한 번에)
+
+    Returns:
+        dict: 지표 이름 -> Series/DataFrame
+    """
+    columns = {
+        'bars': bars,
+        'close': close,
+        'prev_close': close.shift(1),
+        'close_40': close.shift(39),
+        'volume': volume,
+    }
+
+    for window in MA_WINDOWS:
+        columns[f'ma_{window}'] = close.rolling(window, min_periods=1).mean()
+
+    ma_200_past = close.rolling(MA_200_PAST_SPAN, min_periods=1).mean().shift(MA_200_PAST_OFFSET)
+    enough = bars >= MA_200_PAST_OFFSET + MA_200_PAST_SPAN
+    columns['ma_200_past'] = ma_200_past.where(enough, columns['ma_200'])
+
+    columns['high_52w'] = high.rolling(YEAR_WINDOW, min_periods=1).max()
+    columns['low_52w'] = low.rolling(YEAR_WINDOW, min_periods=1).min()
+
+    for window in RANGE_WINDOWS:
+        columns[f'high_{window}'] = high.rolling(window, min_periods=1).max()
+        columns[f'low_{window}'] = low.rolling(window, min_periods=1).min()
+
+    for window in VOLUME_WINDOWS:
+        columns[f'volume_avg_{window}'] = volume.rolling(window, min_periods=1).mean()
+    columns['volume_avg_10_prev'] = volume.rolling(10, min_periods=1).mean().shift(10)
+
+    return columns
+
+
+def build_indicator_frame(price_data):
+    """
+    종목 전체 기간 지표 프레임 생성 (각 행 = 그 날짜까지의 데이터로 계산한 값)
+
+    모든 창은 iloc[-n:]과 같이 봉이 n개보다 적으면 있는 봉만 사용하므로,
+    어떤 날짜의 행은 df[df.index <= 날짜]에 슬라이스로 계산한 값과 같음
+    (이동평균은 부동소수점 반올림 수준 차이만 있음)
+
+    Args:
+        price_data (DataFrame): 가격 데이터 (Open, High, Low, Close, Volume)
+
+    Returns:
+        DataFrame: price_data와 같은 인덱스의 지표 프레임
+    """
+    bars = pd.Series(np.arange(1, len(price_data) + 1), index=price_data.index)
+    columns = _indicator_columns(
+        price_data['Close'].astype(float),
+        price_data['High'].astype(float),
+        price_data['Low'].astype(float),
+        price_data['Volume'].astype(float),
+        bars,
+    )
+    return pd.DataFrame(columns, index=price_data.index)
+
+
+def build_indicator_panel(panel):
+    """
+    가격 패널 전체(날짜 × 종목) 지표 배열 생성
+
+    봉이 중간에 빠짐없이 이어지는 종목은 2차원 rolling으로 한 번에 계산하고,
+    거래정지 등으로 중간에 빈 날짜가 있는 종목만 종목별 프레임으로 계산.
+    봉이 없는 날짜는 직전 봉 값 (= df[df.index <= 날짜]의 마지막 봉 지표)
+
+    Args:
+        panel (PricePanel): 가격 패널 (Open, High, Low, Close, Volume)
+
+    Returns:
+        dict: 지표 이름 -> ndarray(날짜 수 × 종목 수), 아직 봉이 없는 칸은 NaN (bars는 0)
+    """
+    present = panel.present
+    n_dates, n_tickers = present.shape
+    counts = present.sum(axis=0)
+    first = present.argmax(axis=0)
+    last = n_dates - 1 - present[::-1].argmax(axis=0)
+    contiguous = (counts > 0) & (last - first + 1 == counts)
+    bar_counts = panel.bar_counts()
+
+    result = {}
+    if contiguous.any():
+        def block(field):
+            return pd.DataFrame(panel.field(field)[:, contiguous])
+
+        columns = _indicator_columns(block('Close'), block('High'), block('Low'), block('Volume'),
+                                     pd.DataFrame(bar_counts[:, contiguous]))
+        for name, values in columns.items():
+            result[name] = np.full((n_dates, n_tickers), np.nan)
+            result[name][:, contiguous] = values.to_numpy(dtype=float)
+
+    for col in np.flatnonzero(~contiguous & (counts > 0)):
+        frame = build_indicator_frame(panel.frame(panel.tickers[col]))
+        rows = np.flatnonzero(present[:, col])
+        for name in frame.columns:
+            if name not in result:
+                result[name] = np.full((n_dates, n_tickers), np.nan)
+            result[name][rows, col] = frame[name].to_numpy(dtype=float)
+
+    # 봉이 없는 날짜는 직전 봉 값으로 채움
+    last_rows = panel.last_present_rows()
+    cols = np.arange(n_tickers)[None, :]
+    has_bar = last_rows >= 0
+    source_rows = np.maximum(last_rows, 0)
+    for name, values in result.items():
+        result[name] = np.where(has_bar, values[source_rows, cols], np.nan)
+    result['bars'] = bar_counts
+    return result
+
+
+def latest_indicators(price_data):
+    """
+    마지막 봉 지표만 슬라이스로 계산 (프레임이 없을 때 사용, 기존 계산식과 동일)
+
+    Args:
+        price_data (DataFrame): 가격 데이터
+
+    Returns:
+        dict: build_indicator_frame과 같은 키
+    """
+    n = len(price_data)
+    close = price_data['Close']
+    high = price_data['High']
+    low = price_data['Low']
+    volume = price_data['Volume']
+
+    row = {
+        'bars': n,
+        'close': close.iloc[-1],
+        'prev_close': close.iloc[-2] if n >= 2 else np.nan,
+        'close_40': close.iloc[-40] if n >= 40 else np.nan,
+        'volume': volume.iloc[-1],
+    }
+    for window in MA_WINDOWS:
+        row[f'ma_{window}'] = close.iloc[-window:].mean()
+
+    past_end = n - MA_200_PAST_OFFSET
+    if n >= MA_200_PAST_OFFSET + MA_200_PAST_SPAN:
+        row['ma_200_past'] = close.iloc[past_end - MA_200_PAST_SPAN:past_end].mean()
+    else:
+        row['ma_200_past'] = row['ma_200']
+
+    row['high_52w'] = high.iloc[-YEAR_WINDOW:].max()
+    row['low_52w'] = low.iloc[-YEAR_WINDOW:].min()
+
+    for window in RANGE_WINDOWS:
+        row[f'high_{window}'] = high.iloc[-window:].max()
+        row[f'low_{window}'] = low.iloc[-window:].min()
+
+    for window in VOLUME_WINDOWS:
+        row[f'volume_avg_{window}'] = volume.iloc[-window:].mean()
+    row['volume_avg_10_prev'] = volume.iloc[-20:-10].mean() if n > 10 else np.nan
+
+    return row
+
+
+def indicator_row(price_data, indicators=None):
+    """
+    price_data 마지막 봉의 지표
+
+    Args:
+        price_data (DataFrame): 가격 데이터 (날짜까지 잘린 데이터 가능)
+        indicators: None이면 슬라이스로 계산, DataFrame이면 해당 날짜 행 조회,
+                    dict/Series면 이미 마지막 봉 값으로 보고 그대로 사용
+
+    Returns:
+        dict 또는 Series: 지표 값
+    """
+    if indicators is None:
+        return latest_indicators(price_data)
+    if isinstance(indicators, pd.DataFrame):
+        return indicators.loc[price_data.index[-1]]
+    return indicators
+
+
+def _dominated_high(kept, new):
+    return kept <= new
+
+
+def _dominated_low(kept, new):
+    return kept >= new
+
+
+class RollingIndicatorState:
+    def __init__(self, price_data):
+        """
+        종목 하나의 증분 지표 상태 (latest_indicators와 같은 값을 봉 하나당 상수 시간에 갱신)
+
+        마지막 봉은 '오늘 봉'으로 따로 두고, 확정된 봉은 종가/거래량 누적합과
+        구간별 고가/저가 단조 덱으로 관리 (평균은 누적합 차이, 고저는 덱 맨 앞 값과 오늘 봉 비교)
+
+        Args:
+            price_data (DataFrame): 가격 데이터 (1봉 이상, High/Low/Close/Volume)
+        """
+        bars = price_data[['High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float)
+        highs, lows, closes, volumes = bars[:-1].T
+
+        # 누적합은 앞에서부터 차례로 더한 값 (_commit으로 하나씩 더한 것과 같음)
+        self._closes = closes.tolist()
+        self._close_sums = [0.0] + np.cumsum(np.nan_to_num(closes)).tolist()
+        self._close_counts = [0] + np.cumsum(~np.isnan(closes)).tolist()
+        self._volume_sums = [0.0] + np.cumsum(np.nan_to_num(volumes)).tolist()
+        self._volume_counts = [0] + np.cumsum(~np.isnan(volumes)).tolist()
+
+        # 덱은 창에 들어가는 마지막 window-1개 봉만 넣으면 충분
+        n = len(closes)
+        self._highs = {}
+        self._lows = {}
+        for window in RANGE_WINDOWS + (YEAR_WINDOW,):
+            self._highs[window] = deque()
+            self._lows[window] = deque()
+            for index in range(max(0, n - window + 1), n):
+                self._push(self._highs[window], index, highs[index], window, _dominated_high)
+                self._push(self._lows[window], index, lows[index], window, _dominated_low)
+
+        self.date = price_data.index[-1]
+        self.today = tuple(bars[-1].tolist())
+
+    def update(self, date, high, low, close, volume):
+        """
+        오늘 봉 갱신: 같은 날짜면 오늘 봉 교체, 다음 날짜면 오늘 봉을 확정하고 새 봉 시작
+
+        Args:
+            date: 봉 날짜
+            high, low, close, volume (float): 봉 값
+        """
+        if date != self.date:
+            self._commit(*self.today)
+            self.date = date
+        self.today = (float(high), float(low), float(close), float(volume))
+
+    def row(self):
+        """
+        오늘 봉 기준 지표 (latest_indicators와 같은 키)
+
+        Returns:
+            dict: 지표 값
+        """
+        closes = self._closes
+        n = len(closes)
+        bars = n + 1
+        high, low, close, volume = self.today
+
+        row = {
+            'bars': bars,
+            'close': close,
+            'prev_close': closes[-1] if n >= 1 else np.nan,
+            'close_40': closes[bars - 40] if bars >= 40 else np.nan,
+            'volume': volume,
+        }
+        for window in MA_WINDOWS:
+            row[f'ma_{window}'] = self._mean(self._close_sums, self._close_counts,
+                                             max(0, bars - window), n, close)
+
+        if bars >= MA_200_PAST_OFFSET + MA_200_PAST_SPAN:
+            past_end = bars - MA_200_PAST_OFFSET
+            row['ma_200_past'] = self._mean(self._close_sums, self._close_counts,
+                                            past_end - MA_200_PAST_SPAN, past_end)
+        else:
+            row['ma_200_past'] = row['ma_200']
+
+        row['high_52w'] = self._extreme(self._highs[YEAR_WINDOW], high, max)
+        row['low_52w'] = self._extreme(self._lows[YEAR_WINDOW], low, min)
+        for window in RANGE_WINDOWS:
+            row[f'high_{window}'] = self._extreme(self._highs[window], high, max)
+            row[f'low_{window}'] = self._extreme(self._lows[window], low, min)
+
+        for window in VOLUME_WINDOWS:
+            row[f'volume_avg_{window}'] = self._mean(self._volume_sums, self._volume_counts,
+                                                     max(0, bars - window), n, volume)
+        if bars > 10:
+            row['volume_avg_10_prev'] = self._mean(self._volume_sums, self._volume_counts,
+                                                   max(0, bars - 20), bars - 10)
+        else:
+            row['volume_avg_10_prev'] = np.nan
+        return row
+
+    def _commit(self, high, low, close, volume):
+        """봉 확정 (누적합 추가, 덱은 오늘 봉을 뺀 최근 window-1개 확정 봉 유지)"""
+        index = len(self._closes)
+        self._closes.append(close)
+        for sums, counts, value in ((self._close_sums, self._close_counts, close),
+                                    (self._volume_sums, self._volume_counts, volume)):
+            valid = not np.isnan(value)
+            sums.append(sums[-1] + (value if valid else 0.0))
+            counts.append(counts[-1] + valid)
+
+        for window, queue in self._highs.items():
+            self._push(queue, index, high, window, _dominated_high)
+        for window, queue in self._lows.items():
+            self._push(queue, index, low, window, _dominated_low)
+
+    @staticmethod
+    def _push(queue, index, value, window, dominated):
+        if not np.isnan(value):
+            while queue and dominated(queue[-1][1], value):
+                queue.pop()
+            queue.append((index, value))
+        while queue and queue[0][0] <= index - (window - 1):
+            queue.popleft()
+
+    @staticmethod
+    def _mean(sums, counts, start, end, extra=np.nan):
+        """확정 봉 [start, end) 평균 (extra가 있으면 오늘 봉 값 포함, 결측은 제외)"""
+        total = sums[end] - sums[start]
+        count = counts[end] - counts[start]
+        if not np.isnan(extra):
+            total += extra
+            count += 1
+        return total / count if count else np.nan
+
+    @staticmethod
+    def _extreme(queue, value, pick):
+        if not queue:
+            return value
+        if np.isnan(value):
+            return queue[0][1]
+        return pick(queue[0][1], value)
@@ -0,0 +1,44 @@
+"""
+KRX 날짜 단위 가격 이력 수집
+거래일마다 전 종목 시세를 1회 요청해 로컬 가격 저장소(data/price_store)를 채움
+"""
+
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+from data_collector import StockDataCollector
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="KRX 전 종목 일별 시세로 가격 저장소 갱신")
+    parser.add_argument("--days", type=int, default=400,
+                        help="오늘 기준 수집할 과거 일수 (달력 기준)")
+    parser.add_argument("--start", type=str, default="",
+                        help="시작 날짜 (YYYY-MM-DD, 지정하면 --days 무시)")
+    parser.add_argument("--end", type=str, default="",
+                        help="종료 날짜 (YYYY-MM-DD, 없으면 최근 거래일)")
+    parser.add_argument("--market", type=str, default="ALL",
+                        help="시장: ALL/KOSPI/KOSDAQ")
+    parser.add_argument("--rate-limit", type=float, default=1.0,
+                        help="초당 최대 KRX 요청 수")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = args.start or (datetime.now() - timedelta(days=args.days)).strftime('%Y-%m-%d')
+    collector = StockDataCollector()
+    count = collector.ingest_market_history(
+        start,
+        args.end or None,
+        market=args.market.upper(),
+        rate_limit=args.rate_limit,
+    )
+    print(f"\n완료! 새로 반영한 거래일: {count}일")
+
+
+if __name__ == "__main__":
+    main()
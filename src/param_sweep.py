@@ -0,0 +1,376 @@
+"""
+신호 임계값 파라미터 스윕
+DavidRyanComplete/AdvancedEntryAnalyzer의 임계값(DEFAULT_PARAMS) 조합마다 가격 패널 전체를 배열로 다시 판정하고
+거래 시뮬레이션 결과(trade_metrics)로 조합 순위를 매김
+(패널/지표/RS 배열은 .npy로 한 번 저장하고 프로세스 풀 워커가 메모리 매핑으로 공유)
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import itertools
+import tempfile
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from advanced_entry_signals import AdvancedEntryAnalyzer
+from david_ryan_complete import DavidRyanComplete
+from price_store import PriceStore
+from signal_scanner import BatchSignalScanner, MIN_HISTORY
+from trade_simulator import BarSeries, simulate_trades, trade_metrics, MAX_HOLD, TARGET_PCT
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
+
+STRATEGIES = {
+    'ryan': DavidRyanComplete,
+    'minervini': AdvancedEntryAnalyzer,
+}
+
+# 기본 그리드 (전략별 약 500개 조합)
+DEFAULT_GRIDS = {
+    'ryan': {
+        'rs_min': [85, 90, 95],
+        'vcp_tightness': [6, 8, 10],
+        'vdu_ratio': [40, 50, 60],
+        'volume_surge': [1.3, 1.5, 2.0],
+        # RS/정배열을 통과하면 최소 120점이라 120 이하 값은 모두 같은 결과
+        'entry_score': [120, 140, 160],
+        'stop_ratio': [0.93, 0.95],
+    },
+    'minervini': {
+        'stage2_checks': [6, 7, 8],
+        'rs_min': [70, 80, 90],
+        'vcp_tightness': [6, 8, 10],
+        'pivot_near': [0.97, 0.99],
+        'entry_score': [80, 90, 100],
+        'stop_ratio': [0.90, 0.92, 0.95],
+    },
+}
+
+# 순위 계산 기본값
+DEFAULT_SORT = 'expectancy_r'
+MIN_TRADES = 30
+# 지표(200일선, 52주, RS 12개월) 계산에 필요한 평가 시작 전 기간
+HISTORY_DAYS = 400
+
+
+def expand_grid(strategy, grid):
+    """
+    파라미터 그리드 -> 조합 리스트
+
+    Args:
+        strategy (str): ryan/minervini
+        grid (dict): {파라미터: 값 리스트} (DEFAULT_PARAMS에 있는 키만 허용, 단일 값도 가능)
+
+    Returns:
+        list: 조합 dict 리스트
+    """
+    known = STRATEGIES[strategy].DEFAULT_PARAMS
+    unknown = [key for key in grid if key not in known]
+    if unknown:
+        raise ValueError(f"{strategy} 파라미터가 아님: {', '.join(unknown)} (가능: {', '.join(known)})")
+    keys = list(grid)
+    values = [v if isinstance(v, (list, tuple)) else [v] for v in grid.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+class SweepEvaluator:
+    def __init__(self, scanner, dates):
+        """
+        평가 날짜들의 지표/RS 배열을 한 번 모아두고 조합마다 분석기 배열 함수만 다시 실행
+
+        Args:
+            scanner (BatchSignalScanner): 패널/지표/RS 히스토리를 가진 스캐너 (load_shared 가능)
+            dates (list): 평가 날짜 (패널에 있는 거래일)
+        """
+        panel = scanner.panel
+        rows = np.array([panel.row_for(date) for date in dates], dtype=int)
+        rows = np.unique(rows[rows >= 0])
+        # 첫 날짜의 신호 시작 판정용으로 직전 거래일 1행을 앞에 붙여 계산 (결과에서는 제외)
+        self._lead = 1 if len(rows) and rows[0] > 0 else 0
+        if self._lead:
+            rows = np.concatenate([[rows[0] - 1], rows])
+        self.dates = panel.dates[rows]
+        self.tickers = np.array(panel.tickers)
+        self.present = np.asarray(panel.present[rows])
+        self.ind = {name: np.asarray(values[rows]) for name, values in scanner.indicators.items()}
+        self.rs = scanner.rs_matrix(rows, self.dates)
+        self.bars = BarSeries(panel)
+
+    def signals(self, strategy, params=None):
+        """
+        조합의 진입 신호 (직전 거래일에 없던 신호가 새로 켜진 날만, 연속 신호일은 첫날 한 번)
+
+        Args:
+            strategy (str): ryan/minervini
+            params (dict): 바꿀 임계값
+
+        Returns:
+            DataFrame: simulate_trades 입력 (ticker, date, entry, stop, add_on_1, add_on_2, strategy)
+        """
+        analyzer = STRATEGIES[strategy](params)
+        if strategy == 'ryan':
+            arrays = analyzer.david_ryan_signal_arrays(self.ind, self.rs)
+        else:
+            arrays = analyzer.minervini_signal_arrays(self.ind, self.rs)
+
+        entry = arrays['entry_signal'] & self.present
+        onset = entry.copy()
+        onset[1:] &= ~entry[:-1]
+        onset[:self._lead] = False
+        d, t = np.nonzero(onset)
+        zeros = np.zeros(len(d))
+        return pd.DataFrame({
+            'ticker': self.tickers[t],
+            'date': self.dates[d],
+            'entry': arrays['entry_price'][d, t],
+            'stop': arrays['stop_loss'][d, t],
+            'add_on_1': arrays['add_on_1'][d, t] if 'add_on_1' in arrays else zeros,
+            'add_on_2': arrays['add_on_2'][d, t] if 'add_on_2' in arrays else zeros,
+            'strategy': strategy,
+        })
+
+    def ledger(self, strategy, params=None, **sim_kwargs):
+        """조합의 거래 내역 (sim_kwargs는 simulate_trades 인자)"""
+        return simulate_trades(self.bars, self.signals(strategy, params), **sim_kwargs)
+
+    def metrics(self, strategy, params=None, **sim_kwargs):
+        """조합의 trade_metrics 결과"""
+        return trade_metrics(self.ledger(strategy, params, **sim_kwargs))
+
+
+# 프로세스 풀 워커별 평가기 (공유 배열을 메모리 매핑으로 열어 재사용)
+_WORKER_EVALUATOR = None
+_WORKER_SIM_KWARGS = {}
+
+
+def _init_sweep_worker(shared_dir, dates, sim_kwargs):
+    global _WORKER_EVALUATOR, _WORKER_SIM_KWARGS
+    scanner = BatchSignalScanner.load_shared(shared_dir)
+    _WORKER_EVALUATOR = SweepEvaluator(scanner, pd.DatetimeIndex(dates))
+    _WORKER_SIM_KWARGS = sim_kwargs
+
+
+def _sweep_worker(task):
+    func, strategy, params = task
+    return func(_WORKER_EVALUATOR, strategy, params, _WORKER_SIM_KWARGS)
+
+
+def combo_metrics(evaluator, strategy, params, sim_kwargs):
+    """map_combos용: 조합 파라미터 + trade_metrics"""
+    return {**params, **evaluator.metrics(strategy, params, **sim_kwargs)}
+
+
+def combo_ledger(evaluator, strategy, params, sim_kwargs):
+    """map_combos용: 조합의 거래 내역"""
+    return evaluator.ledger(strategy, params, **sim_kwargs)
+
+
+def map_combos(scanner, dates, strategy, combos, func, workers=1, sim_kwargs=None):
+    """
+    조합마다 func(evaluator, strategy, params, sim_kwargs) 실행
+
+    Args:
+        scanner (BatchSignalScanner): 메인 프로세스 스캐너
+        dates (list): 평가 날짜
+        strategy (str): ryan/minervini
+        combos (list): expand_grid 결과
+        func (callable): 모듈 최상위 함수 (combo_metrics, combo_ledger 등, 워커로 전달)
+        workers (int): 프로세스 수 (1이면 현재 프로세스에서 계산)
+        sim_kwargs (dict): simulate_trades 인자 (max_hold, target_pct, fee_pct 등)
+
+    Returns:
+        list: combos 순서의 func 결과
+    """
+    sim_kwargs = sim_kwargs or {}
+    if not combos:
+        return []
+    if workers <= 1 or len(combos) <= 1:
+        evaluator = SweepEvaluator(scanner, dates)
+        return [func(evaluator, strategy, params, sim_kwargs) for params in combos]
+
+    workers = min(workers, len(combos))
+    tasks = [(func, strategy, params) for params in combos]
+    shared_dir = tempfile.mkdtemp(prefix='param_sweep_')
+    try:
+        scanner.save_shared(shared_dir)
+        date_strings = [pd.Timestamp(date).strftime('%Y-%m-%d') for date in dates]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                 initargs=(shared_dir, date_strings, sim_kwargs)) as executor:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            return list(executor.map(_sweep_worker, tasks, chunksize=chunksize))
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+def run_sweep(scanner, dates, strategy, combos, workers=1, sim_kwargs=None):
+    """
+    조합별 거래 성과 계산
+
+    Args:
+        scanner (BatchSignalScanner): 메인 프로세스 스캐너
+        dates (list): 평가 날짜
+        strategy (str): ryan/minervini
+        combos (list): expand_grid 결과
+        workers (int): 프로세스 수 (1이면 현재 프로세스에서 계산)
+        sim_kwargs (dict): simulate_trades 인자 (max_hold, target_pct, fee_pct 등)
+
+    Returns:
+        DataFrame: 조합 파라미터 + trade_metrics 컬럼 (combos 순서)
+    """
+    return pd.DataFrame(map_combos(scanner, dates, strategy, combos, combo_metrics, workers, sim_kwargs))
+
+
+def rank_results(results, sort=DEFAULT_SORT, min_trades=MIN_TRADES):
+    """
+    거래 수가 min_trades 이상인 조합을 sort 지표 내림차순으로 정렬
+
+    Args:
+        results (DataFrame): run_sweep 결과
+        sort (str): 정렬 지표 (trade_metrics 키)
+        min_trades (int): 최소 체결 거래 수
+
+    Returns:
+        DataFrame: rank 컬럼이 붙은 정렬 결과
+    """
+    ranked = results[results['trades'] >= min_trades].sort_values(
+        [sort, 'trades'], ascending=[False, False]).reset_index(drop=True)
+    ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+    return ranked
+
+
+def load_store_universe(universe_size, start_date, tickers=None, store=None, as_of=None):
+    """
+    로컬 가격 저장소에서 스윕 대상 가격 데이터 로드 (원격 요청 없음)
+
+    Args:
+        universe_size (int): 최근 20일 평균 거래대금 상위 종목 수 (0이면 전체)
+        start_date (str): 시작 날짜 (YYYY-MM-DD)
+        tickers (list): 지정 종목만 로드 (없으면 저장소 전체)
+        store (PriceStore): 가격 저장소 (없으면 기본 경로)
+        as_of (str): 거래대금 순위 기준일 (없으면 마지막 날짜, 평가 시작일로 두면 이후 정보를 쓰지 않음)
+
+    Returns:
+        dict: {종목코드: DataFrame} (MIN_HISTORY봉 이상만)
+    """
+    store = store or PriceStore()
+    price_data = {}
+    for ticker in tickers or store.tickers():
+        df = store.load(ticker, start_date)
+        if df is not None and len(df) >= MIN_HISTORY:
+            price_data[ticker] = df
+    if universe_size and len(price_data) > universe_size:
+        cutoff = pd.Timestamp(as_of) if as_of else None
+        traded_value = {}
+        for ticker, df in price_data.items():
+            recent = df if cutoff is None else df[df.index <= cutoff]
+            traded_value[ticker] = float((recent['Close'] * recent['Volume']).iloc[-20:].mean()) if len(recent) else 0.0
+        keep = sorted(traded_value, key=traded_value.get, reverse=True)[:universe_size]
+        price_data = {ticker: price_data[ticker] for ticker in keep}
+    return price_data
+
+
+def load_grid(value, strategy):
+    """--grid 인자 (JSON 문자열 또는 JSON 파일 경로, 없으면 기본 그리드)"""
+    if not value:
+        return DEFAULT_GRIDS[strategy]
+    if os.path.exists(value):
+        with open(value, 'r', encoding='utf-8') as f:
+            grid = json.load(f)
+    else:
+        grid = json.loads(value)
+    # {"ryan": {...}, "minervini": {...}} 형태도 허용
+    if any(key in STRATEGIES for key in grid):
+        return grid.get(strategy, DEFAULT_GRIDS[strategy])
+    return grid
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="신호 임계값 파라미터 스윕 (조합별 거래 성과 순위)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES) + ['all'], default='all',
+                        help="스윕할 전략")
+    parser.add_argument("--grid", type=str, default=None,
+                        help='파라미터 그리드 JSON 또는 파일 경로 (예: \'{"rs_min": [85, 90]}\')')
+    parser.add_argument("--days", type=int, default=250,
+                        help="평가 거래일 수 (최근 N거래일)")
+    parser.add_argument("--end", type=str, default=None,
+                        help="평가 종료일 (YYYY-MM-DD, 없으면 저장된 마지막 날짜)")
+    parser.add_argument("--universe", type=int, default=600,
+                        help="최근 거래대금 상위 종목 수 (0이면 저장소 전체)")
+    parser.add_argument("--tickers", type=str, default=None,
+                        help="지정 종목만 (쉼표 구분)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="프로세스 수")
+    parser.add_argument("--sort", type=str, default=DEFAULT_SORT,
+                        help="순위 기준 지표 (expectancy_r, profit_factor, win_rate, avg_return ...)")
+    parser.add_argument("--min-trades", type=int, default=MIN_TRADES,
+                        help="순위에 넣을 최소 체결 거래 수")
+    parser.add_argument("--top", type=int, default=20,
+                        help="출력할 상위 조합 수")
+    parser.add_argument("--max-hold", type=int, default=MAX_HOLD,
+                        help="최대 보유 봉 수")
+    parser.add_argument("--target-pct", type=float, default=TARGET_PCT,
+                        help="목표 수익률(%%), 0이면 목표가 없음")
+    parser.add_argument("--fee", type=float, default=0.0,
+                        help="왕복 거래비용(%%)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    strategies = sorted(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+    sim_kwargs = {'max_hold': args.max_hold, 'target_pct': args.target_pct, 'fee_pct': args.fee}
+
+    end = pd.Timestamp(args.end) if args.end else pd.Timestamp(datetime.now().date())
+    # 평가 시작 무렵 (거래일 --days개를 넉넉히 덮는 달력 일수), 지표용 이력은 그 이전 HISTORY_DAYS
+    eval_start = end - timedelta(days=int(args.days * 1.5))
+    start_date = (eval_start - timedelta(days=HISTORY_DAYS)).strftime('%Y-%m-%d')
+    tickers = [t.strip().zfill(6) for t in args.tickers.split(",") if t.strip()] if args.tickers else None
+
+    print("=" * 80)
+    print("파라미터 스윕")
+    print("=" * 80)
+    started = time.time()
+    # 유니버스는 평가 시작 시점 거래대금 기준 (이후 정보로 종목을 고르지 않음)
+    price_data = load_store_universe(args.universe, start_date, tickers, as_of=eval_start.strftime('%Y-%m-%d'))
+    if not price_data:
+        print("[실패] 가격 저장소에 데이터 없음 (generate_weekly_data.py 또는 ingest_market_data.py로 먼저 수집)")
+        return
+    scanner = BatchSignalScanner(price_data)
+    dates = scanner.panel.dates[scanner.panel.dates <= end][-args.days:]
+    print(f"종목 {len(price_data)}개, 평가 {len(dates)}거래일 "
+          f"({dates[0].strftime('%Y-%m-%d')} ~ {dates[-1].strftime('%Y-%m-%d')}), "
+          f"준비 {time.time() - started:.1f}초")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M')
+    for strategy in strategies:
+        combos = expand_grid(strategy, load_grid(args.grid, strategy))
+        print(f"\n[{strategy}] {len(combos)}개 조합, 프로세스 {args.workers}개")
+        started = time.time()
+        results = run_sweep(scanner, dates, strategy, combos, workers=args.workers, sim_kwargs=sim_kwargs)
+        print(f"  완료 {time.time() - started:.1f}초")
+
+        ranked = rank_results(results, sort=args.sort, min_trades=args.min_trades)
+        output_path = os.path.join(RESULTS_DIR, f"param_sweep_{strategy}_{stamp}.csv")
+        results.sort_values(args.sort, ascending=False).to_csv(output_path, index=False, encoding='utf-8-sig')
+        print(f"  저장: {output_path}")
+
+        if ranked.empty:
+            print(f"  거래 {args.min_trades}건 이상인 조합 없음")
+            continue
+        columns = ['rank'] + list(combos[0]) + ['trades', 'win_rate', 'avg_return', 'profit_factor', 'expectancy_r']
+        print(ranked[columns].head(args.top).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+가격 패널 모듈
+{종목코드: DataFrame} 가격 데이터를 날짜 × 종목 2차원 배열로 정렬
+"""
+
+import numpy as np
+import pandas as pd
+
+PANEL_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class PricePanel:
+    def __init__(self, dates, tickers, fields, present, names=None):
+        """
+        가격 패널 초기화
+
+        Args:
+            dates (DatetimeIndex): 전체 종목 날짜 합집합 (오름차순)
+            tickers (list): 종목 코드 (열 순서)
+            fields (dict): {필드명: ndarray(날짜 수 × 종목 수)}
+            present (ndarray): 원본 데이터에 해당 날짜 봉이 있었는지 (bool)
+            names (dict): {종목코드: 종목명}
+        """
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = list(tickers)
+        self.fields = fields
+        self.present = present
+        self.names = names or {}
+        self.column = {ticker: idx for idx, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_price_data(cls, price_data_dict, fields=PANEL_FIELDS):
+        """
+        종목별 가격 데이터로 패널 생성 (종목 순서는 딕셔너리 순서 유지)
+
+        Args:
+            price_data_dict (dict): {종목코드: DataFrame}
+            fields (tuple): 패널에 담을 컬럼
+
+        Returns:
+            PricePanel
+        """
+        tickers = list(price_data_dict.keys())
+        if tickers:
+            dates = pd.DatetimeIndex(
+                np.unique(np.concatenate([df.index.values for df in price_data_dict.values()]))
+            )
+        else:
+            dates = pd.DatetimeIndex([])
+
+        shape = (len(dates), len(tickers))
+        arrays = {field: np.full(shape, np.nan) for field in fields}
+        present = np.zeros(shape, dtype=bool)
+        names = {}
+
+        for col, (ticker, df) in enumerate(price_data_dict.items()):
+            rows = dates.get_indexer(df.index)
+            present[rows, col] = True
+            for field in fields:
+                if field in df.columns:
+                    arrays[field][rows, col] = df[field].to_numpy(dtype=float)
+            names[ticker] = df.attrs.get('name', ticker)
+
+        return cls(dates, tickers, arrays, present, names)
+
+    def field(self, name):
+        """필드 배열 (날짜 수 × 종목 수)"""
+        return self.fields[name]
+
+    def row_for(self, date):
+        """
+        date 이전(포함) 마지막 날짜의 행 번호
+
+        Returns:
+            int: 행 번호, date가 첫 날짜보다 이르면 -1
+        """
+        return int(self.dates.searchsorted(pd.Timestamp(date), side='right')) - 1
+
+    def frame(self, ticker, fields=PANEL_FIELDS):
+        """
+        종목 하나의 가격 DataFrame 복원 (원본에 있던 봉만)
+
+        Returns:
+            DataFrame: 가격 데이터 (attrs['name'] 포함)
+        """
+        col = self.column[ticker]
+        rows = self.present[:, col]
+        df = pd.DataFrame(
+            {field: self.fields[field][rows, col] for field in fields if field in self.fields},
+            index=self.dates[rows],
+        )
+        df.index.name = 'Date'
+        df.attrs['name'] = self.names.get(ticker, ticker)
+        return df
+
+    def last_present_rows(self):
+        """
+        날짜마다 종목별로 그 날짜 이전(포함) 마지막 실제 봉의 행 번호
+
+        Returns:
+            ndarray: (날짜 수 × 종목 수), 아직 봉이 없으면 -1
+        """
+        rows = np.arange(len(self.dates))[:, None]
+        marked = np.where(self.present, rows, -1)
+        return np.maximum.accumulate(marked, axis=0)
+
+    def bar_counts(self):
+        """
+        날짜마다 종목별로 그 날짜까지 누적된 봉 개수 (= len(df[df.index <= date]))
+
+        Returns:
+            ndarray: (날짜 수 × 종목 수) int
+        """
+        return np.cumsum(self.present, axis=0)
@@ -0,0 +1,272 @@
+"""
+로컬 가격 데이터 저장소
+종목별 OHLCV를 Parquet(컬럼형) 파일로 보관하고, 부족한 구간만 증분 갱신
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, time as dtime, timedelta
+
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+PRICE_STORE_DIR = os.path.join(PROJECT_ROOT, "data", "price_store")
+
+# 날짜 단위 수집 시장 (ALL은 두 시장)
+MARKETS = ('KOSPI', 'KOSDAQ')
+
+# 장 마감(15:30) 후 일봉이 확정되는 시각
+SESSION_SETTLE_TIME = dtime(16, 0)
+
+
+def last_settled_session(end_date, now=None):
+    """
+    end_date 이전(포함) 중 일봉이 확정된 마지막 영업일(주말 제외)
+
+    Args:
+        end_date (str|datetime): 조회 종료일
+        now (datetime): 기준 시각 (테스트용, 없으면 현재)
+
+    Returns:
+        Timestamp: 확정된 마지막 영업일 (공휴일은 고려하지 않음)
+    """
+    now = now or datetime.now()
+    today = pd.Timestamp(now.date())
+    day = min(pd.Timestamp(end_date).normalize(), today)
+    if day == today and now.time() < SESSION_SETTLE_TIME:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def session_in_progress(end_date, now=None):
+    """end_date가 아직 확정되지 않은 오늘 장중 봉을 포함하는지"""
+    now = now or datetime.now()
+    today = pd.Timestamp(now.date())
+    return (pd.Timestamp(end_date).normalize() >= today
+            and today.weekday() < 5
+            and now.time() < SESSION_SETTLE_TIME)
+
+
+class PriceStore:
+    def __init__(self, base_dir=None):
+        """
+        종목별 가격 저장소 초기화
+
+        Args:
+            base_dir (str): 저장 폴더 (없으면 data/price_store)
+        """
+        self.base_dir = base_dir or PRICE_STORE_DIR
+        self.coverage_path = os.path.join(self.base_dir, 'coverage.json')
+        self.market_days_path = os.path.join(self.base_dir, 'market_days.json')
+        self._lock = threading.Lock()
+        self._coverage = None
+
+    def path(self, ticker):
+        """종목 파일 경로"""
+        return os.path.join(self.base_dir, f'{ticker}.parquet')
+
+    def _load_coverage(self):
+        if self._coverage is None:
+            self._coverage = {}
+            if os.path.exists(self.coverage_path):
+                try:
+                    with open(self.coverage_path, 'r', encoding='utf-8') as f:
+                        self._coverage = json.load(f)
+                except (OSError, ValueError):
+                    self._coverage = {}
+        return self._coverage
+
+    def coverage(self, ticker):
+        """
+        저장된 조회 구간
+
+        Returns:
+            tuple: (시작일 Timestamp, 확인 완료일 Timestamp), 없으면 None
+        """
+        with self._lock:
+            entry = self._load_coverage().get(ticker)
+        if not entry:
+            return None
+        return pd.Timestamp(entry['start']), pd.Timestamp(entry['end'])
+
+    def tickers(self):
+        """저장된 종목 코드 리스트"""
+        with self._lock:
+            return sorted(self._load_coverage().keys())
+
+    def load(self, ticker, start_date=None, end_date=None):
+        """
+        저장된 가격 데이터 읽기
+
+        Args:
+            ticker (str): 종목 코드
+            start_date (str): 시작 날짜 (YYYY-MM-DD), 없으면 처음부터
+            end_date (str): 종료 날짜 (YYYY-MM-DD), 없으면 끝까지
+
+        Returns:
+            DataFrame: 가격 데이터, 없으면 None
+        """
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None
+        df = pd.read_parquet(path)
+        if start_date is not None:
+            df = df[df.index >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df.index <= pd.Timestamp(end_date)]
+        return df
+
+    def save(self, ticker, df, start_date, checked_through):
+        """
+        가격 데이터 저장 (임시 파일 기록 후 교체)
+
+        Args:
+            ticker (str): 종목 코드
+            df (DataFrame): 저장할 전체 가격 데이터
+            start_date (Timestamp): 조회를 요청했던 가장 이른 날짜
+            checked_through (Timestamp): 원격 조회로 확인을 마친 마지막 날짜
+        """
+        self._write_frame(ticker, df)
+        self._update_coverage({ticker: (start_date, checked_through)})
+
+    def _write_frame(self, ticker, df):
+        os.makedirs(self.base_dir, exist_ok=True)
+        path = self.path(ticker)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _update_coverage(self, entries):
+        with self._lock:
+            coverage = self._load_coverage()
+            for ticker, (start_date, checked_through) in entries.items():
+                coverage[ticker] = {
+                    'start': pd.Timestamp(start_date).strftime('%Y-%m-%d'),
+                    'end': pd.Timestamp(checked_through).strftime('%Y-%m-%d'),
+                }
+            self._write_json(self.coverage_path, coverage)
+
+    @staticmethod
+    def _write_json(path, payload):
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _load_market_days(self):
+        """{시장: 날짜 문자열 집합} (이전 형식인 시장 구분 없는 리스트는 버림)"""
+        if not os.path.exists(self.market_days_path):
+            return {}
+        try:
+            with open(self.market_days_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {market: set(days) for market, days in data.items()}
+
+    def checked_market_days(self, market='ALL'):
+        """
+        날짜 단위 수집으로 이미 확인한 날짜 (거래일 + 휴장일)
+
+        Args:
+            market (str): 'KOSPI', 'KOSDAQ', 또는 'ALL' (ALL은 두 시장 모두 확인한 날짜만)
+
+        Returns:
+            set: Timestamp 집합
+        """
+        checked = self._load_market_days()
+        markets = MARKETS if market == 'ALL' else (market,)
+        days = set.intersection(*(checked.get(name, set()) for name in markets))
+        return {pd.Timestamp(day) for day in days}
+
+    def mark_market_days(self, days, market='ALL'):
+        """
+        날짜 단위 수집으로 확인한 날짜 기록
+
+        Args:
+            days (list): 확인한 날짜
+            market (str): 'KOSPI', 'KOSDAQ', 또는 'ALL' (두 시장 모두에 기록)
+        """
+        os.makedirs(self.base_dir, exist_ok=True)
+        checked = self._load_market_days()
+        added = {pd.Timestamp(day).strftime('%Y-%m-%d') for day in days}
+        for name in (MARKETS if market == 'ALL' else (market,)):
+            checked[name] = checked.get(name, set()) | added
+        self._write_json(self.market_days_path, {name: sorted(values) for name, values in checked.items()})
+
+    def ingest_snapshots(self, panel, checked_start, checked_end):
+        """
+        날짜 단위 전 종목 시세를 종목별 파일에 병합
+
+        KRX 시세는 수정주가가 아니므로, 전일 대비 금액(Changes)으로 계산한 기준가가
+        저장된 전일 종가와 다르면 액면분할/권리락 등이 있었던 것으로 보고
+        그 날짜 이전 데이터는 버림 (이전 구간이 필요하면 종목별 조회 때 수정주가로 다시 수집)
+
+        Args:
+            panel (DataFrame): Date, Code, Open, High, Low, Close, Volume, Change, Changes 컬럼
+            checked_start (Timestamp): 이번에 확인한 첫 날짜
+            checked_end (Timestamp): 이번에 확인한 마지막 날짜
+
+        Returns:
+            int: 갱신한 종목 수
+        """
+        checked_start = pd.Timestamp(checked_start)
+        checked_end = pd.Timestamp(checked_end)
+        entries = {}
+
+        for ticker, rows in panel.groupby('Code', sort=False):
+            fetched = rows.set_index('Date').sort_index()
+            base_price = fetched['Close'] - fetched['Changes']
+            fetched = fetched[['Open', 'High', 'Low', 'Close', 'Volume', 'Change']]
+            fetched.index.name = 'Date'
+
+            coverage = self.coverage(ticker)
+            stored = self.load(ticker) if coverage else None
+            start, end = checked_start, checked_end
+            combined = fetched
+            if coverage is not None and stored is not None and len(stored) > 0:
+                covered_start, covered_end = coverage
+                # 주말/연휴를 감안해 7일 이내로 이어지면 기존 구간과 병합
+                gap = pd.Timedelta(days=7)
+                if checked_start <= covered_end + gap and checked_end >= covered_start - gap:
+                    start = min(covered_start, checked_start)
+                    end = max(covered_end, checked_end)
+                    stored = stored[[col for col in stored.columns if col in fetched.columns]]
+                    combined = self.merge(stored, fetched)
+                else:
+                    # 저장 구간과 떨어진 구간은 반영하지 않음 (덮어쓰면 기존 이력이 사라짐,
+                    # 사이 구간은 종목별 조회 때 저장 구간 끝부터 이어서 수집)
+                    continue
+
+            prev_close = combined['Close'].shift(1).reindex(base_price.index)
+            mismatch = (prev_close.notna() & base_price.notna()
+                        & ((prev_close - base_price).abs() > 0.5))
+            if mismatch.any():
+                adjusted_on = mismatch[mismatch].index[-1]
+                combined = combined[combined.index >= adjusted_on]
+                start = adjusted_on
+
+            self._write_frame(ticker, combined)
+            entries[ticker] = (start, end)
+
+        if entries:
+            self._update_coverage(entries)
+        return len(entries)
+
+    @staticmethod
+    def merge(stored, fetched):
+        """
+        저장 데이터와 새로 받은 데이터 병합 (겹치는 날짜는 새 데이터 우선)
+        """
+        if stored is None or len(stored) == 0:
+            return fetched.sort_index()
+        if fetched is None or len(fetched) == 0:
+            return stored
+        combined = pd.concat([stored[~stored.index.isin(fetched.index)], fetched])
+        return combined.sort_index()
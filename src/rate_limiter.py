@@ -0,0 +1,50 @@
+"""
+요청 속도 제한 모듈
+여러 스레드가 공유하는 토큰 버킷 방식 레이트 리미터
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """
+        토큰 버킷 초기화
+
+        Args:
+            rate (float): 초당 허용 요청 수
+            capacity (float): 순간 최대 허용량 (없으면 rate, 최소 1)
+        """
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """토큰이 있으면 즉시 소비하고 True, 없으면 False"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
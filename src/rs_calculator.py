@@ -119,6 +119,31 @@ class RSCalculator:
 
         return rs_rating
 
+    def calculate_rs_ratings_vectorized(self, performances):
+        """
+        RS Rating 일괄 계산 (calculate_rs_rating과 동일한 0~99 점수, O(n log n))
+        - 정렬된 유효 성과 배열에서 searchsorted로 "자신보다 낮은 성과 개수"를 구함
+
+        Args:
+            performances (list|ndarray): 종목별 성과 (None/NaN 허용)
+
+        Returns:
+            ndarray: 종목별 RS Rating (int, 성과가 없으면 0)
+        """
+        perf = np.array([np.nan if p is None else p for p in performances], dtype=float)
+        ratings = np.zeros(len(perf), dtype=int)
+
+        valid = ~np.isnan(perf)
+        valid_count = int(valid.sum())
+        if valid_count == 0:
+            return ratings
+
+        sorted_perf = np.sort(perf[valid])
+        rank = np.searchsorted(sorted_perf, perf[valid], side='left')
+        percentile = (rank / valid_count) * 100
+        ratings[valid] = np.minimum(99, percentile.astype(int))
+        return ratings
+
     def calculate_all_rs_ratings(self, price_data_dict, stock_list):
         """
         모든 종목의 RS Rating 계산
@@ -140,15 +165,15 @@ class RSCalculator:
 
         print(f"[RS Rating 계산] {len(performances)}개 종목 성과 계산 완료")
 
-        # 2단계: RS Rating 계산
-        all_perfs = list(performances.values())
+        # 2단계: RS Rating 계산 (벡터화 백분위)
+        tickers = list(performances.keys())
+        ratings = self.calculate_rs_ratings_vectorized(list(performances.values()))
 
         rs_ratings = {}
-        for ticker, perf in performances.items():
-            rs_rating = self.calculate_rs_rating(perf, all_perfs)
+        for ticker, rs_rating in zip(tickers, ratings):
             rs_ratings[ticker] = {
-                'Performance': perf,
-                'RS_Rating': rs_rating
+                'Performance': performances[ticker],
+                'RS_Rating': int(rs_rating)
             }
 
         # 3단계: 결과를 DataFrame으로 변환
@@ -0,0 +1,197 @@
+"""
+RS Rating 히스토리 모듈
+가격 패널 전체 날짜에 대해 가중 성과와 RS Rating 행렬(날짜 × 종목)을 한 번에 계산
+"""
+
+import numpy as np
+import pandas as pd
+
+from price_panel import PricePanel
+
+# generate_weekly_data.analyze_date 방식: (N봉 전 대비 수익률, 가중치)
+RS_LOOKBACKS = ((60, 0.4), (120, 0.2), (180, 0.2), (252, 0.2))
+RS_MIN_HISTORY = 200
+
+
+def weighted_performance_series(close, lookbacks=RS_LOOKBACKS):
+    """
+    한 종목의 모든 봉에 대한 가중 성과 (시프트 배열 연산)
+    - k번째 봉: lookback N마다 (close[k] / close[k-N+1] - 1) * 100, 봉이 N개 미만이면 0
+
+    Args:
+        close (ndarray): 종목 자체 봉 순서의 종가
+        lookbacks (tuple): ((N, 가중치), ...)
+
+    Returns:
+        ndarray: 봉별 가중 성과
+    """
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    weighted = None
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for lookback, weight in lookbacks:
+            ret = np.zeros(n)
+            if n >= lookback:
+                ret[lookback - 1:] = (close[lookback - 1:] / close[:n - lookback + 1] - 1) * 100
+            weighted = ret * weight if weighted is None else weighted + ret * weight
+    return weighted if weighted is not None else np.zeros(n)
+
+
+def rank_ratings(performance):
+    """
+    날짜(행)별 RS Rating - 성과 내림차순 순위 idx에 대해 int((1 - idx / 유효 종목 수) * 100)
+    (동점은 열 순서 유지, analyze_date와 동일)
+
+    Args:
+        performance (ndarray): (날짜 수 × 종목 수), 계산 불가 종목은 NaN
+
+    Returns:
+        ndarray: RS Rating (int16), 계산 불가 종목은 -1
+    """
+    valid = ~np.isnan(performance)
+    keys = np.where(valid, -performance, np.inf)
+    order = np.argsort(keys, axis=1, kind='stable')
+    positions = np.empty_like(order)
+    rows = np.arange(order.shape[0])[:, None]
+    positions[rows, order] = np.arange(order.shape[1])[None, :]
+
+    counts = valid.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratings = ((1 - positions / counts) * 100)
+    ratings = np.where(valid, ratings, -1)
+    return ratings.astype(np.int16)
+
+
+class RSHistory:
+    def __init__(self, dates, tickers, performance, ratings):
+        """
+        RS 히스토리 초기화
+
+        Args:
+            dates (DatetimeIndex): 날짜 (행)
+            tickers (list): 종목 코드 (열)
+            performance (ndarray): 가중 성과 행렬 (계산 불가 NaN)
+            ratings (ndarray): RS Rating 행렬 (계산 불가 -1)
+        """
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = list(tickers)
+        self.performance = performance
+        self.ratings = ratings
+        self.column = {ticker: idx for idx, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_panel(cls, panel, lookbacks=RS_LOOKBACKS, min_history=RS_MIN_HISTORY):
+        """
+        가격 패널로 전체 날짜 RS 히스토리 계산
+
+        날짜 d의 종목 값은 df[df.index <= d]의 마지막 봉 기준 (거래정지 등으로
+        그날 봉이 없으면 직전 봉 값), 봉이 min_history개 미만이면 계산 불가
+
+        Args:
+            panel (PricePanel): 가격 패널
+            lookbacks (tuple): ((N, 가중치), ...)
+            min_history (int): 최소 봉 개수
+
+        Returns:
+            RSHistory
+        """
+        close = panel.field('Close')
+        own_perf = np.full(close.shape, np.nan)
+        for col in range(close.shape[1]):
+            rows = np.flatnonzero(panel.present[:, col])
+            if len(rows) < min_history:
+                continue
+            perf = weighted_performance_series(close[rows, col], lookbacks)
+            perf[:min_history - 1] = np.nan
+            own_perf[rows, col] = perf
+
+        last_rows = panel.last_present_rows()
+        cols = np.arange(close.shape[1])[None, :]
+        performance = np.where(last_rows >= 0, own_perf[np.maximum(last_rows, 0), cols], np.nan)
+        ratings = rank_ratings(performance)
+        return cls(panel.dates, panel.tickers, performance, ratings)
+
+    @classmethod
+    def from_price_data(cls, price_data_dict, **kwargs):
+        """{종목코드: DataFrame}으로 바로 계산"""
+        return cls.from_panel(PricePanel.from_price_data(price_data_dict, fields=('Close',)), **kwargs)
+
+    def with_outside(self, price_data_dict, **kwargs):
+        """
+        유니버스 밖 종목을 열로 추가한 RS 히스토리 (유니버스 종목 순위는 그대로)
+
+        밖 종목은 그날 유니버스 성과 분포에 하나를 끼워 넣었을 때의 순위로 등급을 매김
+        (동점은 유니버스 종목이 앞, rank_ratings와 같은 식)
+
+        Args:
+            price_data_dict (dict): {종목코드: DataFrame} 유니버스 밖 종목 (이미 있는 종목은 무시)
+            kwargs: from_panel 인자 (lookbacks, min_history)
+
+        Returns:
+            RSHistory
+        """
+        outside = {ticker: df for ticker, df in price_data_dict.items() if ticker not in self.column}
+        if not outside:
+            return self
+        extra = RSHistory.from_price_data(outside, **kwargs)
+        # 밖 종목 날짜를 유니버스 날짜에 맞춤 (날짜 이전 마지막 행)
+        rows = extra.dates.searchsorted(self.dates, side='right') - 1
+        performance = np.where((rows >= 0)[:, None], extra.performance[np.maximum(rows, 0)], np.nan)
+
+        ratings = np.full(performance.shape, -1, dtype=np.int16)
+        for row in range(len(self.dates)):
+            universe = self.performance[row]
+            universe = np.sort(universe[~np.isnan(universe)])
+            values = performance[row]
+            valid = ~np.isnan(values)
+            # 성과가 같거나 높은 유니버스 종목 수 = 끼워 넣은 순위
+            ahead = len(universe) - np.searchsorted(universe, values[valid], side='left')
+            ratings[row, valid] = ((1 - ahead / (len(universe) + 1)) * 100).astype(np.int16)
+
+        return RSHistory(self.dates, self.tickers + extra.tickers,
+                         np.hstack([self.performance, performance]),
+                         np.hstack([self.ratings, ratings]))
+
+    def row_for(self, date):
+        """date 이전(포함) 마지막 날짜의 행 번호 (없으면 -1)"""
+        return int(self.dates.searchsorted(pd.Timestamp(date), side='right')) - 1
+
+    def rating(self, ticker, date, default=None):
+        """
+        특정 종목/날짜의 RS Rating
+
+        Returns:
+            int: RS Rating, 계산 불가면 default
+        """
+        row = self.row_for(date)
+        col = self.column.get(ticker)
+        if row < 0 or col is None:
+            return default
+        value = int(self.ratings[row, col])
+        return default if value < 0 else value
+
+    def ratings_on(self, date):
+        """
+        특정 날짜의 전체 RS Rating
+
+        Returns:
+            dict: {종목코드: RS Rating} (계산 가능한 종목만)
+        """
+        row = self.row_for(date)
+        if row < 0:
+            return {}
+        values = self.ratings[row]
+        return {ticker: int(values[col]) for col, ticker in enumerate(self.tickers) if values[col] >= 0}
+
+    def performance_on(self, date):
+        """특정 날짜의 가중 성과 {종목코드: 성과}"""
+        row = self.row_for(date)
+        if row < 0:
+            return {}
+        values = self.performance[row]
+        return {ticker: float(values[col]) for col, ticker in enumerate(self.tickers)
+                if not np.isnan(values[col])}
+
+    def to_frame(self):
+        """RS Rating 행렬 DataFrame (계산 불가 -1)"""
+        return pd.DataFrame(self.ratings, index=self.dates, columns=self.tickers)
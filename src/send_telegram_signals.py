@@ -1,8 +1,9 @@
 """
-Send signal summary to Telegram.
+Send signal changes (or the full summary with --full) to Telegram.
 Env:
   TELEGRAM_BOT_TOKEN
   TELEGRAM_CHAT_ID
+  TELEGRAM_API_BASE (optional, e.g. a local stand-in server for testing)
 """
 
 import argparse
@@ -10,7 +11,8 @@ import json
 import os
 from datetime import datetime
 
-import requests
+from signal_alerts import AlertState, TelegramSender, diff_signals, format_changes
+from signal_db import SignalDB, SIGNAL_DB_PATH
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -29,9 +31,31 @@ def parse_args():
                         help="최소 RS 등급")
     parser.add_argument("--only-both", action="store_true",
                         help="Ryan+Minervini 둘 다 신호만")
+    parser.add_argument("--full", action="store_true",
+                        help="변경분 대신 상위 N개 전체 목록 전송 (알림 상태는 그대로)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="전송하지 않고 메시지만 출력 (알림 상태도 저장하지 않음)")
+    parser.add_argument("--api-base", type=str, default=os.environ.get("TELEGRAM_API_BASE", ""),
+                        help="텔레그램 API 주소 (로컬 대체 서버 시험용)")
     return parser.parse_args()
 
 
+def _load_weekly_latest_from_db(limit, min_rs, only_both):
+    """신호 DB에서 최근 날짜 상위 신호만 조회 (DB가 없거나 비어 있으면 None)"""
+    if not os.path.exists(SIGNAL_DB_PATH):
+        return None
+    db = SignalDB()
+    try:
+        latest_date = db.latest_date()
+        if latest_date is None:
+            return None
+        signals = db.query(date=latest_date, analyzer="both" if only_both else None,
+                           min_rs=min_rs, limit=limit)
+    finally:
+        db.close()
+    return {"date": latest_date, "signals": signals}
+
+
 def _load_weekly_latest():
     index_path = os.path.join(WEEKLY_DIR, "index.json")
     if not os.path.exists(index_path):
@@ -66,14 +90,15 @@ def _load_intraday_latest():
     return data
 
 
-def _format_message(data, limit, min_rs, only_both):
+def _header(data):
     date = data.get("date", "")
     time = data.get("time")
-    header = f"[{date}]"
     if time:
-        header = f"[{date} {time}]"
+        return f"[{date} {time}]"
+    return f"[{date}]"
 
-    signals = data.get("signals", [])
+
+def _filter_signals(signals, min_rs, only_both):
     filtered = []
     for item in signals:
         rs = int(item.get("RS등급") or 0)
@@ -84,7 +109,12 @@ def _format_message(data, limit, min_rs, only_both):
         if only_both and not (has_ryan and has_min):
             continue
         filtered.append(item)
+    return filtered
+
 
+def _format_message(data, limit, min_rs, only_both):
+    header = _header(data)
+    filtered = _filter_signals(data.get("signals", []), min_rs, only_both)
     filtered.sort(key=lambda x: int(x.get("RS등급") or 0), reverse=True)
     filtered = filtered[:limit] if limit > 0 else filtered
 
@@ -101,16 +131,12 @@ def _format_message(data, limit, min_rs, only_both):
     return "\n".join(lines)
 
 
-def _send_telegram(message):
+def _telegram_sender(api_base):
     token = os.environ.get("TELEGRAM_BOT_TOKEN", "").strip()
     chat_id = os.environ.get("TELEGRAM_CHAT_ID", "").strip()
     if not token or not chat_id:
         raise EnvironmentError("TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID not set")
-
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-    resp = requests.post(url, json={"chat_id": chat_id, "text": message})
-    if not resp.ok:
-        raise RuntimeError(f"Telegram send failed: {resp.status_code} {resp.text}")
+    return TelegramSender(token, chat_id, api_base=api_base or None)
 
 
 def main():
@@ -119,10 +145,33 @@ def main():
     if source not in {"weekly", "intraday"}:
         raise ValueError("source는 weekly 또는 intraday여야 합니다.")
 
-    data = _load_weekly_latest() if source == "weekly" else _load_intraday_latest()
-    message = _format_message(data, args.limit, args.min_rs, args.only_both)
-    _send_telegram(message)
-    print("텔레그램 전송 완료")
+    # 변경 비교는 상위 N개가 아니라 조건에 맞는 전체 신호 기준
+    load_limit = args.limit if args.full else 0
+    if source == "weekly":
+        data = _load_weekly_latest_from_db(load_limit, args.min_rs, args.only_both) or _load_weekly_latest()
+    else:
+        data = _load_intraday_latest()
+
+    alert_state = None
+    if args.full:
+        message = _format_message(data, args.limit, args.min_rs, args.only_both)
+    else:
+        alert_state = AlertState()
+        signals = _filter_signals(data.get("signals", []), args.min_rs, args.only_both)
+        changes, new_state = diff_signals(alert_state.signals(source), signals)
+        message = format_changes(_header(data), changes, args.limit)
+        if message is None:
+            print("텔레그램: 직전 알림 이후 변경 없음")
+            return
+
+    if args.dry_run:
+        print(message)
+        return
+
+    sent = _telegram_sender(args.api_base).send(message)
+    if alert_state is not None:
+        alert_state.update(source, _header(data).strip("[]"), new_state)
+    print(f"텔레그램 전송 완료 (메시지 {sent}개)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,279 @@
+"""
+신호 알림 모듈
+직전에 알린 신호 상태와 비교해 신규/강화/해제된 신호만 골라내고,
+텔레그램으로 나눠 보내기 (메시지 분할, 재시도, 429 대기, 전송 속도 제한)
+"""
+
+import os
+import json
+import time
+
+import requests
+
+from rate_limiter import TokenBucket
+from weekly_manifest import write_json_atomic
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+ALERT_STATE_PATH = os.path.join(PROJECT_ROOT, "data", "alerts", "telegram_state.json")
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+# 텔레그램 메시지 최대 길이
+MESSAGE_LIMIT = 4096
+# 이만큼 이상 신호강도가 오르면 강화로 알림
+STRENGTH_STEP = 10
+
+ANALYZER_FIELDS = (
+    ('Ryan', 'Ryan_진입신호', 'Ryan_신호강도'),
+    ('Minervini', '미너비니_진입신호', '미너비니_신호강도'),
+)
+
+
+def summarize_signal(item):
+    """
+    알림 비교용 신호 요약
+
+    Args:
+        item (dict): 신호 레코드 (signals 파일/신호 DB 키)
+
+    Returns:
+        dict: {'name', 'rs', 'analyzers', 'strength'}
+    """
+    analyzers = []
+    strength = 0
+    for label, signal_key, strength_key in ANALYZER_FIELDS:
+        if item.get(signal_key):
+            analyzers.append(label)
+            strength = max(strength, int(item.get(strength_key) or 0))
+    return {
+        'name': item.get('종목명') or item.get('종목코드') or '-',
+        'rs': int(item.get('RS등급') or 0),
+        'analyzers': analyzers,
+        'strength': strength,
+    }
+
+
+def diff_signals(previous, signals, strength_step=STRENGTH_STEP):
+    """
+    직전 알림 상태와 현재 신호 비교
+
+    강화: 신호가 난 분석기가 늘었거나 신호강도가 strength_step 이상 오름.
+    강화로 알리지 않은 종목은 직전에 알린 분석기/강도를 그대로 유지해, 조금씩 오르는 경우도 누적 기준으로 판단
+
+    Args:
+        previous (dict): {종목코드: summarize_signal 결과} (직전 알림 상태)
+        signals (list): 현재 신호 레코드
+        strength_step (int): 강화로 볼 최소 신호강도 상승폭
+
+    Returns:
+        tuple: ({'new': [...], 'upgraded': [...], 'dropped': [...]}, 새 알림 상태)
+            new/dropped 항목은 (종목코드, 요약), upgraded 항목은 (종목코드, 이전 요약, 요약)
+    """
+    current = {}
+    for item in signals:
+        code = str(item.get('종목코드') or '')
+        if code:
+            current[code.zfill(6)] = summarize_signal(item)
+
+    changes = {'new': [], 'upgraded': [], 'dropped': []}
+    state = {}
+    for code, summary in current.items():
+        before = previous.get(code)
+        if before is None:
+            changes['new'].append((code, summary))
+            state[code] = summary
+        elif (set(summary['analyzers']) - set(before['analyzers'])
+              or summary['strength'] - before['strength'] >= strength_step):
+            changes['upgraded'].append((code, before, summary))
+            state[code] = summary
+        else:
+            state[code] = dict(before, name=summary['name'], rs=summary['rs'])
+
+    for code, before in previous.items():
+        if code not in current:
+            changes['dropped'].append((code, before))
+
+    changes['new'].sort(key=lambda entry: (-entry[1]['rs'], entry[0]))
+    changes['upgraded'].sort(key=lambda entry: (-entry[2]['rs'], entry[0]))
+    changes['dropped'].sort(key=lambda entry: entry[0])
+    return changes, state
+
+
+def format_changes(header, changes, limit=0):
+    """
+    변경 알림 메시지 (변경이 없으면 None)
+
+    Args:
+        header (str): 날짜/시각 머리말
+        changes (dict): diff_signals 결과
+        limit (int): 구분별 최대 줄 수 (0이면 전체)
+
+    Returns:
+        str: 메시지
+    """
+    counts = {kind: len(entries) for kind, entries in changes.items()}
+    if not any(counts.values()):
+        return None
+
+    def clip(entries):
+        return entries[:limit] if limit > 0 else entries
+
+    def label(summary):
+        return '+'.join(summary['analyzers']) or '-'
+
+    lines = [f"{header} 신호 변경 (신규 {counts['new']} / 강화 {counts['upgraded']} / 해제 {counts['dropped']})"]
+    if changes['new']:
+        lines.append("")
+        lines.append("[신규]")
+        for idx, (code, summary) in enumerate(clip(changes['new']), start=1):
+            lines.append(f"{idx}) {summary['name']}({code}) RS {summary['rs']} "
+                         f"강도 {summary['strength']} {label(summary)}")
+    if changes['upgraded']:
+        lines.append("")
+        lines.append("[강화]")
+        for code, before, summary in clip(changes['upgraded']):
+            lines.append(f"- {summary['name']}({code}) RS {summary['rs']} "
+                         f"강도 {before['strength']}→{summary['strength']} {label(before)}→{label(summary)}")
+    if changes['dropped']:
+        lines.append("")
+        lines.append("[해제]")
+        for code, before in clip(changes['dropped']):
+            lines.append(f"- {before['name']}({code})")
+
+    for kind, title in (('new', '신규'), ('upgraded', '강화'), ('dropped', '해제')):
+        if limit > 0 and counts[kind] > limit:
+            lines.append(f"({title} {counts[kind] - limit}개 생략)")
+    return "\n".join(lines)
+
+
+def split_message(text, limit=MESSAGE_LIMIT):
+    """
+    줄 단위로 limit 이하 메시지로 나누기 (한 줄이 limit보다 길면 그 줄만 글자 단위로 자름)
+
+    Args:
+        text (str): 메시지
+        limit (int): 메시지당 최대 글자 수
+
+    Returns:
+        list: 메시지 조각
+    """
+    chunks = []
+    current = ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            candidate = line
+        current = candidate
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+class AlertState:
+    def __init__(self, path=None):
+        """
+        소스(weekly/intraday)별 직전 알림 상태 로드
+
+        Args:
+            path (str): 상태 파일 경로 (없으면 data/alerts/telegram_state.json)
+        """
+        self.path = path or ALERT_STATE_PATH
+        self.sources = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.sources = json.load(f)
+            except (OSError, ValueError):
+                self.sources = {}
+
+    def signals(self, source):
+        """직전에 알린 신호 {종목코드: 요약}"""
+        return self.sources.get(source, {}).get('signals', {})
+
+    def update(self, source, date, state):
+        """
+        알림 상태 갱신 후 저장 (전송에 성공한 뒤에만 호출)
+
+        Args:
+            source (str): weekly/intraday
+            date (str): 신호 날짜 (시각 포함 가능)
+            state (dict): diff_signals가 돌려준 새 알림 상태
+        """
+        self.sources[source] = {'date': date, 'signals': state}
+        write_json_atomic(self.path, self.sources, ensure_ascii=False, indent=2)
+
+
+class TelegramSender:
+    def __init__(self, token, chat_id, api_base=None, rate=1.0, max_retries=3, timeout=15, session=None):
+        """
+        텔레그램 전송기
+
+        Args:
+            token (str): 봇 토큰
+            chat_id (str): 채팅 ID
+            api_base (str): API 주소 (로컬 대체 서버로 시험할 때 지정, 없으면 api.telegram.org)
+            rate (float): 초당 최대 전송 수 (같은 채팅은 초당 1개 권장)
+            max_retries (int): 429/5xx/연결 오류 재시도 횟수
+            timeout (float): 요청 타임아웃(초)
+            session (requests.Session): 재사용 세션
+        """
+        self.url = f"{(api_base or TELEGRAM_API_BASE).rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self._bucket = TokenBucket(rate, capacity=1)
+
+    def send(self, message):
+        """
+        메시지 전송 (MESSAGE_LIMIT 단위로 나눠 순서대로)
+
+        Returns:
+            int: 보낸 메시지 수
+        """
+        chunks = split_message(message)
+        for chunk in chunks:
+            self._post(chunk)
+        return len(chunks)
+
+    def _post(self, text):
+        for attempt in range(self.max_retries + 1):
+            self._bucket.acquire()
+            wait = min(2 ** attempt, 30)
+            try:
+                resp = self.session.post(self.url, json={"chat_id": self.chat_id, "text": text},
+                                         timeout=self.timeout)
+            except requests.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if resp.ok:
+                    return
+                error = f"{resp.status_code} {resp.text[:200]}"
+                if resp.status_code == 429:
+                    wait = self._retry_after(resp, wait)
+                elif resp.status_code < 500:
+                    raise RuntimeError(f"Telegram send failed: {error}")
+
+            if attempt == self.max_retries:
+                raise RuntimeError(f"Telegram send failed after {attempt + 1} attempts: {error}")
+            time.sleep(wait)
+
+    @staticmethod
+    def _retry_after(resp, default):
+        """429 응답의 대기 시간 (본문 parameters.retry_after, 없으면 Retry-After 헤더)"""
+        try:
+            return float(resp.json()['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
+            pass
+        try:
+            return float(resp.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return default
@@ -0,0 +1,232 @@
+"""
+진입신호 결과 캐시
+(분석기, 종목, 기준일)별 신호 결과를 SQLite에 보관하고,
+입력 구간(최근 252봉 날짜/OHLCV + RS) 지문과 분석기 코드 버전이 같을 때만 재사용
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import inspect
+import threading
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from advanced_entry_signals import AdvancedEntryAnalyzer
+from david_ryan_complete import DavidRyanComplete
+from price_panel import PANEL_FIELDS
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+SIGNAL_CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "signal_cache", "signals.sqlite")
+
+# 신호 계산이 참조하는 최대 봉 수 (52주 고저 252봉)
+FINGERPRINT_BARS = indicators.YEAR_WINDOW
+
+RYAN = 'ryan'
+MINERVINI = 'minervini'
+
+
+def analyzer_version(*objects):
+    """
+    분석기 코드 버전 (클래스/모듈 소스 해시) - 코드가 바뀌면 해당 분석기 캐시만 무효화
+
+    Args:
+        objects: 결과에 영향을 주는 클래스/모듈
+
+    Returns:
+        str: 버전 해시
+    """
+    digest = hashlib.sha1()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def default_versions():
+    """분석기별 기본 버전 {분석기 이름: 버전}"""
+    return {
+        RYAN: analyzer_version(DavidRyanComplete, indicators),
+        MINERVINI: analyzer_version(AdvancedEntryAnalyzer, indicators),
+    }
+
+
+# 봉 해시용 64비트 곱셈 상수 (서로 독립인 두 해시)
+_HASH_SEEDS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+_HASH_MULTIPLIER = np.uint64(0xFF51AFD7ED558CCD)
+
+
+def bar_hashes(dates, ohlcv):
+    """
+    봉별 64비트 해시 2개 (날짜 + OHLCV 비트 패턴)
+    구간 지문은 구간 내 봉 해시의 합이므로 누적합으로 여러 구간을 한 번에 계산 가능
+
+    Args:
+        dates (ndarray): 봉 날짜 (datetime64[ns])
+        ohlcv (ndarray): (봉 수 × 5) OHLCV (PANEL_FIELDS 순서)
+
+    Returns:
+        ndarray: (봉 수 × 2) uint64
+    """
+    ohlcv = np.ascontiguousarray(ohlcv, dtype=np.float64)
+    words = [np.asarray(dates, dtype='datetime64[ns]').view(np.int64).astype(np.uint64)]
+    words += [ohlcv[..., i].view(np.uint64) for i in range(ohlcv.shape[-1])]
+    hashes = []
+    with np.errstate(over='ignore'):
+        for seed in _HASH_SEEDS:
+            h = np.full(words[0].shape, seed, dtype=np.uint64)
+            for word in words:
+                h = (h ^ word) * _HASH_MULTIPLIER
+                h ^= h >> np.uint64(33)
+            hashes.append(h)
+    return np.stack(hashes, axis=-1)
+
+
+def window_fingerprint(hash_sum, bars, rs_rating):
+    """
+    입력 구간 지문
+
+    Args:
+        hash_sum (ndarray): 최근 FINGERPRINT_BARS개 봉의 bar_hashes 합 (uint64 2개)
+        bars (int): 기준일까지 전체 봉 수 (252봉 이상이면 결과에 영향 없음)
+        rs_rating (int): RS Rating
+
+    Returns:
+        str: 지문
+    """
+    return f'{min(int(bars), FINGERPRINT_BARS)}|{int(rs_rating)}|{int(hash_sum[0]):016x}{int(hash_sum[1]):016x}'
+
+
+def frame_fingerprint(price_data, rs_rating):
+    """기준일까지 잘린 가격 데이터의 입력 구간 지문"""
+    window = price_data.iloc[-FINGERPRINT_BARS:]
+    hashes = bar_hashes(window.index.values, window[list(PANEL_FIELDS)].to_numpy(dtype=np.float64))
+    with np.errstate(over='ignore'):
+        hash_sum = hashes.sum(axis=0, dtype=np.uint64)
+    return window_fingerprint(hash_sum, len(price_data), rs_rating)
+
+
+def _to_json(obj):
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f'JSON 변환 불가: {type(obj)}')
+
+
+def is_stub(result):
+    """일괄 스캔에서 신호가 없던 종목의 요약 결과인지 (근거 문구 등 상세 없음)"""
+    return result is not None and 'reasons' not in result
+
+
+class SignalCache:
+    def __init__(self, path=None, versions=None):
+        """
+        신호 캐시 초기화 (버전이 다른 오래된 항목은 정리)
+
+        Args:
+            path (str): SQLite 파일 경로 (없으면 data/signal_cache/signals.sqlite)
+            versions (dict): {분석기 이름: 버전} (없으면 현재 코드 기준)
+        """
+        self.path = path or SIGNAL_CACHE_PATH
+        self.versions = versions or default_versions()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # 신호가 없던 종목은 result 없이 entry_signal/signal_strength만 저장
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS signal_cache ('
+            ' analyzer TEXT NOT NULL, ticker TEXT NOT NULL, as_of TEXT NOT NULL,'
+            ' version TEXT NOT NULL, fingerprint TEXT NOT NULL,'
+            ' entry_signal INTEGER NOT NULL, signal_strength INTEGER NOT NULL, result TEXT,'
+            ' PRIMARY KEY (analyzer, ticker, as_of))'
+        )
+        # get_many는 기준일 단위로 조회 (날짜가 많아져도 전체 테이블을 훑지 않게)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS signal_cache_date ON signal_cache (analyzer, as_of)')
+        with self._conn:
+            for analyzer, version in self.versions.items():
+                self._conn.execute('DELETE FROM signal_cache WHERE analyzer = ? AND version != ?',
+                                   (analyzer, version))
+
+    @staticmethod
+    def _as_of(date):
+        return pd.Timestamp(date).strftime('%Y-%m-%d')
+
+    def get_many(self, analyzer, date, fingerprints):
+        """
+        한 기준일의 여러 종목 결과 조회
+
+        Args:
+            analyzer (str): 분석기 이름 (RYAN / MINERVINI)
+            date: 기준일
+            fingerprints (dict): {종목코드: 입력 구간 지문}
+
+        Returns:
+            dict: {종목코드: 결과 dict} (지문/버전이 같은 항목만)
+        """
+        if not fingerprints:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT ticker, fingerprint, entry_signal, signal_strength, result FROM signal_cache'
+                ' WHERE analyzer = ? AND as_of = ? AND version = ?',
+                (analyzer, self._as_of(date), self.versions[analyzer]),
+            ).fetchall()
+        results = {}
+        for ticker, fingerprint, entry_signal, signal_strength, result in rows:
+            if fingerprints.get(ticker) != fingerprint:
+                continue
+            if result is None:
+                results[ticker] = {'entry_signal': bool(entry_signal), 'signal_strength': signal_strength}
+            else:
+                results[ticker] = json.loads(result)
+        return results
+
+    def put_many(self, analyzer, date, entries):
+        """
+        한 기준일의 여러 종목 결과 저장
+
+        Args:
+            analyzer (str): 분석기 이름
+            date: 기준일
+            entries (dict): {종목코드: (입력 구간 지문, 결과 dict)}
+                            결과가 요약(entry_signal, signal_strength만)이면 상세 없이 저장
+        """
+        self.put_dates(analyzer, {date: entries})
+
+    def put_dates(self, analyzer, entries_by_date):
+        """
+        여러 기준일 결과를 한 트랜잭션으로 저장 (날짜가 많은 일괄 스캔에서 커밋 횟수를 줄임)
+
+        Args:
+            analyzer (str): 분석기 이름
+            entries_by_date (dict): {기준일: put_many의 entries}
+        """
+        version = self.versions[analyzer]
+        rows = []
+        for date, entries in entries_by_date.items():
+            as_of = self._as_of(date)
+            rows.extend((analyzer, ticker, as_of, version, fingerprint,
+                         int(bool(result['entry_signal'])), int(result['signal_strength']),
+                         None if is_stub(result) else json.dumps(result, default=_to_json))
+                        for ticker, (fingerprint, result) in entries.items())
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO signal_cache'
+                ' (analyzer, ticker, as_of, version, fingerprint, entry_signal, signal_strength, result)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows,
+            )
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,277 @@
+"""
+신호 이력 DB
+날짜별 signals 레코드를 SQLite에 저장해 JSON 파일을 읽지 않고 종목/날짜/RS 조건으로 조회
+(data/signal_db/signals.sqlite)
+
+예)
+  python src/signal_db.py --ticker 000660 --analyzer ryan   # 000660의 Ryan 신호 날짜
+  python src/signal_db.py --only-both --limit 20            # 최근 날짜 양쪽 신호 상위 20
+"""
+
+import os
+import json
+import sqlite3
+import argparse
+import threading
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+SIGNAL_DB_PATH = os.path.join(PROJECT_ROOT, "data", "signal_db", "signals.sqlite")
+
+# (레코드 키, 컬럼 이름, 컬럼 타입) - signals_YYYY-MM-DD.json의 signals 항목과 1:1
+RECORD_COLUMNS = (
+    ('종목코드', 'ticker', 'TEXT NOT NULL'),
+    ('종목명', 'name', 'TEXT'),
+    ('RS등급', 'rs', 'INTEGER'),
+    ('현재가', 'price', 'REAL'),
+    ('Ryan_진입신호', 'ryan_signal', 'INTEGER'),
+    ('Ryan_신호강도', 'ryan_strength', 'INTEGER'),
+    ('Ryan_진입가', 'ryan_entry', 'REAL'),
+    ('Ryan_손절가', 'ryan_stop', 'REAL'),
+    ('Ryan_추가매수1', 'ryan_add_on_1', 'REAL'),
+    ('Ryan_추가매수2', 'ryan_add_on_2', 'REAL'),
+    ('Ryan_손익비', 'ryan_risk_reward', 'REAL'),
+    ('Ryan_근거', 'ryan_reasons', 'TEXT'),
+    ('Ryan_경고', 'ryan_warnings', 'TEXT'),
+    ('미너비니_진입신호', 'minervini_signal', 'INTEGER'),
+    ('미너비니_신호강도', 'minervini_strength', 'INTEGER'),
+    ('미너비니_진입가', 'minervini_entry', 'REAL'),
+    ('미너비니_손절가', 'minervini_stop', 'REAL'),
+    ('미너비니_패턴', 'minervini_pattern', 'TEXT'),
+    ('미너비니_근거', 'minervini_reasons', 'TEXT'),
+    ('양쪽_모두_신호', 'both_signal', 'INTEGER'),
+)
+BOOL_COLUMNS = {'ryan_signal', 'minervini_signal', 'both_signal'}
+
+# 체크 항목 그룹 (레코드의 dict 필드)
+CHECK_GROUPS = ('ryan_checks', 'minervini_checks', 'trend_template')
+
+ANALYZER_COLUMNS = {'ryan': 'ryan_signal', 'minervini': 'minervini_signal', 'both': 'both_signal'}
+
+# 대시보드 정렬 옵션 -> ORDER BY (같은 값은 종목 코드 순)
+SIGNAL_STRENGTH = 'MAX(ryan_strength, minervini_strength)'
+SORT_ORDERS = {
+    'rs-desc': 'rs DESC, date DESC, ticker',
+    'signal-desc': f'{SIGNAL_STRENGTH} DESC, date DESC, ticker',
+    'name-asc': 'name, date DESC, ticker',
+}
+
+
+class SignalDB:
+    def __init__(self, path=None):
+        """
+        신호 DB 열기 (없으면 생성)
+
+        Args:
+            path (str): SQLite 파일 경로 (없으면 data/signal_db/signals.sqlite)
+        """
+        self.path = path or SIGNAL_DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        columns = ', '.join(f'{column} {kind}' for _, column, kind in RECORD_COLUMNS)
+        with self._conn:
+            self._conn.executescript(
+                'CREATE TABLE IF NOT EXISTS signal_dates ('
+                ' date TEXT PRIMARY KEY, signals INTEGER NOT NULL);'
+                f'CREATE TABLE IF NOT EXISTS signals (date TEXT NOT NULL, {columns},'
+                ' PRIMARY KEY (date, ticker));'
+                'CREATE TABLE IF NOT EXISTS signal_checks ('
+                ' date TEXT NOT NULL, ticker TEXT NOT NULL, check_group TEXT NOT NULL,'
+                ' check_name TEXT NOT NULL, passed INTEGER NOT NULL,'
+                ' PRIMARY KEY (date, ticker, check_group, check_name));'
+                'CREATE INDEX IF NOT EXISTS idx_signals_ticker ON signals (ticker, date);'
+                'CREATE INDEX IF NOT EXISTS idx_signals_date_rs ON signals (date, rs DESC);'
+                'CREATE INDEX IF NOT EXISTS idx_signals_rs ON signals (rs, date);'
+                f'CREATE INDEX IF NOT EXISTS idx_signals_date_strength ON signals (date, {SIGNAL_STRENGTH} DESC);'
+                'CREATE INDEX IF NOT EXISTS idx_signals_date_name ON signals (date, name);'
+                'CREATE INDEX IF NOT EXISTS idx_checks_name ON signal_checks (check_group, check_name, passed, date);'
+            )
+
+    def has_date(self, date_str):
+        """해당 날짜가 저장되어 있는지"""
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM signal_dates WHERE date = ?', (date_str,)).fetchone()
+        return row is not None
+
+    def replace_date(self, date_str, signals):
+        """
+        한 날짜의 신호 레코드 전체 교체
+
+        Args:
+            date_str (str): 날짜 (YYYY-MM-DD)
+            signals (list): 신호 레코드 (signals 파일의 signals 항목)
+        """
+        rows = []
+        checks = []
+        for record in signals:
+            ticker = str(record.get('종목코드', '')).zfill(6)
+            values = [date_str]
+            for key, column, _ in RECORD_COLUMNS:
+                value = ticker if column == 'ticker' else record.get(key)
+                values.append(int(bool(value)) if column in BOOL_COLUMNS else _plain(value))
+            rows.append(values)
+            for group in CHECK_GROUPS:
+                for name, passed in (record.get(group) or {}).items():
+                    checks.append((date_str, ticker, group, name, int(bool(passed))))
+
+        placeholders = ', '.join('?' for _ in range(len(RECORD_COLUMNS) + 1))
+        columns = ', '.join(column for _, column, _ in RECORD_COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM signals WHERE date = ?', (date_str,))
+            self._conn.execute('DELETE FROM signal_checks WHERE date = ?', (date_str,))
+            self._conn.executemany(f'INSERT OR REPLACE INTO signals (date, {columns}) VALUES ({placeholders})', rows)
+            self._conn.executemany('INSERT OR REPLACE INTO signal_checks VALUES (?, ?, ?, ?, ?)', checks)
+            self._conn.execute('INSERT OR REPLACE INTO signal_dates VALUES (?, ?)', (date_str, len(rows)))
+
+    def dates(self):
+        """
+        저장된 날짜 목록 (index.json과 같은 구조, 최신순)
+
+        Returns:
+            list: [{'date': 날짜, 'signals': 신호 수}]
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT date, signals FROM signal_dates ORDER BY date DESC').fetchall()
+        return [{'date': date, 'signals': count} for date, count in rows]
+
+    def latest_date(self):
+        """가장 최근 날짜 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute('SELECT MAX(date) FROM signal_dates').fetchone()
+        return row[0] if row else None
+
+    def query(self, date=None, ticker=None, analyzer=None, min_rs=0, max_rs=None, sort=None,
+              limit=None, offset=0, with_checks=False):
+        """
+        신호 레코드 조회
+
+        Args:
+            date (str): 날짜 (없으면 전체 기간)
+            ticker (str): 종목 코드
+            analyzer (str): 'ryan' / 'minervini' / 'both' 신호가 난 레코드만 (없으면 전체)
+            min_rs (int): 최소 RS 등급
+            max_rs (int): 최대 RS 등급
+            sort (str): SORT_ORDERS 키 (없으면 종목 지정 시 날짜 최신순, 아니면 RS 높은 순)
+            limit (int): 최대 개수 (없거나 0 이하면 전체)
+            offset (int): 건너뛸 개수 (페이지 조회)
+            with_checks (bool): ryan_checks/minervini_checks/trend_template도 채울지
+
+        Returns:
+            list: 신호 레코드 (signals 파일과 같은 키 + 'date')
+        """
+        where, params = self._where(date, ticker, analyzer, min_rs, max_rs)
+        if sort is None:
+            order = 'date DESC' if ticker is not None else SORT_ORDERS['rs-desc']
+        elif sort in SORT_ORDERS:
+            order = SORT_ORDERS[sort]
+        else:
+            raise ValueError(f"sort는 {', '.join(SORT_ORDERS)} 중 하나여야 합니다.")
+        sql = (f"SELECT date, {', '.join(column for _, column, _ in RECORD_COLUMNS)} FROM signals"
+               f" WHERE {where} ORDER BY {order}")
+        if limit is not None and limit > 0:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [int(limit), max(int(offset), 0)]
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        records = []
+        for row in rows:
+            record = {'date': row[0]}
+            for (key, column, _), value in zip(RECORD_COLUMNS, row[1:]):
+                record[key] = bool(value) if column in BOOL_COLUMNS else value
+            records.append(record)
+        if with_checks:
+            self._attach_checks(records)
+        return records
+
+    def count(self, date=None, ticker=None, analyzer=None, min_rs=0, max_rs=None):
+        """query와 같은 조건의 레코드 수"""
+        where, params = self._where(date, ticker, analyzer, min_rs, max_rs)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM signals WHERE {where}', params).fetchone()[0]
+
+    @staticmethod
+    def _where(date, ticker, analyzer, min_rs, max_rs):
+        conditions = ['rs >= ?']
+        params = [min_rs]
+        if max_rs is not None:
+            conditions.append('rs <= ?')
+            params.append(max_rs)
+        if date is not None:
+            conditions.append('date = ?')
+            params.append(date)
+        if ticker is not None:
+            conditions.append('ticker = ?')
+            params.append(str(ticker).zfill(6))
+        if analyzer is not None:
+            if analyzer not in ANALYZER_COLUMNS:
+                raise ValueError(f"analyzer는 {', '.join(ANALYZER_COLUMNS)} 중 하나여야 합니다.")
+            conditions.append(f'{ANALYZER_COLUMNS[analyzer]} = 1')
+        return ' AND '.join(conditions), params
+
+    def _attach_checks(self, records):
+        for record in records:
+            for group in CHECK_GROUPS:
+                record[group] = {}
+        by_key = {(record['date'], record['종목코드']): record for record in records}
+        dates = sorted({record['date'] for record in records})
+        with self._lock:
+            for date in dates:
+                rows = self._conn.execute(
+                    'SELECT ticker, check_group, check_name, passed FROM signal_checks WHERE date = ?', (date,)
+                ).fetchall()
+                for ticker, group, name, passed in rows:
+                    record = by_key.get((date, ticker))
+                    if record is not None:
+                        record[group][name] = bool(passed)
+
+    def close(self):
+        self._conn.close()
+
+
+def _plain(value):
+    """numpy 스칼라 등을 SQLite가 받는 기본 타입으로"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="신호 이력 DB 조회")
+    parser.add_argument("--date", type=str, default="",
+                        help="날짜 (YYYY-MM-DD, 비우면 종목 지정 시 전체 기간 / 아니면 최근 날짜)")
+    parser.add_argument("--ticker", type=str, default="",
+                        help="종목 코드")
+    parser.add_argument("--analyzer", type=str, default="",
+                        help="ryan / minervini / both")
+    parser.add_argument("--only-both", action="store_true",
+                        help="Ryan+Minervini 둘 다 신호만 (--analyzer both와 동일)")
+    parser.add_argument("--min-rs", type=int, default=0,
+                        help="최소 RS 등급")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="최대 개수 (0이면 전체)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    db = SignalDB()
+    date = args.date or (None if args.ticker else db.latest_date())
+    analyzer = 'both' if args.only_both else (args.analyzer or None)
+    records = db.query(date=date, ticker=args.ticker or None, analyzer=analyzer,
+                       min_rs=args.min_rs, limit=args.limit)
+    for record in records:
+        print(json.dumps({key: record[key] for key in ('date', '종목코드', '종목명', 'RS등급',
+                                                       'Ryan_진입신호', '미너비니_진입신호')},
+                         ensure_ascii=False))
+    print(f"총 {len(records)}건")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+패널 기반 일괄 진입신호 스캐너
+날짜 × 종목 지표 배열로 전체 종목의 Ryan/Minervini 조건을 한 번에 계산하고,
+신호가 난 종목만 기존 분석기로 근거 문구를 만들어 analyze_date와 같은 레코드 생성
+"""
+
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from advanced_entry_signals import AdvancedEntryAnalyzer
+from david_ryan_complete import DavidRyanComplete
+from indicators import build_indicator_panel
+from price_panel import PricePanel, PANEL_FIELDS
+from rs_history import RSHistory
+from signal_cache import FINGERPRINT_BARS, RYAN, MINERVINI, bar_hashes, window_fingerprint, is_stub
+
+# analyze_date와 동일: RS를 계산할 수 없는 종목의 기본값
+DEFAULT_RS_RATING = 50
+MIN_HISTORY = 200
+
+SHARED_META_FILE = 'meta.json'
+
+
+def build_signal_record(ticker, df, rs, ryan, minervini, current_price=None):
+    """
+    진입신호 레코드 생성 (signals_YYYY-MM-DD.json의 signals 항목)
+
+    Args:
+        ticker (str): 종목 코드
+        df (DataFrame): 분석 날짜까지의 가격 데이터
+        rs (int): RS Rating
+        ryan (dict): david_ryan_complete_signal 결과
+        minervini (dict): mark_minervini_advanced_signal 결과
+        current_price (float): 현재가 (없으면 df 마지막 종가, 일괄 스캔은 지표 행 종가를 넘김)
+
+    Returns:
+        dict: 신호 레코드
+    """
+    if current_price is None:
+        current_price = df['Close'].iloc[-1]
+    return {
+        '종목코드': ticker,
+        '종목명': df.attrs.get('name', ticker),
+        'RS등급': rs,
+        '현재가': float(current_price),
+        'Ryan_진입신호': ryan['entry_signal'],
+        'Ryan_신호강도': ryan['signal_strength'],
+        'Ryan_진입가': float(ryan['entry_price']),
+        'Ryan_손절가': float(ryan['stop_loss']),
+        'Ryan_추가매수1': float(ryan['add_on_prices'][0]) if ryan['add_on_prices'] else None,
+        'Ryan_추가매수2': float(ryan['add_on_prices'][1]) if len(ryan['add_on_prices']) > 1 else None,
+        'Ryan_손익비': float(ryan.get('risk_reward_ratio', 0)),
+        'Ryan_근거': ' | '.join(ryan['reasons']),
+        'Ryan_경고': ' | '.join(ryan['warnings']) if ryan['warnings'] else None,
+        'ryan_checks': {
+            'rs_check': bool(ryan.get('rs_check')),
+            'ma_alignment': bool(ryan.get('ma_alignment')),
+            'year_position_check': bool(ryan.get('year_position_check')),
+            'vcp_detected': bool(ryan.get('vcp_detected')),
+            'vdu_detected': bool(ryan.get('vdu_detected')),
+            'pivot_breakout': bool(ryan.get('pivot_breakout')),
+            'volume_surge': bool(ryan.get('volume_surge'))
+        },
+        '미너비니_진입신호': minervini['entry_signal'],
+        '미너비니_신호강도': minervini['signal_strength'],
+        '미너비니_진입가': float(minervini['entry_price']),
+        '미너비니_손절가': float(minervini['stop_loss']),
+        '미너비니_패턴': minervini.get('pattern_type'),
+        '미너비니_근거': ' | '.join(minervini['reasons']),
+        'minervini_checks': minervini.get('minervini_checks', {}),
+        '양쪽_모두_신호': ryan['entry_signal'] and minervini['entry_signal'],
+        'trend_template': minervini.get('trend_template', {})
+    }
+
+
+class BatchSignalScanner:
+    def __init__(self, price_data_dict, rs_history=None, panel=None, indicators=None):
+        """
+        일괄 스캐너 초기화 (패널/지표 배열/RS 히스토리를 1회 계산)
+
+        Args:
+            price_data_dict (dict): {종목코드: DataFrame} 전체 기간 가격 데이터
+                                    (None이면 신호 종목의 가격 데이터를 패널에서 복원)
+            rs_history (RSHistory): 미리 계산한 RS 히스토리 (없으면 계산)
+            panel (PricePanel): 미리 만든 가격 패널 (없으면 생성)
+            indicators (dict): 미리 계산한 build_indicator_panel 결과 (없으면 계산)
+        """
+        self.price_data_dict = price_data_dict
+        self.panel = panel if panel is not None else PricePanel.from_price_data(price_data_dict)
+        self.indicators = indicators if indicators is not None else build_indicator_panel(self.panel)
+        self.rs_history = rs_history if rs_history is not None else RSHistory.from_panel(self.panel)
+        self.ryan_analyzer = DavidRyanComplete()
+        self.minervini_analyzer = AdvancedEntryAnalyzer()
+        # 패널 열 -> RS 히스토리 열 (없는 종목은 -1)
+        self._rs_columns = np.array([self.rs_history.column.get(ticker, -1) for ticker in self.panel.tickers],
+                                    dtype=int)
+        self._hash_state = None
+
+    def rs_matrix(self, rows, dates):
+        """
+        선택한 날짜들의 RS Rating 행렬 (계산 불가 종목은 DEFAULT_RS_RATING)
+
+        Args:
+            rows (ndarray): 패널 행 번호
+            dates (list): 날짜 (RS 히스토리 행 조회용)
+
+        Returns:
+            ndarray: (날짜 수 × 종목 수) int
+        """
+        rs = np.full((len(rows), len(self.panel.tickers)), DEFAULT_RS_RATING, dtype=int)
+        known = self._rs_columns >= 0
+        for i, date in enumerate(dates):
+            rs_row = self.rs_history.row_for(date)
+            if rs_row < 0:
+                continue
+            values = self.rs_history.ratings[rs_row, self._rs_columns[known]].astype(int)
+            rs[i, known] = np.where(values >= 0, values, DEFAULT_RS_RATING)
+        return rs
+
+    def evaluate(self, dates):
+        """
+        여러 날짜의 전체 종목 점수/플래그를 한 번에 계산
+
+        Args:
+            dates (list): 분석 날짜
+
+        Returns:
+            tuple: (패널 행 번호, RS 행렬, Ryan 배열 dict, Minervini 배열 dict)
+                   배열은 모두 (날짜 수 × 종목 수), 데이터가 없는 날짜의 행은 -1
+        """
+        rows = np.array([self.panel.row_for(date) for date in dates], dtype=int)
+        safe_rows = np.maximum(rows, 0)
+        ind = {name: values[safe_rows] for name, values in self.indicators.items()}
+        # 패널 첫 날짜보다 이른 날짜는 봉이 없는 것으로 처리
+        ind['bars'] = np.where((rows >= 0)[:, None], ind['bars'], 0)
+        rs = self.rs_matrix(rows, dates)
+        ryan = self.ryan_analyzer.david_ryan_signal_arrays(ind, rs)
+        minervini = self.minervini_analyzer.minervini_signal_arrays(ind, rs)
+        return rows, rs, ryan, minervini
+
+    def scan_dates(self, dates, cache=None):
+        """
+        여러 날짜 일괄 스캔
+
+        Args:
+            dates (list): 분석 날짜 (datetime)
+            cache (SignalCache): 신호 캐시 (있으면 입력 구간이 같은 종목/날짜는 재계산하지 않음)
+
+        Returns:
+            dict: {날짜: 진입신호 레코드 리스트} (analyze_date의 entry_signals와 동일)
+        """
+        if cache is not None:
+            return self._scan_dates_cached(dates, cache)
+
+        rows, rs, ryan, minervini = self.evaluate(dates)
+        hits = ryan['entry_signal'] | minervini['entry_signal']
+
+        results = {}
+        for i, date in enumerate(dates):
+            signals = []
+            for col in np.flatnonzero(hits[i]):
+                ticker = self.panel.tickers[col]
+                try:
+                    record = self._signal_record(ticker, col, rows[i], date, int(rs[i, col]))
+                except Exception:
+                    continue
+                if record is not None:
+                    signals.append(record)
+            results[date] = signals
+        return results
+
+    def _scan_dates_cached(self, dates, cache):
+        """캐시를 먼저 조회하고, 빠진 종목이 있는 날짜만 배열 계산"""
+        lookups = []
+        pending = []
+        for date in dates:
+            row = self.panel.row_for(date)
+            rs = self.rs_matrix(np.array([row]), [date])[0]
+            fingerprints = self._fingerprints(row, rs)
+            cached = {RYAN: cache.get_many(RYAN, date, fingerprints),
+                      MINERVINI: cache.get_many(MINERVINI, date, fingerprints)}
+            lookups.append((date, row, rs, fingerprints, cached))
+            if any(ticker not in cached[RYAN] or ticker not in cached[MINERVINI] for ticker in fingerprints):
+                pending.append(date)
+
+        evaluated = {}
+        if pending:
+            _, _, ryan, minervini = self.evaluate(pending)
+            for i, date in enumerate(pending):
+                evaluated[date] = (ryan, minervini, i)
+
+        results = {}
+        # 새 결과는 날짜별로 모아 마지막에 한 번에 저장
+        to_store = {RYAN: {}, MINERVINI: {}}
+        for date, row, rs, fingerprints, cached in lookups:
+            new_entries = {RYAN: {}, MINERVINI: {}}
+            signals = []
+            for ticker, fingerprint in fingerprints.items():
+                col = self.panel.column[ticker]
+                summaries = {}
+                for analyzer, arrays_index in ((RYAN, 0), (MINERVINI, 1)):
+                    summary = cached[analyzer].get(ticker)
+                    if summary is None:
+                        arrays, i = evaluated[date][arrays_index], evaluated[date][2]
+                        summary = {'entry_signal': bool(arrays['entry_signal'][i, col]),
+                                   'signal_strength': int(arrays['signal_strength'][i, col])}
+                        new_entries[analyzer][ticker] = (fingerprint, summary)
+                    summaries[analyzer] = summary
+                if not (summaries[RYAN]['entry_signal'] or summaries[MINERVINI]['entry_signal']):
+                    continue
+
+                try:
+                    df, ind = self._inputs(ticker, col, row, date)
+                    rs_rating = int(rs[col])
+                    if is_stub(summaries[RYAN]):
+                        summaries[RYAN] = self.ryan_analyzer.david_ryan_complete_signal(df, rs_rating, indicators=ind)
+                        new_entries[RYAN][ticker] = (fingerprint, summaries[RYAN])
+                    if is_stub(summaries[MINERVINI]):
+                        summaries[MINERVINI] = self.minervini_analyzer.mark_minervini_advanced_signal(
+                            df, rs_rating, indicators=ind)
+                        new_entries[MINERVINI][ticker] = (fingerprint, summaries[MINERVINI])
+                except Exception:
+                    continue
+                ryan, minervini = summaries[RYAN], summaries[MINERVINI]
+                if ryan['entry_signal'] or minervini['entry_signal']:
+                    signals.append(build_signal_record(ticker, df, rs_rating, ryan, minervini,
+                                                      current_price=ind['close']))
+
+            for analyzer, entries in new_entries.items():
+                if entries:
+                    to_store[analyzer][date] = entries
+            results[date] = signals
+
+        for analyzer, entries_by_date in to_store.items():
+            cache.put_dates(analyzer, entries_by_date)
+        return results
+
+    def input_fingerprints(self, date):
+        """
+        기준일에 분석 대상인 종목들의 입력 구간 지문 (신호 계산 없이 조회)
+
+        Returns:
+            dict: {종목코드: 지문}
+        """
+        row = self.panel.row_for(date)
+        rs = self.rs_matrix(np.array([row]), [date])[0]
+        return self._fingerprints(row, rs)
+
+    def _fingerprints(self, row, rs):
+        """
+        기준일 행에서 봉이 MIN_HISTORY개 이상인 종목의 입력 구간 지문
+        (봉 해시 누적합 차이로 전 종목 구간 합을 한 번에 계산)
+
+        Returns:
+            dict: {종목코드: 지문} (패널 열 순서)
+        """
+        if row < 0:
+            return {}
+        cumulative, bar_rows = self._hashes()
+        bars = self.indicators['bars'][row].astype(int)
+        cols = np.flatnonzero(bars >= MIN_HISTORY)
+        if len(cols) == 0:
+            return {}
+
+        # 구간 시작 직전 봉(FINGERPRINT_BARS+1번째 전 봉)의 행까지 누적합을 빼서 구간 합 계산
+        before = bars[cols] - FINGERPRINT_BARS - 1
+        before_rows = bar_rows[np.maximum(before, 0), cols]
+        with np.errstate(over='ignore'):
+            sums = cumulative[row, cols] - np.where((before >= 0)[:, None],
+                                                    cumulative[before_rows, cols],
+                                                    np.uint64(0))
+        return {self.panel.tickers[col]: window_fingerprint(sums[i], bars[col], rs[col])
+                for i, col in enumerate(cols)}
+
+    def _hashes(self):
+        """(봉 해시 누적합 (날짜 × 종목 × 2), 종목별 j번째 봉의 행 번호 (최대 봉 수 × 종목))"""
+        if self._hash_state is None:
+            present = self.panel.present
+            ohlcv = np.stack([self.panel.fields[field] for field in PANEL_FIELDS], axis=-1)
+            dates = np.broadcast_to(self.panel.dates.values[:, None], present.shape)
+            hashes = np.where(present[..., None], bar_hashes(dates, ohlcv), np.uint64(0))
+            with np.errstate(over='ignore'):
+                cumulative = np.cumsum(hashes, axis=0, dtype=np.uint64)
+
+            counts = present.sum(axis=0)
+            bar_rows = np.zeros((max(int(counts.max(initial=0)), 1), present.shape[1]), dtype=int)
+            for col in range(present.shape[1]):
+                own_rows = np.flatnonzero(present[:, col])
+                bar_rows[:len(own_rows), col] = own_rows
+            self._hash_state = (cumulative, bar_rows)
+        return self._hash_state
+
+    def scan(self, target_date, cache=None):
+        """
+        특정 날짜 일괄 스캔
+
+        Returns:
+            list: 진입신호 레코드 (analyze_date의 entry_signals와 동일)
+        """
+        print(f"\n분석 날짜: {target_date.strftime('%Y-%m-%d')} (일괄 스캔)")
+        signals = self.scan_dates([target_date], cache=cache)[target_date]
+        print(f"  진입신호: {len(signals)}개")
+        return signals
+
+    def save_shared(self, directory):
+        """
+        다른 프로세스가 메모리 매핑으로 읽을 수 있게 배열을 .npy 파일로 저장
+
+        Args:
+            directory (str): 저장 폴더
+        """
+        os.makedirs(directory, exist_ok=True)
+        arrays = {'present': self.panel.present,
+                  'rs_performance': self.rs_history.performance,
+                  'rs_ratings': self.rs_history.ratings}
+        arrays.update({f'field_{name}': values for name, values in self.panel.fields.items()})
+        arrays.update({f'ind_{name}': values for name, values in self.indicators.items()})
+        for name, values in arrays.items():
+            np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(values))
+
+        meta = {
+            'dates': self.panel.dates.strftime('%Y-%m-%d').tolist(),
+            'tickers': self.panel.tickers,
+            'names': self.panel.names,
+            'fields': list(self.panel.fields.keys()),
+            'indicators': list(self.indicators.keys()),
+            'rs_dates': self.rs_history.dates.strftime('%Y-%m-%d').tolist(),
+            'rs_tickers': self.rs_history.tickers,
+        }
+        with open(os.path.join(directory, SHARED_META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def load_shared(cls, directory):
+        """
+        save_shared로 저장한 배열을 읽기 전용 메모리 매핑으로 열어 스캐너 생성
+        (프로세스마다 복사본을 만들지 않음)
+
+        Args:
+            directory (str): save_shared 폴더
+
+        Returns:
+            BatchSignalScanner: price_data_dict 없이 패널에서 가격 데이터를 복원하는 스캐너
+        """
+        with open(os.path.join(directory, SHARED_META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        def load(name):
+            return np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+
+        panel = PricePanel(
+            pd.DatetimeIndex(meta['dates']),
+            meta['tickers'],
+            {name: load(f'field_{name}') for name in meta['fields']},
+            load('present'),
+            meta['names'],
+        )
+        indicators = {name: load(f'ind_{name}') for name in meta['indicators']}
+        rs_history = RSHistory(pd.DatetimeIndex(meta['rs_dates']), meta['rs_tickers'],
+                               load('rs_performance'), load('rs_ratings'))
+        return cls(None, rs_history=rs_history, panel=panel, indicators=indicators)
+
+    def _price_data(self, ticker):
+        if self.price_data_dict is not None:
+            return self.price_data_dict[ticker]
+        return self.panel.frame(ticker)
+
+    def _inputs(self, ticker, col, row, date):
+        """기준일까지 잘린 가격 데이터와 그 날짜 지표 행"""
+        df = self._price_data(ticker)
+        df = df.iloc[:int(self.indicators['bars'][row, col])] if row >= 0 else df.iloc[:0]
+        ind = {name: values[row, col] for name, values in self.indicators.items()}
+        return df, ind
+
+    def _signal_record(self, ticker, col, row, date, rs):
+        """신호가 난 종목만 기존 분석기로 근거 문구 포함 결과 생성"""
+        df, ind = self._inputs(ticker, col, row, date)
+        if len(df) < MIN_HISTORY:
+            return None
+        ryan = self.ryan_analyzer.david_ryan_complete_signal(df, rs, indicators=ind)
+        minervini = self.minervini_analyzer.mark_minervini_advanced_signal(df, rs, indicators=ind)
+        if not (ryan['entry_signal'] or minervini['entry_signal']):
+            return None
+        return build_signal_record(ticker, df, rs, ryan, minervini, current_price=ind['close'])
@@ -0,0 +1,249 @@
+"""
+거래 시뮬레이터
+신호일 다음 봉부터 일봉을 따라가며 진입(매수 스톱), 추가매수, 손절, 목표가/보유기간 청산을
+거래 단위로 판정해 거래 내역(ledger)을 만듦 (전체 거래를 봉 창 배열로 한 번에 계산)
+"""
+
+import numpy as np
+import pandas as pd
+
+from price_panel import PricePanel
+
+# 신호 후 진입을 기다리는 봉 수 (이 안에 진입가를 넘지 못하면 미체결)
+ENTRY_WINDOW = 5
+# 진입 후 최대 보유 봉 수 (넘으면 종가 청산)
+MAX_HOLD = 60
+# 목표가: 진입가 대비 +20% (calculate_entry_and_stops의 목표 수익)
+TARGET_PCT = 20.0
+# 추가매수 1/2차 비중 (최초 진입 1 대비)
+ADD_ON_SIZES = (0.5, 0.5)
+# 한 번에 계산하는 거래 수 (봉 창 배열 메모리 제한)
+CHUNK_SIZE = 20000
+
+LEDGER_COLUMNS = [
+    'ticker', 'strategy', 'signal_date', 'status', 'entry_date', 'entry_price', 'stop_loss', 'target',
+    'add_on_1_date', 'add_on_1_price', 'add_on_2_date', 'add_on_2_price', 'units', 'avg_price',
+    'exit_date', 'exit_price', 'exit_reason', 'bars_held', 'return_pct', 'r_multiple',
+]
+
+
+class BarSeries:
+    def __init__(self, panel, fields=('Open', 'High', 'Low', 'Close')):
+        """
+        종목별 실제 봉만 이어붙인 1차원 배열 (거래정지로 빈 날짜는 건너뜀)
+
+        Args:
+            panel (PricePanel): 가격 패널
+            fields (tuple): 담을 필드
+        """
+        present = panel.present
+        # 종목 순서 -> 날짜 순서로 펼친 실제 봉의 패널 행 번호
+        self.dates = panel.dates
+        self.rows = np.nonzero(present.T)[1]
+        self.fields = {field: panel.field(field).T[present.T] for field in fields}
+        counts = present.sum(axis=0)
+        self.starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        self.ends = self.starts + counts
+        self.column = panel.column
+
+    @classmethod
+    def from_price_data(cls, price_data_dict):
+        """{종목코드: DataFrame}으로 바로 생성"""
+        return cls(PricePanel.from_price_data(price_data_dict, fields=('Open', 'High', 'Low', 'Close')))
+
+    def first_bar_after(self, tickers, dates):
+        """
+        종목별로 date 다음 봉의 전체 배열 위치 (종목이 없으면 -1, 다음 봉이 없으면 종목 끝 위치)
+
+        Args:
+            tickers (array): 종목 코드
+            dates (array): 신호 날짜
+
+        Returns:
+            tuple: (시작 위치 ndarray, 종목 끝 위치 ndarray)
+        """
+        cols = np.array([self.column.get(ticker, -1) for ticker in tickers])
+        date_rows = self.dates.searchsorted(pd.DatetimeIndex(dates), side='right')
+        starts = np.full(len(cols), -1)
+        ends = np.full(len(cols), -1)
+        for col in np.unique(cols[cols >= 0]):
+            mask = cols == col
+            lo, hi = self.starts[col], self.ends[col]
+            starts[mask] = lo + np.searchsorted(self.rows[lo:hi], date_rows[mask])
+            ends[mask] = hi
+        return starts, ends
+
+
+def _first_true(mask):
+    """행별 첫 True 위치 (없으면 열 개수)"""
+    any_true = mask.any(axis=1)
+    return np.where(any_true, mask.argmax(axis=1), mask.shape[1])
+
+
+def simulate_trades(bars, signals, entry_window=ENTRY_WINDOW, max_hold=MAX_HOLD, target_pct=TARGET_PCT,
+                    add_on_sizes=ADD_ON_SIZES, fee_pct=0.0):
+    """
+    신호별 거래 시뮬레이션
+
+    봉 하나 안에서는 진입 -> 추가매수 -> 손절 -> 목표가 순서로 판정 (같은 봉에 손절과 목표가가
+    모두 닿으면 손절로 보는 보수적 가정). 체결가는 갭을 반영해 매수 스톱은 max(시가, 주문가),
+    손절은 min(시가, 손절가), 목표가는 max(시가, 목표가), 보유기간 만료는 그 봉 종가.
+
+    Args:
+        bars (BarSeries): 종목별 봉 배열
+        signals (DataFrame): ticker, date, entry, stop 컬럼 필수 (add_on_1, add_on_2, target, strategy 선택)
+        entry_window (int): 진입 대기 봉 수
+        max_hold (int): 최대 보유 봉 수 (진입 봉 포함)
+        target_pct (float): target 컬럼이 없을 때 진입 주문가 대비 목표 수익률(%), 0이면 목표가 없음
+        add_on_sizes (tuple): 추가매수 1/2차 비중
+        fee_pct (float): 왕복 거래비용(%) - 수익률에서 차감
+
+    Returns:
+        DataFrame: 거래 내역 (LEDGER_COLUMNS), status는 filled/expired/no_data
+    """
+    if len(signals) == 0:
+        return pd.DataFrame(columns=LEDGER_COLUMNS)
+
+    ledgers = [
+        _simulate_chunk(bars, signals.iloc[i:i + CHUNK_SIZE], entry_window, max_hold, target_pct,
+                        add_on_sizes, fee_pct)
+        for i in range(0, len(signals), CHUNK_SIZE)
+    ]
+    return pd.concat(ledgers, ignore_index=True)[LEDGER_COLUMNS]
+
+
+def _simulate_chunk(bars, signals, entry_window, max_hold, target_pct, add_on_sizes, fee_pct):
+    n = len(signals)
+    tickers = signals['ticker'].to_numpy()
+    entry = signals['entry'].to_numpy(dtype=float)
+    stop = signals['stop'].to_numpy(dtype=float)
+    if 'target' in signals.columns:
+        target = signals['target'].to_numpy(dtype=float)
+    elif target_pct > 0:
+        target = entry * (1 + target_pct / 100)
+    else:
+        target = np.full(n, np.inf)
+    add_ons = [signals[col].to_numpy(dtype=float) if col in signals.columns else np.full(n, np.nan)
+               for col in ('add_on_1', 'add_on_2')]
+
+    # 신호 다음 봉부터 entry_window + max_hold 봉 창
+    width = entry_window + max_hold
+    starts, ends = bars.first_bar_after(tickers, signals['date'])
+    positions = starts[:, None] + np.arange(width)[None, :]
+    inside = (starts[:, None] >= 0) & (positions < ends[:, None])
+    safe = np.where(inside, positions, 0)
+    opens, highs, lows, closes = (np.where(inside, bars.fields[field][safe], np.nan)
+                                  for field in ('Open', 'High', 'Low', 'Close'))
+    steps = np.arange(width)[None, :]
+
+    valid = (entry > 0) & (stop > 0) & (stop < entry) & (starts >= 0) & (starts < ends)
+    fill_step = _first_true((highs[:, :entry_window] >= entry[:, None]) & valid[:, None])
+    filled = fill_step < entry_window
+    rows = np.arange(n)
+    fill_at = np.minimum(fill_step, width - 1)
+    fill_price = np.maximum(opens[rows, fill_at], entry)
+
+    holding = (steps >= fill_step[:, None]) & (steps < (fill_step + max_hold)[:, None]) & inside
+    stop_step = _first_true(holding & (lows <= stop[:, None]))
+    target_step = _first_true(holding & (highs >= target[:, None]))
+    last_step = np.where(inside, steps, -1).max(axis=1)
+    time_step = np.minimum(fill_step + max_hold - 1, last_step)
+
+    exit_step = np.minimum(np.minimum(stop_step, target_step), time_step)
+    exit_at = np.clip(exit_step, 0, width - 1)
+    exit_open = opens[rows, exit_at]
+    reason = np.where(stop_step == exit_step, 'stop',
+                      np.where(target_step == exit_step, 'target',
+                               np.where(fill_step + max_hold - 1 <= last_step, 'time', 'open')))
+    # 진입 봉의 손절/목표가는 주문가 그대로 (같은 봉의 저가/고가가 체결 이후에 나왔다고 가정,
+    # 시가가 진입가 아래였던 돌파 봉은 저가가 체결 전일 수도 있어 손절 판정이 보수적)
+    on_fill_bar = exit_step == fill_step
+    exit_price = np.select(
+        [reason == 'stop', reason == 'target'],
+        [np.where(on_fill_bar, stop, np.minimum(exit_open, stop)),
+         np.where(on_fill_bar, np.maximum(fill_price, target), np.maximum(exit_open, target))],
+        closes[rows, exit_at],
+    )
+
+    units = np.where(filled, 1.0, 0.0)
+    cost = units * fill_price
+    add_on_info = []
+    for price, size in zip(add_ons, add_on_sizes):
+        step = _first_true(holding & (steps <= exit_step[:, None]) & (highs >= price[:, None]))
+        done = filled & (price > 0) & (step <= exit_step)
+        at = np.clip(step, 0, width - 1)
+        add_price = np.where(step == fill_step, np.maximum(fill_price, price), np.maximum(opens[rows, at], price))
+        units = units + np.where(done, size, 0.0)
+        cost = cost + np.where(done, size * add_price, 0.0)
+        add_on_info.append((done, at, add_price))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_price = cost / units
+        return_pct = (exit_price / avg_price - 1) * 100 - fee_pct
+        r_multiple = (exit_price - avg_price) / (entry - stop)
+
+    def bar_date(step, mask):
+        at = np.clip(step, 0, width - 1)
+        if not mask.any():
+            return np.full(n, np.datetime64('NaT'), dtype='datetime64[ns]')
+        pos = np.where(mask, safe[rows, at], 0)
+        return pd.Series(bars.dates[bars.rows[pos]]).where(mask, pd.NaT).to_numpy()
+
+    status = np.where(filled, 'filled', np.where(valid, 'expired', 'no_data'))
+    ledger = pd.DataFrame({
+        'ticker': tickers,
+        'strategy': signals['strategy'].to_numpy() if 'strategy' in signals.columns else '',
+        'signal_date': pd.DatetimeIndex(signals['date']).to_numpy(),
+        'status': status,
+        'entry_date': bar_date(fill_step, filled),
+        'entry_price': np.where(filled, fill_price, np.nan),
+        'stop_loss': stop,
+        'target': np.where(np.isfinite(target), target, np.nan),
+        'units': units,
+        'avg_price': np.where(filled, avg_price, np.nan),
+        'exit_date': bar_date(exit_step, filled),
+        'exit_price': np.where(filled, exit_price, np.nan),
+        'exit_reason': np.where(filled, reason, None),
+        'bars_held': np.where(filled, exit_step - fill_step + 1, 0),
+        'return_pct': np.where(filled, return_pct, np.nan),
+        'r_multiple': np.where(filled, r_multiple, np.nan),
+    })
+    for k, (done, at, add_price) in enumerate(add_on_info, start=1):
+        ledger[f'add_on_{k}_date'] = bar_date(at, done)
+        ledger[f'add_on_{k}_price'] = np.where(done, add_price, np.nan)
+    return ledger
+
+
+def trade_metrics(ledger):
+    """
+    거래 내역 요약 (체결된 거래만)
+
+    Args:
+        ledger (DataFrame): simulate_trades 결과
+
+    Returns:
+        dict: trades, fill_rate, win_rate, avg_return, median_return, profit_factor,
+              expectancy_r, avg_bars_held, stop_rate, target_rate
+    """
+    filled = ledger[ledger['status'] == 'filled']
+    signals = int((ledger['status'] != 'no_data').sum())
+    if len(filled) == 0:
+        return {'trades': 0, 'fill_rate': 0.0, 'win_rate': 0.0, 'avg_return': 0.0, 'median_return': 0.0,
+                'profit_factor': 0.0, 'expectancy_r': 0.0, 'avg_bars_held': 0.0,
+                'stop_rate': 0.0, 'target_rate': 0.0}
+
+    returns = filled['return_pct'].to_numpy(dtype=float)
+    gains = returns[returns > 0].sum()
+    losses = -returns[returns < 0].sum()
+    return {
+        'trades': int(len(filled)),
+        'fill_rate': len(filled) / signals if signals else 0.0,
+        'win_rate': float((returns > 0).mean()),
+        'avg_return': float(returns.mean()),
+        'median_return': float(np.median(returns)),
+        'profit_factor': float(gains / losses) if losses > 0 else float('inf'),
+        'expectancy_r': float(filled['r_multiple'].mean()),
+        'avg_bars_held': float(filled['bars_held'].mean()),
+        'stop_rate': float((filled['exit_reason'] == 'stop').mean()),
+        'target_rate': float((filled['exit_reason'] == 'target').mean()),
+    }
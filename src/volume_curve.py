@@ -0,0 +1,222 @@
+"""
+장중 누적 거래량 곡선
+장 시작 후 시각별 누적 거래량 비율(하루 거래량 대비)로 장중 거래량을 하루 전체 예상 거래량으로 환산
+(data/intraday/volume_curve.json, 장중 스냅샷과 다음 날 받은 일봉 거래량으로 보정)
+"""
+
+import os
+import json
+from datetime import datetime
+
+import numpy as np
+
+from weekly_manifest import write_json_atomic
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+VOLUME_CURVE_PATH = os.path.join(PROJECT_ROOT, "data", "intraday", "volume_curve.json")
+
+CURVE_FORMAT_VERSION = 2
+
+# 정규장 09:00 ~ 15:30 (장 시작 후 분)
+MARKET_OPEN_MINUTE = 9 * 60
+SESSION_MINUTES = 390
+BUCKET_MINUTES = 10
+
+# 기본 곡선 (장 시작 직후와 종가 단일가에 거래가 몰리는 U자형)
+DEFAULT_CURVE = (
+    (0, 0.0), (10, 0.10), (30, 0.20), (60, 0.30), (120, 0.45), (180, 0.55),
+    (240, 0.64), (300, 0.74), (360, 0.85), (380, 0.91), (390, 1.0),
+)
+
+# 장 초반 과대 추정 방지 (누적 비율 하한)
+MIN_FRACTION = 0.05
+# 곡선 계산에 쓰는 최근 보정 일수
+CALIBRATION_DAYS = 20
+
+
+def session_minute(when):
+    """
+    장 시작 후 경과 분 (장 전은 0, 장 마감 후는 SESSION_MINUTES)
+
+    Args:
+        when (datetime): 시각
+
+    Returns:
+        float: 경과 분
+    """
+    minute = when.hour * 60 + when.minute + when.second / 60 - MARKET_OPEN_MINUTE
+    return min(max(minute, 0.0), float(SESSION_MINUTES))
+
+
+def in_session(when):
+    """
+    정규장 진행 중인지 (주말/장 전/장 마감 후는 아님, 공휴일은 고려하지 않음)
+
+    Args:
+        when (datetime): 시각
+
+    Returns:
+        bool: 진행 중이면 True
+    """
+    return when.weekday() < 5 and 0 < session_minute(when) < SESSION_MINUTES
+
+
+class VolumeCurve:
+    def __init__(self, path=None):
+        """
+        거래량 곡선 로드 (없거나 형식이 다르면 기본 곡선)
+
+        Args:
+            path (str): 곡선 파일 경로 (없으면 data/intraday/volume_curve.json)
+        """
+        self.path = path or VOLUME_CURVE_PATH
+        self.days = {}
+        self.samples = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == CURVE_FORMAT_VERSION:
+                    self.days = data.get('days', {})
+                    self.samples = data.get('samples', {})
+            except (OSError, ValueError, AttributeError):
+                self.days, self.samples = {}, {}
+        self._build()
+
+    def _build(self):
+        """보정된 날짜들의 구간별 중앙값으로 곡선 구성 (데이터가 없는 구간은 기본 곡선)"""
+        minutes = np.arange(0, SESSION_MINUTES + 1, BUCKET_MINUTES, dtype=float)
+        default_x, default_y = zip(*DEFAULT_CURVE)
+        fractions = np.interp(minutes, default_x, default_y)
+
+        recent = sorted(self.days)[-CALIBRATION_DAYS:]
+        for i, minute in enumerate(minutes):
+            observed = [self.days[day][str(int(minute))] for day in recent
+                        if str(int(minute)) in self.days[day]]
+            if observed:
+                fractions[i] = float(np.median(observed))
+
+        # 누적 비율이므로 단조 증가, 마감 시각은 1
+        fractions = np.minimum(np.maximum.accumulate(np.clip(fractions, 0.0, 1.0)), 1.0)
+        fractions[-1] = 1.0
+        self.minutes = minutes
+        self.fractions = fractions
+
+    def fraction(self, when):
+        """
+        해당 시각까지의 누적 거래량 비율
+
+        Args:
+            when (datetime): 시각
+
+        Returns:
+            float: 하루 거래량 대비 비율 (MIN_FRACTION ~ 1, 장중이 아니면 스냅샷이 마지막 거래일
+                   최종 거래량이므로 1)
+        """
+        if not in_session(when):
+            return 1.0
+        value = float(np.interp(session_minute(when), self.minutes, self.fractions))
+        return max(value, MIN_FRACTION)
+
+    def project(self, volume, when):
+        """
+        장중 누적 거래량 -> 하루 예상 거래량
+
+        Args:
+            volume (float): 해당 시각까지의 누적 거래량
+            when (datetime): 시각
+
+        Returns:
+            float: 예상 거래량 (volume이 없으면 None, 장중이 아니면 volume 그대로)
+        """
+        if volume is None or not np.isfinite(volume):
+            return None
+        return volume / self.fraction(when)
+
+    def record_snapshot(self, when, volumes):
+        """
+        장중 스냅샷 누적 거래량 기록 (구간마다 경계 시각 이후 첫 스냅샷만 실제 시각과 함께 보관,
+        다음 날 calibrate에서 비율로 변환)
+
+        Args:
+            when (datetime): 스냅샷 시각
+            volumes (dict): {종목코드: 누적 거래량}
+        """
+        if not in_session(when):
+            return
+        minute = session_minute(when)
+        bucket = str(int(minute // BUCKET_MINUTES * BUCKET_MINUTES))
+        day = self.samples.setdefault(when.strftime('%Y-%m-%d'), {})
+        if bucket in day:
+            return
+        day[bucket] = {
+            'minute': round(minute, 2),
+            'volumes': {ticker: float(volume) for ticker, volume in volumes.items()
+                        if volume is not None and np.isfinite(volume)},
+        }
+
+    def calibrate(self, history, today=None):
+        """
+        지난 날짜 스냅샷을 일봉 거래량으로 나눠 구간별 누적 비율로 변환 후 곡선 재구성
+
+        Args:
+            history (dict): {종목코드: 일봉 DataFrame}
+            today (date): 오늘 날짜 (오늘 스냅샷은 하루가 끝나지 않았으므로 보관)
+
+        Returns:
+            int: 새로 보정한 날짜 수
+        """
+        today = (today or datetime.now().date()).strftime('%Y-%m-%d')
+        calibrated = 0
+        for day in sorted(self.samples):
+            if day >= today:
+                continue
+            buckets = self.samples.pop(day)
+            final = {}
+            for ticker, df in history.items():
+                rows = df.loc[df.index.strftime('%Y-%m-%d') == day, 'Volume']
+                if len(rows) and rows.iloc[-1] > 0:
+                    final[ticker] = float(rows.iloc[-1])
+
+            observed = []
+            for sample in buckets.values():
+                volumes = sample['volumes']
+                tickers = [ticker for ticker in volumes if ticker in final]
+                total = sum(final[ticker] for ticker in tickers)
+                if total > 0:
+                    observed.append((sample['minute'], sum(volumes[ticker] for ticker in tickers) / total))
+            if observed:
+                self.days[day] = self._grid_fractions(sorted(observed))
+                calibrated += 1
+
+        for day in sorted(self.days)[:-CALIBRATION_DAYS]:
+            del self.days[day]
+        self._build()
+        return calibrated
+
+    def _grid_fractions(self, observed):
+        """
+        스냅샷 실제 시각의 누적 비율을 구간 경계 시각으로 보간 (관측 구간 밖은 비워 기본 곡선 사용)
+
+        Args:
+            observed (list): [(장 시작 후 분, 누적 비율)] (시각순)
+
+        Returns:
+            dict: {구간 시작 분(str): 누적 비율}
+        """
+        minutes, fractions = zip(*observed)
+        grid = np.arange(0, SESSION_MINUTES + 1, BUCKET_MINUTES, dtype=float)
+        grid = grid[(grid >= minutes[0]) & (grid <= minutes[-1])]
+        return {str(int(minute)): float(value)
+                for minute, value in zip(grid, np.interp(grid, minutes, fractions))}
+
+    def save(self):
+        """곡선 원자적 저장"""
+        write_json_atomic(self.path, {
+            'format': CURVE_FORMAT_VERSION,
+            'curve': [[int(m), round(float(f), 4)] for m, f in zip(self.minutes, self.fractions)],
+            'days': self.days,
+            'samples': self.samples,
+        }, ensure_ascii=False)
@@ -0,0 +1,408 @@
+"""
+워크포워드 최적화
+학습 구간에서 param_sweep과 같은 방식으로 임계값 조합을 고르고 바로 다음 검증 구간에 적용해,
+검증 구간 거래만 이어붙여 과최적화 없이 전략 성과를 확인
+조합별 거래 내역은 전체 평가 기간에 대해 한 번만 계산해 겹치는 창들이 나눠 쓰고,
+data/walk_forward_cache에 저장해 다음 실행에서는 새 날짜(와 아직 결과가 확정되지 않은 거래)만 다시 계산
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+import indicators
+import param_sweep
+import rs_history
+import trade_simulator
+from param_sweep import (STRATEGIES, DEFAULT_SORT, HISTORY_DAYS, expand_grid, load_grid, load_store_universe,
+                         map_combos, combo_ledger, rank_results)
+from signal_cache import analyzer_version
+from signal_scanner import BatchSignalScanner
+from trade_simulator import LEDGER_COLUMNS, trade_metrics, ENTRY_WINDOW, MAX_HOLD, TARGET_PCT
+from weekly_manifest import write_json_atomic
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+WALK_FORWARD_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "walk_forward_cache")
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
+
+CACHE_FORMAT_VERSION = 1
+
+# 학습/검증 창 기본 길이 (거래일)
+TRAIN_DAYS = 120
+TEST_DAYS = 20
+# 학습 창은 거래 수가 적으므로 param_sweep보다 낮은 최소 거래 수
+MIN_TRADES = 10
+
+SUMMARY_METRICS = ('trades', 'win_rate', 'avg_return', 'profit_factor', 'expectancy_r')
+
+
+def combo_key(strategy, params):
+    """조합 캐시 키 (기본값을 채운 전체 파라미터 기준이라 {}와 기본값 명시가 같은 키)"""
+    full = {**STRATEGIES[strategy].DEFAULT_PARAMS, **params}
+    return json.dumps(full, sort_keys=True)
+
+
+def rolling_windows(dates, train_days=TRAIN_DAYS, test_days=TEST_DAYS, step=None):
+    """
+    학습/검증 창 (검증 창이 이어지도록 step 기본값은 test_days, 마지막 검증 창은 짧을 수 있음)
+
+    Args:
+        dates (DatetimeIndex): 평가 거래일
+        train_days (int): 학습 창 거래일 수
+        test_days (int): 검증 창 거래일 수
+        step (int): 창 이동 거래일 수
+
+    Returns:
+        list: (학습 시작, 학습 끝, 검증 시작, 검증 끝) 튜플
+    """
+    step = step or test_days
+    windows = []
+    for start in range(0, len(dates) - train_days, step):
+        train = dates[start:start + train_days]
+        test = dates[start + train_days:start + train_days + test_days]
+        windows.append((train[0], train[-1], test[0], test[-1]))
+    return windows
+
+
+def window_trades(ledger, start, end, closed_by=None):
+    """
+    신호일이 [start, end]인 거래
+
+    Args:
+        ledger (DataFrame): 거래 내역
+        start, end (Timestamp): 신호일 범위
+        closed_by (Timestamp): 이 날짜 이후에 청산된(또는 미청산) 체결 거래 제외
+                               (학습 창 성과에 검증 구간 가격이 섞이지 않게)
+
+    Returns:
+        DataFrame: 해당 거래
+    """
+    mask = (ledger['signal_date'] >= start) & (ledger['signal_date'] <= end)
+    if closed_by is not None:
+        mask &= (ledger['status'] != 'filled') | (ledger['exit_date'] <= closed_by)
+    return ledger[mask]
+
+
+class LedgerCache:
+    def __init__(self, strategy, scanner, sim_kwargs, base_dir=None):
+        """
+        조합별 거래 내역 캐시 (전략 + 유니버스별 parquet 1개)
+
+        같은 종목/시작일 패널이고 저장 당시 마지막 봉까지의 가격이 그대로면,
+        저장 당시 마지막 봉에서 entry_window + max_hold 거래일 이전 신호의 거래는 결과가 확정된 것으로 보고 재사용
+
+        Args:
+            strategy (str): ryan/minervini
+            scanner (BatchSignalScanner): 현재 패널 스캐너
+            sim_kwargs (dict): simulate_trades 인자 (다르면 캐시 무효)
+            base_dir (str): 캐시 폴더 (없으면 data/walk_forward_cache)
+        """
+        base_dir = base_dir or WALK_FORWARD_CACHE_DIR
+        panel = scanner.panel
+        self.panel = panel
+        self.strategy = strategy
+        self.sim_kwargs = sim_kwargs
+        self.settle_bars = sim_kwargs.get('entry_window', ENTRY_WINDOW) + sim_kwargs.get('max_hold', MAX_HOLD)
+        self.version = analyzer_version(STRATEGIES[strategy], indicators, rs_history, trade_simulator, param_sweep)
+
+        universe = hashlib.sha1(json.dumps({
+            'tickers': list(panel.tickers),
+            'start': panel.dates[0].strftime('%Y-%m-%d'),
+        }).encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(base_dir, f"{strategy}_{universe}.parquet")
+        self.meta_path = os.path.join(base_dir, f"{strategy}_{universe}.json")
+
+        self.meta = {}
+        self.ledger = pd.DataFrame(columns=LEDGER_COLUMNS + ['combo'])
+        if os.path.exists(self.meta_path) and os.path.exists(self.path):
+            try:
+                with open(self.meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if self._meta_valid(meta):
+                    self.meta = meta
+                    self.ledger = pd.read_parquet(self.path)
+            except (OSError, ValueError):
+                self.meta = {}
+
+    def _price_hash(self, end_row):
+        """패널 처음 ~ end_row 가격 해시 (저장 뒤 과거 가격이 수정됐는지 확인)"""
+        digest = hashlib.sha1(np.ascontiguousarray(self.panel.present[:end_row + 1]).tobytes())
+        for name in ('Open', 'High', 'Low', 'Close'):
+            digest.update(np.ascontiguousarray(self.panel.field(name)[:end_row + 1]).tobytes())
+        return digest.hexdigest()
+
+    def _meta_valid(self, meta):
+        if (meta.get('format') != CACHE_FORMAT_VERSION or meta.get('version') != self.version
+                or meta.get('sim_kwargs') != json.loads(json.dumps(self.sim_kwargs))):
+            return False
+        end_row = self.panel.dates.searchsorted(pd.Timestamp(meta['bars_through']), side='right') - 1
+        return (end_row >= 0 and self.panel.dates[end_row] == pd.Timestamp(meta['bars_through'])
+                and self._price_hash(end_row) == meta['price_hash'])
+
+    def settled_through(self):
+        """결과가 확정된 마지막 신호일 (캐시가 없으면 None)"""
+        if not self.meta:
+            return None
+        end_row = self.panel.dates.get_loc(pd.Timestamp(self.meta['bars_through']))
+        if end_row - self.settle_bars < 0:
+            return None
+        return self.panel.dates[end_row - self.settle_bars]
+
+    def reusable(self, key, dates):
+        """
+        재사용할 캐시 거래와 새로 계산할 첫 날짜
+
+        Returns:
+            tuple: (재사용 거래 DataFrame, 새로 계산할 날짜 DatetimeIndex)
+        """
+        entry = self.meta.get('combos', {}).get(key)
+        settled = self.settled_through()
+        if entry is None or settled is None or pd.Timestamp(entry['from']) > dates[0]:
+            return None, dates
+        reuse_until = min(pd.Timestamp(entry['through']), settled)
+        cached = self.ledger[self.ledger['combo'] == key]
+        # 거래정지 등으로 봉이 모자라 아직 보유 중인 거래가 있으면 그 신호일부터 다시 계산
+        still_open = cached.loc[cached['exit_reason'] == 'open', 'signal_date']
+        if len(still_open):
+            reuse_until = min(reuse_until, pd.Timestamp(still_open.min()) - pd.Timedelta(days=1))
+        if reuse_until < dates[0]:
+            return None, dates
+        cached = cached[cached['signal_date'] <= reuse_until].drop(columns='combo')
+        return cached, dates[dates > reuse_until]
+
+    def save(self, ledgers, dates):
+        """
+        조합별 거래 내역 저장 (이번 실행의 조합만 보관 - 다른 조합은 이전 마지막 봉 기준으로 확정 여부를
+        판단해야 하므로 함께 두지 않음)
+
+        Args:
+            ledgers (dict): {조합 키: 거래 내역}
+            dates (DatetimeIndex): 이번 평가 날짜
+        """
+        through = {'from': dates[0].strftime('%Y-%m-%d'), 'through': dates[-1].strftime('%Y-%m-%d')}
+        combos = {key: through for key in ledgers}
+        frames = [ledger.assign(combo=key) for key, ledger in ledgers.items() if len(ledger)]
+        table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=LEDGER_COLUMNS + ['combo'])
+
+        end_row = len(self.panel.dates) - 1
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        table.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        self.meta = {
+            'format': CACHE_FORMAT_VERSION,
+            'version': self.version,
+            'sim_kwargs': self.sim_kwargs,
+            'bars_through': self.panel.dates[end_row].strftime('%Y-%m-%d'),
+            'price_hash': self._price_hash(end_row),
+            'combos': combos,
+        }
+        write_json_atomic(self.meta_path, self.meta, ensure_ascii=False)
+        self.ledger = table
+
+
+def combo_ledgers(scanner, dates, strategy, combos, workers=1, sim_kwargs=None, cache=None):
+    """
+    조합별 전체 평가 기간 거래 내역 (캐시가 있으면 확정된 거래는 재사용하고 나머지 날짜만 계산)
+
+    Args:
+        scanner (BatchSignalScanner): 스캐너
+        dates (DatetimeIndex): 평가 거래일
+        strategy (str): ryan/minervini
+        combos (list): 조합 리스트
+        workers (int): 프로세스 수
+        sim_kwargs (dict): simulate_trades 인자
+        cache (LedgerCache): 거래 내역 캐시 (없으면 전부 계산)
+
+    Returns:
+        tuple: ({조합 키: 거래 내역}, 새로 계산한 조합-날짜 수)
+    """
+    keys = [combo_key(strategy, params) for params in combos]
+    reused, pending = {}, {}
+    for key, params in zip(keys, combos):
+        cached, todo = cache.reusable(key, dates) if cache is not None else (None, dates)
+        reused[key] = cached
+        if len(todo):
+            # 새로 계산할 날짜가 같은 조합끼리 한 번에 프로세스 풀로
+            pending.setdefault(todo[0], (todo, []))[1].append((key, params))
+
+    computed = 0
+    fresh = {}
+    for todo, group in pending.values():
+        results = map_combos(scanner, todo, strategy, [params for _, params in group], combo_ledger,
+                             workers=workers, sim_kwargs=sim_kwargs)
+        for (key, _), ledger in zip(group, results):
+            fresh[key] = ledger
+        computed += len(todo) * len(group)
+
+    ledgers = {}
+    for key in keys:
+        frames = [frame for frame in (reused[key], fresh.get(key)) if frame is not None and len(frame)]
+        ledger = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=LEDGER_COLUMNS)
+        ledgers[key] = ledger[(ledger['signal_date'] >= dates[0]) & (ledger['signal_date'] <= dates[-1])]
+    if cache is not None and computed:
+        cache.save(ledgers, dates)
+    return ledgers, computed
+
+
+def walk_forward(ledgers, strategy, combos, windows, sort=DEFAULT_SORT, min_trades=MIN_TRADES):
+    """
+    창마다 학습 구간 최고 조합을 골라 검증 구간 거래를 이어붙임
+
+    Args:
+        ledgers (dict): combo_ledgers 결과
+        strategy (str): ryan/minervini
+        combos (list): 조합 리스트
+        windows (list): rolling_windows 결과
+        sort (str): 학습 구간 순위 지표
+        min_trades (int): 학습 구간 최소 체결 거래 수 (만족하는 조합이 없으면 그 창은 거래하지 않음)
+
+    Returns:
+        tuple: (창별 요약 DataFrame, 이어붙인 검증 구간 거래 DataFrame, 기본값 검증 구간 거래 DataFrame)
+    """
+    keys = [combo_key(strategy, params) for params in combos]
+    default_key = combo_key(strategy, {})
+    summaries, oos, baseline = [], [], []
+    for number, (train_start, train_end, test_start, test_end) in enumerate(windows, start=1):
+        train = pd.DataFrame([
+            {'combo': i, **trade_metrics(window_trades(ledgers[key], train_start, train_end, closed_by=train_end))}
+            for i, key in enumerate(keys)
+        ])
+        ranked = rank_results(train, sort=sort, min_trades=min_trades)
+        summary = {
+            'window': number,
+            'train_start': train_start.strftime('%Y-%m-%d'), 'train_end': train_end.strftime('%Y-%m-%d'),
+            'test_start': test_start.strftime('%Y-%m-%d'), 'test_end': test_end.strftime('%Y-%m-%d'),
+            'selected': not ranked.empty,
+        }
+        if default_key in ledgers:
+            default_test = window_trades(ledgers[default_key], test_start, test_end)
+            baseline.append(default_test.assign(window=number))
+            summary.update({f'default_{name}': value for name, value in trade_metrics(default_test).items()
+                            if name in SUMMARY_METRICS})
+
+        if not ranked.empty:
+            best = int(ranked.iloc[0]['combo'])
+            test = window_trades(ledgers[keys[best]], test_start, test_end)
+            oos.append(test.assign(window=number))
+            summary.update(combos[best])
+            summary.update({f'train_{name}': ranked.iloc[0][name] for name in SUMMARY_METRICS})
+            summary.update({f'test_{name}': value for name, value in trade_metrics(test).items()
+                            if name in SUMMARY_METRICS})
+        summaries.append(summary)
+
+    def stitch(frames):
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame(columns=LEDGER_COLUMNS + ['window'])
+        return pd.concat(frames, ignore_index=True)
+
+    return pd.DataFrame(summaries), stitch(oos), stitch(baseline)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="워크포워드 최적화 (학습 창 최적 조합 -> 다음 검증 창 거래)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES) + ['all'], default='all',
+                        help="최적화할 전략")
+    parser.add_argument("--grid", type=str, default=None,
+                        help="파라미터 그리드 JSON 또는 파일 경로 (param_sweep.py와 같은 형식)")
+    parser.add_argument("--start", type=str, default=f"{datetime.now().year - 1}-01-01",
+                        help="평가 시작일 (YYYY-MM-DD, 고정해 두면 다음 실행에서 캐시 재사용)")
+    parser.add_argument("--end", type=str, default=None,
+                        help="평가 종료일 (YYYY-MM-DD, 없으면 저장된 마지막 날짜)")
+    parser.add_argument("--train-days", type=int, default=TRAIN_DAYS,
+                        help="학습 창 거래일 수")
+    parser.add_argument("--test-days", type=int, default=TEST_DAYS,
+                        help="검증 창 거래일 수 (창 이동 간격)")
+    parser.add_argument("--universe", type=int, default=600,
+                        help="평가 시작일 기준 거래대금 상위 종목 수 (0이면 저장소 전체)")
+    parser.add_argument("--tickers", type=str, default=None,
+                        help="지정 종목만 (쉼표 구분)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="프로세스 수")
+    parser.add_argument("--sort", type=str, default=DEFAULT_SORT,
+                        help="학습 창 순위 기준 지표")
+    parser.add_argument("--min-trades", type=int, default=MIN_TRADES,
+                        help="학습 창 최소 체결 거래 수")
+    parser.add_argument("--max-hold", type=int, default=MAX_HOLD,
+                        help="최대 보유 봉 수")
+    parser.add_argument("--target-pct", type=float, default=TARGET_PCT,
+                        help="목표 수익률(%%), 0이면 목표가 없음")
+    parser.add_argument("--fee", type=float, default=0.0,
+                        help="왕복 거래비용(%%)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="거래 내역 캐시를 쓰지 않고 전부 계산")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    strategies = sorted(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+    sim_kwargs = {'max_hold': args.max_hold, 'target_pct': args.target_pct, 'fee_pct': args.fee}
+
+    start = pd.Timestamp(args.start)
+    end = pd.Timestamp(args.end) if args.end else pd.Timestamp(datetime.now().date())
+    tickers = [t.strip().zfill(6) for t in args.tickers.split(",") if t.strip()] if args.tickers else None
+
+    print("=" * 80)
+    print("워크포워드 최적화")
+    print("=" * 80)
+    started = time.time()
+    # 유니버스는 평가 시작일 기준 거래대금으로 고정 (이후 정보 미사용, 캐시 키 유지)
+    load_start = (start - timedelta(days=HISTORY_DAYS)).strftime('%Y-%m-%d')
+    price_data = load_store_universe(args.universe, load_start, tickers, as_of=start)
+    price_data = {ticker: df[df.index <= end] for ticker, df in price_data.items()}
+    if not price_data:
+        print("[실패] 가격 저장소에 데이터 없음 (generate_weekly_data.py 또는 ingest_market_data.py로 먼저 수집)")
+        return
+    scanner = BatchSignalScanner(price_data)
+    dates = scanner.panel.dates[(scanner.panel.dates >= start) & (scanner.panel.dates <= end)]
+    windows = rolling_windows(dates, args.train_days, args.test_days)
+    if not windows:
+        print(f"[실패] 평가 {len(dates)}거래일 < 학습 창 {args.train_days}거래일")
+        return
+    print(f"종목 {len(price_data)}개, 평가 {len(dates)}거래일, 창 {len(windows)}개 "
+          f"(학습 {args.train_days} / 검증 {args.test_days}거래일), 준비 {time.time() - started:.1f}초")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M')
+    for strategy in strategies:
+        combos = expand_grid(strategy, load_grid(args.grid, strategy))
+        evaluated = combos + ([{}] if combo_key(strategy, {}) not in {combo_key(strategy, c) for c in combos} else [])
+        cache = None if args.no_cache else LedgerCache(strategy, scanner, sim_kwargs)
+
+        print(f"\n[{strategy}] {len(combos)}개 조합")
+        started = time.time()
+        ledgers, computed = combo_ledgers(scanner, dates, strategy, evaluated, workers=args.workers,
+                                          sim_kwargs=sim_kwargs, cache=cache)
+        total = len(dates) * len(evaluated)
+        print(f"  거래 내역 {time.time() - started:.1f}초 (새로 계산 {computed}/{total} 조합-날짜)")
+
+        summary, oos, baseline = walk_forward(ledgers, strategy, combos, windows,
+                                              sort=args.sort, min_trades=args.min_trades)
+        base = os.path.join(RESULTS_DIR, f"walk_forward_{strategy}_{stamp}")
+        summary.to_csv(f"{base}_windows.csv", index=False, encoding='utf-8-sig')
+        oos.to_csv(f"{base}_trades.csv", index=False, encoding='utf-8-sig')
+        print(f"  저장: {base}_windows.csv, {base}_trades.csv")
+
+        columns = ['window', 'test_start', 'test_end'] + list(combos[0]) + ['train_expectancy_r',
+                                                                              'test_trades', 'test_expectancy_r']
+        print(summary.reindex(columns=columns).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+        for label, trades in (('검증 구간 (워크포워드)', oos), ('검증 구간 (기본값)', baseline)):
+            metrics = trade_metrics(trades)
+            print(f"  {label}: 거래 {metrics['trades']}건, 승률 {metrics['win_rate']:.1%}, "
+                  f"평균 {metrics['avg_return']:.2f}%, PF {metrics['profit_factor']:.2f}, "
+                  f"기대 R {metrics['expectancy_r']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+주간 데이터 매니페스트
+날짜별 signals 파일을 만든 입력 지문(전 종목 입력 구간 + 종목명)과 분석기 버전을 기록해
+입력이 그대로인 날짜는 다시 쓰지 않도록 함 (data/weekly_data/manifest.json)
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, "data", "weekly_data", "manifest.json")
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+def write_json_atomic(path, payload, **dump_kwargs):
+    """
+    JSON 파일 원자적 저장 (임시 파일에 쓴 뒤 rename, 읽는 쪽이 쓰다 만 파일을 보지 않음)
+
+    Args:
+        path (str): 저장 경로
+        payload: JSON 직렬화 대상
+        dump_kwargs: json.dump 인자 (cls, indent 등)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, **dump_kwargs)
+    os.replace(tmp_path, path)
+
+
+def date_fingerprint(fingerprints, names, version):
+    """
+    한 날짜 전체 입력 지문
+
+    Args:
+        fingerprints (dict): {종목코드: 입력 구간 지문} (signal_cache 지문)
+        names (dict): {종목코드: 종목명}
+        version (str): 분석기/레코드 버전
+
+    Returns:
+        str: 지문 (종목 구성, 가격, RS, 종목명, 버전 중 하나라도 바뀌면 달라짐)
+    """
+    digest = hashlib.sha1(version.encode('utf-8'))
+    for ticker in sorted(fingerprints):
+        digest.update(f'\n{ticker}|{fingerprints[ticker]}|{names.get(ticker, ticker)}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class WeeklyManifest:
+    def __init__(self, path=None):
+        """
+        매니페스트 로드 (없거나 형식이 다르면 빈 매니페스트)
+
+        Args:
+            path (str): 매니페스트 경로 (없으면 data/weekly_data/manifest.json)
+        """
+        self.path = path or MANIFEST_PATH
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == MANIFEST_FORMAT_VERSION:
+                    self.entries = {item['date']: item for item in data.get('dates', [])}
+            except (OSError, ValueError, AttributeError, KeyError):
+                self.entries = {}
+        self._saved = {date: dict(entry) for date, entry in self.entries.items()}
+
+    def is_fresh(self, date_str, fingerprint, output_path):
+        """
+        저장된 출력이 현재 입력과 같은지 (지문이 같고 파일이 그대로 남아 있으면 True)
+
+        Args:
+            date_str (str): 날짜 (YYYY-MM-DD)
+            fingerprint (str): date_fingerprint 결과
+            output_path (str): signals 파일 경로
+        """
+        entry = self.entries.get(date_str)
+        if entry is None or entry.get('fingerprint') != fingerprint:
+            return False
+        try:
+            return os.path.getsize(output_path) == entry.get('size')
+        except OSError:
+            return False
+
+    def record(self, date_str, fingerprint, output_path, signals):
+        """
+        날짜 출력 기록
+
+        Args:
+            date_str (str): 날짜
+            fingerprint (str): date_fingerprint 결과
+            output_path (str): 저장한 signals 파일 경로
+            signals (list): 저장한 신호 레코드
+        """
+        self.entries[date_str] = {
+            'date': date_str,
+            'signals': len(signals),
+            'tickers': sorted({str(row.get('종목코드', '')).zfill(6) for row in signals}),
+            'fingerprint': fingerprint,
+            'size': os.path.getsize(output_path),
+        }
+
+    def save(self):
+        """매니페스트 원자적 저장 (날짜 내림차순, 바뀐 내용이 없으면 건너뜀)"""
+        if self.entries == self._saved:
+            return
+        dates = sorted(self.entries.values(), key=lambda item: item['date'], reverse=True)
+        write_json_atomic(self.path, {'format': MANIFEST_FORMAT_VERSION, 'dates': dates},
+                          ensure_ascii=False, indent=2)
+        self._saved = {date: dict(entry) for date, entry in self.entries.items()}